@@ -8,8 +8,12 @@ from app.db.database import Base
 
 # Import semua model agar Alembic tahu tabel yang harus dibuat
 from app.models.game import Game
-from app.models.sale import Sale
-from app.models.sync_log import SyncLog
+from app.models.sale import Sale, SaleGameKey
+from app.models.sync_log import SyncLog, SyncLogDaily
+from app.models.rollup import SalesDaily, GamesDaily
+from app.models.price_history import PriceHistory
+from app.models.data_version import DataVersion
+from app.models.genre import Genre, GameGenre
 
 print(settings.DATABASE_URL)
 config = context.config
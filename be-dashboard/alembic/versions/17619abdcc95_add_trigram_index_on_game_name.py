@@ -0,0 +1,46 @@
+"""add trigram index on game name
+
+Revision ID: 17619abdcc95
+Revises: 61aaa16056d6
+Create Date: 2026-10-19 12:05:44.918263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '17619abdcc95'
+down_revision: Union[str, None] = '61aaa16056d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Extension bersifat opsional: tanpa hak akses / paket contrib, migrasi tetap
+    # jalan dan search mode fuzzy otomatis fallback ke ILIKE per kata.
+    op.execute("""
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXCEPTION WHEN insufficient_privilege OR undefined_file OR feature_not_supported THEN
+            RAISE NOTICE 'pg_trgm not available, skipping trigram index';
+        END
+        $$;
+    """)
+    # GIN trigram melayani operator %> (fuzzy) dan juga ILIKE '%term%' (contains)
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+                CREATE INDEX IF NOT EXISTS ix_games_name_trgm ON games USING gin (name gin_trgm_ops);
+            END IF;
+        END
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_games_name_trgm")
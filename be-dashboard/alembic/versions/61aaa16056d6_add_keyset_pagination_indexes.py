@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Revision ID: 61aaa16056d6
+Revises: b1f1f6170df3
+Create Date: 2026-10-19 11:31:09.552817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '61aaa16056d6'
+down_revision: Union[str, None] = 'b1f1f6170df3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (sort_column, id) — dipakai keyset pagination di /games dan /sales
+INDEXES = [
+    ('ix_games_name_id', 'games', ['name', 'id']),
+    ('ix_games_released_id', 'games', ['released', 'id']),
+    ('ix_games_rating_id', 'games', ['rating', 'id']),
+    ('ix_games_updated_at_id', 'games', ['updated_at', 'id']),
+    ('ix_sales_our_price_id', 'sales', ['our_price', 'id']),
+    ('ix_sales_updated_at_id', 'sales', ['updated_at', 'id']),
+    ('ix_sales_created_at_id', 'sales', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
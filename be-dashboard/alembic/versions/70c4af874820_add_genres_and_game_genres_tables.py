@@ -0,0 +1,54 @@
+"""add genres and game_genres tables
+
+Revision ID: 70c4af874820
+Revises: 17619abdcc95
+Create Date: 2026-10-19 12:47:30.205871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '70c4af874820'
+down_revision: Union[str, None] = '17619abdcc95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('genres',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('game_genres',
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('genre_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['genre_id'], ['genres.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id', 'genre_id')
+    )
+    op.create_index('ix_game_genres_genre_id_game_id', 'game_genres', ['genre_id', 'game_id'], unique=False)
+
+    # Backfill dari games.genre (genre utama saja). Genre tambahan hanya terisi saat game
+    # di-sync ulang; untuk game lain jalankan: python -m app.seeders.backfill_genres
+    op.execute("""
+        INSERT INTO genres (name)
+        SELECT DISTINCT genre FROM games WHERE genre IS NOT NULL
+    """)
+    op.execute("""
+        INSERT INTO game_genres (game_id, genre_id)
+        SELECT g.id, gr.id
+        FROM games g
+        JOIN genres gr ON gr.name = g.genre
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_game_genres_genre_id_game_id', table_name='game_genres')
+    op.drop_table('game_genres')
+    op.drop_table('genres')
@@ -0,0 +1,42 @@
+"""add price history table
+
+Revision ID: 853557d907aa
+Revises: dafad2b149e9
+Create Date: 2026-10-19 10:02:17.480911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '853557d907aa'
+down_revision: Union[str, None] = 'dafad2b149e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('price_history',
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('price', sa.REAL(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id', 'recorded_at')
+    )
+    op.create_index('ix_price_history_recorded_at_brin', 'price_history', ['recorded_at'], unique=False, postgresql_using='brin')
+
+    # Titik awal riwayat: harga saat ini untuk setiap game yang punya harga
+    op.execute("""
+        INSERT INTO price_history (game_id, recorded_at, price)
+        SELECT id, COALESCE(updated_at, now()), price_cheap
+        FROM games
+        WHERE price_cheap IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_price_history_recorded_at_brin', table_name='price_history', postgresql_using='brin')
+    op.drop_table('price_history')
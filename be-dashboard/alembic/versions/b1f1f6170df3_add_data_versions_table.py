@@ -0,0 +1,32 @@
+"""add data versions table
+
+Revision ID: b1f1f6170df3
+Revises: 853557d907aa
+Create Date: 2026-10-19 10:48:55.127304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1f1f6170df3'
+down_revision: Union[str, None] = '853557d907aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('data_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO data_versions (name, version) VALUES ('games', 1), ('sales', 1)")
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
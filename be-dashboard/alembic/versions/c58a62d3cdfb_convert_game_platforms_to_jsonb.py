@@ -0,0 +1,42 @@
+"""convert game platforms to jsonb
+
+Revision ID: c58a62d3cdfb
+Revises: 70c4af874820
+Create Date: 2026-10-19 13:21:08.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58a62d3cdfb'
+down_revision: Union[str, None] = '70c4af874820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Isi lama adalah hasil json.dumps(list) → langsung di-cast; string kosong jadi NULL
+    op.alter_column('games', 'platforms',
+               existing_type=sa.Text(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using="NULLIF(platforms, '')::jsonb")
+    # json.dumps(None) menghasilkan 'null' — semua yang bukan array dijadikan SQL NULL
+    # agar jsonb_array_elements_text tidak gagal pada skalar
+    op.execute("UPDATE games SET platforms = NULL WHERE jsonb_typeof(platforms) <> 'array'")
+    op.create_index('ix_games_platforms_gin', 'games', ['platforms'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'platforms': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_games_platforms_gin', table_name='games',
+                  postgresql_using='gin', postgresql_ops={'platforms': 'jsonb_path_ops'})
+    op.alter_column('games', 'platforms',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.Text(),
+               existing_nullable=True,
+               postgresql_using='platforms::text')
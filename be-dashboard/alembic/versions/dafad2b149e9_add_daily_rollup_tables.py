@@ -0,0 +1,57 @@
+"""add daily rollup tables
+
+Revision ID: dafad2b149e9
+Revises: cdf0621ebdb0
+Create Date: 2026-10-19 09:12:41.306518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dafad2b149e9'
+down_revision: Union[str, None] = 'cdf0621ebdb0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.Column('max_our_price', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('games_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('games_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_index(op.f('ix_sales_created_at'), 'sales', ['created_at'], unique=False)
+    op.create_index(op.f('ix_games_updated_at'), 'games', ['updated_at'], unique=False)
+
+    # Backfill rollup dari data yang sudah ada
+    op.execute("""
+        INSERT INTO sales_daily (day, sales_count, max_our_price)
+        SELECT CAST(created_at AS DATE), COUNT(id), MAX(our_price)
+        FROM sales
+        WHERE created_at IS NOT NULL
+        GROUP BY CAST(created_at AS DATE)
+    """)
+    op.execute("""
+        INSERT INTO games_daily (day, games_count)
+        SELECT CAST(updated_at AS DATE), COUNT(id)
+        FROM games
+        WHERE updated_at IS NOT NULL
+        GROUP BY CAST(updated_at AS DATE)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_games_updated_at'), table_name='games')
+    op.drop_index(op.f('ix_sales_created_at'), table_name='sales')
+    op.drop_table('games_daily')
+    op.drop_table('sales_daily')
@@ -0,0 +1,181 @@
+"""partition sales by created_at month
+
+Revision ID: e4a1c93b7d52
+Revises: c58a62d3cdfb
+Create Date: 2026-10-19 15:02:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1c93b7d52'
+down_revision: Union[str, None] = 'c58a62d3cdfb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# sales → RANGE (created_at) per bulan UTC, partisi bernama sales_YYYY_MM + sales_default.
+#
+# Unique constraint di tabel partisi wajib memuat kolom partisi, jadi aturan
+# "satu sale per game" tidak bisa lagi berupa UNIQUE (game_id) di sales. Aturan
+# itu dipindah ke sales_game_keys (game_id PK, nama constraint tetap
+# sales_game_id_unique) yang diisi trigger di sales — duplikat tetap gagal
+# dengan unique_violation, dari jalur mana pun (ORM, bulk, COPY seeder).
+#
+# PK sales menjadi (id, created_at); id tetap unik lewat sequence sales_id_seq.
+
+# Satu statement per elemen — asyncpg tidak menerima beberapa perintah sekaligus
+PARTITION_FUNCTIONS = ["""
+CREATE OR REPLACE FUNCTION sales_create_partition(month_start date) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    partition_name text := format('sales_%s', to_char(month_start, 'YYYY_MM'));
+    start_at timestamptz := make_timestamptz(extract(year FROM month_start)::int, extract(month FROM month_start)::int, 1, 0, 0, 0, 'UTC');
+    end_at timestamptz := make_timestamptz(
+        extract(year FROM month_start + interval '1 month')::int, extract(month FROM month_start + interval '1 month')::int, 1, 0, 0, 0, 'UTC'
+    );
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN 0;
+    END IF;
+
+    -- CREATE ... PARTITION OF gagal jika sales_default sudah berisi baris di rentang
+    -- ini → baris tersebut dipindah dulu (trigger key ikut menghapus & mengisi ulang)
+    CREATE TEMP TABLE sales_partition_move (LIKE sales) ON COMMIT DROP;
+    WITH moved AS (
+        DELETE FROM sales_default WHERE created_at >= start_at AND created_at < end_at RETURNING *
+    )
+    INSERT INTO sales_partition_move SELECT * FROM moved;
+
+    EXECUTE format('CREATE TABLE %I PARTITION OF sales FOR VALUES FROM (%L) TO (%L)', partition_name, start_at, end_at);
+
+    INSERT INTO sales SELECT * FROM sales_partition_move;
+    DROP TABLE sales_partition_move;
+    RETURN 1;
+END $$
+""", """
+CREATE OR REPLACE FUNCTION sales_ensure_partitions(months_ahead integer DEFAULT 3) RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    this_month date := date_trunc('month', now() AT TIME ZONE 'UTC')::date;
+    created integer := 0;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        created := created + sales_create_partition((this_month + make_interval(months => i))::date);
+    END LOOP;
+    RETURN created;
+END $$
+"""]
+
+GAME_KEY_TRIGGER = ["""
+CREATE OR REPLACE FUNCTION sales_game_key_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        DELETE FROM sales_game_keys WHERE game_id = OLD.game_id AND sale_id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO sales_game_keys (game_id, sale_id) VALUES (NEW.game_id, NEW.id);
+    END IF;
+    RETURN NULL;
+END $$
+""", """
+CREATE TRIGGER sales_game_key_sync
+    AFTER INSERT OR DELETE OR UPDATE OF game_id ON sales
+    FOR EACH ROW EXECUTE FUNCTION sales_game_key_sync()
+"""]
+
+# (nama, kolom) — dibuat di tabel induk, otomatis diturunkan ke setiap partisi
+SALES_INDEXES = [
+    ('ix_sales_game_id', ['game_id']),
+    ('ix_sales_our_price_id', ['our_price', 'id']),
+    ('ix_sales_updated_at_id', ['updated_at', 'id']),
+    ('ix_sales_created_at_id', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE sales RENAME TO sales_unpartitioned")
+    op.execute("ALTER SEQUENCE sales_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE sales (
+            id integer NOT NULL DEFAULT nextval('sales_id_seq'),
+            game_id integer NOT NULL,
+            our_price double precision NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz DEFAULT now()
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE sales_default PARTITION OF sales DEFAULT")
+    for statement in PARTITION_FUNCTIONS:
+        op.execute(statement)
+
+    # Partisi dari bulan sale tertua sampai 3 bulan ke depan, lalu salin data
+    op.execute("""
+        SELECT sales_create_partition(m.month_start::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT min(created_at) FROM sales_unpartitioned), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+            interval '1 month'
+        ) AS m(month_start)
+    """)
+    op.execute("""
+        INSERT INTO sales (id, game_id, our_price, created_at, updated_at)
+        SELECT id, game_id, our_price, COALESCE(created_at, updated_at, now()), updated_at
+        FROM sales_unpartitioned
+    """)
+
+    op.create_table('sales_game_keys',
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('sale_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('game_id', name='sales_game_id_unique')
+    )
+    op.execute("INSERT INTO sales_game_keys (game_id, sale_id) SELECT game_id, id FROM sales")
+
+    op.drop_table('sales_unpartitioned')
+    op.execute("ALTER SEQUENCE sales_id_seq OWNED BY sales.id")
+
+    op.create_primary_key('sales_pkey', 'sales', ['id', 'created_at'])
+    op.create_foreign_key('sales_game_id_fkey', 'sales', 'games', ['game_id'], ['id'])
+    for name, columns in SALES_INDEXES:
+        op.create_index(name, 'sales', columns, unique=False)
+    for statement in GAME_KEY_TRIGGER:
+        op.execute(statement)
+    op.execute("ANALYZE sales")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE sales RENAME TO sales_partitioned")
+    op.execute("ALTER SEQUENCE sales_id_seq OWNED BY NONE")
+
+    op.create_table('sales',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('sales_id_seq')"), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('our_price', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    )
+    op.execute("""
+        INSERT INTO sales (id, game_id, our_price, created_at, updated_at)
+        SELECT id, game_id, our_price, created_at, updated_at FROM sales_partitioned
+    """)
+
+    # Tabel partisi (beserta semua partisinya & trigger) dihapus sebelum nama index dipakai ulang
+    op.drop_table('sales_partitioned')
+    op.drop_table('sales_game_keys')
+    op.execute("DROP FUNCTION sales_game_key_sync()")
+    op.execute("DROP FUNCTION sales_ensure_partitions(integer)")
+    op.execute("DROP FUNCTION sales_create_partition(date)")
+    op.execute("ALTER SEQUENCE sales_id_seq OWNED BY sales.id")
+
+    op.create_primary_key('sales_pkey', 'sales', ['id'])
+    op.create_foreign_key('sales_game_id_fkey', 'sales', 'games', ['game_id'], ['id'])
+    op.create_unique_constraint('sales_game_id_unique', 'sales', ['game_id'])
+    for name, columns in SALES_INDEXES[1:]:
+        op.create_index(name, 'sales', columns, unique=False)
+    op.create_index(op.f('ix_sales_created_at'), 'sales', ['created_at'], unique=False)
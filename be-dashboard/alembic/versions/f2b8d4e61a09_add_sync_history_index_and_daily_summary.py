@@ -0,0 +1,43 @@
+"""add sync history index and daily summary
+
+Revision ID: f2b8d4e61a09
+Revises: e4a1c93b7d52
+Create Date: 2026-10-19 16:40:12.503871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4e61a09'
+down_revision: Union[str, None] = 'e4a1c93b7d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sync_logs', sa.Column('duration_seconds', sa.Float(), nullable=True))
+    op.create_index('ix_sync_logs_source_synced_at', 'sync_logs', ['source', 'synced_at'], unique=False)
+    op.create_table('sync_logs_daily',
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('runs', sa.Integer(), nullable=False),
+    sa.Column('success_runs', sa.Integer(), nullable=False),
+    sa.Column('records_fetched', sa.Integer(), nullable=False),
+    sa.Column('records_inserted', sa.Integer(), nullable=False),
+    sa.Column('records_updated', sa.Integer(), nullable=False),
+    sa.Column('records_skipped', sa.Integer(), nullable=False),
+    sa.Column('timed_records_fetched', sa.Integer(), nullable=False),
+    sa.Column('duration_seconds', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('source', 'day')
+    )
+
+
+def downgrade() -> None:
+    # Ringkasan harian tidak bisa diurai kembali menjadi baris per run
+    op.drop_table('sync_logs_daily')
+    op.drop_index('ix_sync_logs_source_synced_at', table_name='sync_logs')
+    op.drop_column('sync_logs', 'duration_seconds')
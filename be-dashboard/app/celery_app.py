@@ -1,12 +1,15 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import before_task_publish, task_prerun, task_postrun
 from app.core.config import settings
+from app.services import task_metrics
+from app.db import query_metrics, query_debug
 
 celery = Celery(
     "game_store",
     broker=settings.REDIS_URL,
     backend=settings.REDIS_URL,
-    include=["app.tasks.sync_tasks"],
+    include=["app.tasks.sync_tasks", "app.tasks.maintenance_tasks"],
 )
 
 celery.conf.update(
@@ -31,5 +34,37 @@ celery.conf.update(
             "schedule": crontab(hour=2, minute=0),  # setiap hari jam 02:00 UTC
             "kwargs": {"limit": 40},
         },
+        "ensure-sales-partitions-daily": {
+            "task": "app.tasks.maintenance_tasks.ensure_sales_partitions_task",
+            "schedule": crontab(hour=1, minute=0),  # setiap hari jam 01:00 UTC
+        },
+        "compact-sync-logs-daily": {
+            "task": "app.tasks.maintenance_tasks.compact_sync_logs_task",
+            "schedule": crontab(hour=1, minute=30),  # setiap hari jam 01:30 UTC
+        },
     },
-)
\ No newline at end of file
+)
+
+
+# ── Metrics task (durasi & waktu antre) → Redis, diekspos API di /metrics ─────
+@before_task_publish.connect
+def _mark_published(headers=None, **kwargs):
+    if headers is not None:
+        task_metrics.on_publish(headers)
+
+
+@task_prerun.connect
+def _task_started(task_id=None, task=None, **kwargs):
+    task_metrics.on_start(task_id, task.name, task.request.get(task_metrics.PUBLISHED_HEADER))
+    query_metrics.begin_request(task.name)
+
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **kwargs):
+    task_metrics.on_finish(task_id, task.name, state)
+    stats = query_metrics.current()
+    if stats is not None:
+        query_debug.finish(stats, task.name)
+
+
+query_debug.install()
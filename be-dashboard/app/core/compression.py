@@ -0,0 +1,232 @@
+import zlib
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import COMPRESSION_BYTES, COMPRESSION_SAVED_BYTES, COMPRESSION_SKIPPED
+
+# Kompresi response (gzip / brotli) — ASGI murni agar StreamingResponse (export)
+# tetap mengalir: tiap chunk dikompres lalu di-flush, bukan ditampung sampai selesai.
+#
+# - Body < COMPRESSION_MIN_SIZE dikirim apa adanya (header + CPU tidak sebanding)
+# - Stream ditampung hanya sampai MIN_SIZE; selebihnya dikompres per chunk
+# - Hanya media type teks/JSON/msgpack — parquet sudah terkompres
+# - ETag dari conditional_get sudah weak (W/"..."), jadi tetap valid lintas encoding
+# - Vary: Accept-Encoding dikirim untuk setiap media type yang bisa dikompres (dan 304),
+#   termasuk saat body dikirim apa adanya — cache bersama tidak boleh menukar keduanya
+# - brotli opsional: jika paket tidak terpasang, klien yang minta br dapat gzip
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def _brotli_installed() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """{encoding: q} dari header Accept-Encoding (tanpa q = 1.0)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, brotli_available: bool) -> Optional[str]:
+    """br jika diterima (dan terpasang), lalu gzip; None = tidak dikompres."""
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0)
+    for coding in (("br", "gzip") if brotli_available else ("gzip",)):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits 16+MAX_WBITS → format gzip (header + trailer CRC), bukan zlib mentah
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._c.compress(data) + self._c.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        import brotli
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._c.process(data) + self._c.finish()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.brotli_available = settings.COMPRESSION_BROTLI and _brotli_installed()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        # None (klien tidak menerima kompresi / HEAD) → hanya Vary yang ditambahkan
+        encoding = None if scope["method"] == "HEAD" else choose_encoding(accept_encoding, self.brotli_available)
+        await _CompressedResponse(self, scope, encoding, send).run(receive)
+
+
+def _with_vary(headers: list) -> list:
+    """Tambahkan Accept-Encoding ke Vary (digabung dengan Vary yang sudah ada, mis. Accept)."""
+    vary = [v for k, v in headers if k.lower() == b"vary"]
+    if any(b"accept-encoding" in v.lower() or v.strip() == b"*" for v in vary):
+        return headers
+    headers = [(k, v) for k, v in headers if k.lower() != b"vary"]
+    headers.append((b"vary", b", ".join([*vary, b"Accept-Encoding"])))
+    return headers
+
+
+class _CompressedResponse:
+    """State satu response: tunda http.response.start sampai tahu body layak dikompres."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope, encoding: Optional[str], send):
+        self.mw = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.start = None
+        self.buffer = b""
+        self.compressor = None
+        self.passthrough = False
+        self.original = self.sent = 0
+
+    async def run(self, receive):
+        await self.mw.app(self.scope, receive, self._send)
+
+    def _skip_reason(self, message) -> Optional[str]:
+        status = message["status"]
+        if status < 200 or status in (204, 304):
+            return "no_body"
+        headers = {k.lower(): v for k, v in message.get("headers", [])}
+        if b"content-encoding" in headers:
+            return "already_encoded"
+        content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return "content_type"
+        return None
+
+    def _varies(self, message, reason: Optional[str]) -> bool:
+        # 304 membawa Vary yang sama dengan 200-nya (body-nya bisa dikompres)
+        return reason is None or message["status"] == 304
+
+    async def _send(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            reason = self._skip_reason(message)
+            if self._varies(message, reason):
+                message = {**message, "headers": _with_vary(list(message.get("headers", [])))}
+            if reason is None and self.encoding is not None:
+                self.start = message
+                return
+            if reason is not None and self.encoding is not None:
+                COMPRESSION_SKIPPED.labels(reason).inc()
+            self.passthrough = True
+            await self.send(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.original += len(body)
+
+        if self.compressor is not None:
+            # Stream yang sudah mulai dikompres
+            chunk = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+            await self._send_body(chunk, more_body)
+            return
+
+        self.buffer += body
+        if len(self.buffer) < self.mw.minimum_size:
+            if more_body:
+                return
+            # Body (atau stream) selesai di bawah ambang — kirim apa adanya
+            COMPRESSION_SKIPPED.labels("too_small").inc()
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": self.buffer})
+            return
+
+        self.compressor = (
+            _BrotliCompressor(self.mw.brotli_quality) if self.encoding == "br"
+            else _GzipCompressor(self.mw.gzip_level)
+        )
+        data, self.buffer = self.buffer, b""
+        chunk = self.compressor.compress(data) if more_body else self.compressor.finish(data)
+        await self.send(self._compressed_start(None if more_body else len(chunk)))
+        await self._send_body(chunk, more_body)
+
+    def _compressed_start(self, content_length: Optional[int]) -> dict:
+        headers = [
+            (k, v) for k, v in self.start.get("headers", [])
+            if k.lower() not in (b"content-length", b"content-encoding")
+        ]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return {**self.start, "headers": headers}   # Vary sudah ditambahkan saat start ditunda
+
+    async def _send_body(self, chunk: bytes, more_body: bool):
+        self.sent += len(chunk)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            # scope["route"] diisi router FastAPI saat match → label template path
+            route = self.scope.get("route")
+            route = route.path if route is not None else "<unmatched>"
+            COMPRESSION_BYTES.labels(route, self.encoding, "original").inc(self.original)
+            COMPRESSION_BYTES.labels(route, self.encoding, "sent").inc(self.sent)
+            COMPRESSION_SAVED_BYTES.labels(route, self.encoding).inc(max(self.original - self.sent, 0))
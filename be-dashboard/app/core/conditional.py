@@ -0,0 +1,62 @@
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.responses import MSGPACK_MEDIA_TYPES, wants_msgpack
+from app.db.database import get_read_db
+from app.services.data_version_service import get_versions
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Perbandingan weak: abaikan prefix W/
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def conditional_get(*names: str):
+    """
+    Dependency untuk conditional GET.
+
+    ETag (weak) dan Last-Modified diturunkan dari tabel data_versions, jadi
+    cukup satu lookup primary key. Jika If-None-Match / If-Modified-Since
+    cocok, request dihentikan dengan 304 sebelum query berat di endpoint jalan.
+    URL yang sama bisa dilayani JSON atau msgpack (Responder, Vary: Accept),
+    jadi media type hasil negosiasi ikut di-hash dan Vary ikut di 304.
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db),
+    ) -> None:
+        versions, last_modified = await get_versions(db, *names)
+
+        watermark = ";".join(f"{n}={versions[n]}" for n in names)
+        media_type = MSGPACK_MEDIA_TYPES[0] if wants_msgpack(request) else "application/json"
+        digest = hashlib.sha1(f"{settings.VERSION}|{media_type}|{watermark}".encode()).hexdigest()[:16]
+        headers = {"ETag": f'W/"{digest}"', "Cache-Control": "no-cache", "Vary": "Accept"}
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+
+        not_modified = False
+        if if_none_match:
+            not_modified = _etag_matches(if_none_match, headers["ETag"])
+        elif if_modified_since and last_modified is not None:
+            try:
+                # Resolusi header HTTP hanya detik
+                not_modified = last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                not_modified = False
+
+        if not_modified:
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
+    return dependency
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
@@ -12,9 +13,47 @@ class Settings(BaseSettings):
     RAWG_API_KEY: str
     CHEAPSHARK_BASE: str = "https://www.cheapshark.com/api/1.0"
     DATABASE_URL: str
+    DATABASE_READ_URL: Optional[str] = None     # replica untuk endpoint read-only; kosong = semua ke primary
+    DB_READ_YOUR_WRITES_SECONDS: int = 5        # setelah client menulis, read-nya ke primary selama ini
+    SALES_PARTITION_MONTHS_AHEAD: int = 3       # partisi bulanan sales yang disiapkan di depan bulan berjalan
+    SYNC_LOG_RETENTION_DAYS: int = 30           # sync_logs lebih tua dari ini dipadatkan ke sync_logs_daily
+
+    # Pool koneksi async engine (per proses API)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0           # detik menunggu koneksi sebelum TimeoutError
+    DB_POOL_RECYCLE: int = 1800             # detik; tutup koneksi lebih tua dari ini
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100      # prepared statement asyncpg; 0 di belakang pgbouncer (transaction mode)
+    DB_SLOW_HOLD_MS: int = 1000             # log request yang memegang koneksi lebih lama; 0 = nonaktif
+
+    # Instrumentasi query (dev/staging) — lihat app/db/query_debug.py
+    QUERY_DEBUG: bool = False
+    SLOW_QUERY_MS: int = 200                # statement lebih lambat dari ini dicetak + EXPLAIN
+    SLOW_QUERY_EXPLAIN: bool = True
+    NPLUSONE_THRESHOLD: int = 5             # SQL identik sebanyak ini dalam satu request/task = N+1
+    QUERY_BUDGET_STRICT: bool = False       # pelanggaran query_budget() jadi exception (untuk test)
+
+    # Startup API
+    STARTUP_MIGRATION_CHECK: str = "fail"   # fail | warn | off — revisi DB harus sama dengan head Alembic
+    STARTUP_POOL_WARMUP: int = 4            # koneksi dibuka di awal per engine (maks DB_POOL_SIZE)
+    STARTUP_CACHE_WARMUP: int = 500         # game terpopuler dimuat ke cache lokal; 0 = nonaktif
 
     REDIS_URL: str
 
+    # Cache detail game (LRU per proses → Redis)
+    GAME_CACHE_ENABLED: bool = True
+    GAME_CACHE_SIZE: int = 10_000           # entry maksimal di LRU per proses
+    GAME_CACHE_LOCAL_TTL: int = 30          # detik; batas stale antar proses setelah invalidasi
+    GAME_CACHE_REDIS_TTL: int = 600         # detik
+
+    # Kompresi response (app/core/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024        # byte; body lebih kecil dikirim apa adanya
+    COMPRESSION_GZIP_LEVEL: int = 6         # 1 (cepat) .. 9 (kecil)
+    COMPRESSION_BROTLI: bool = True         # br jika paket brotli terpasang dan diminta klien
+    COMPRESSION_BROTLI_QUALITY: int = 4     # 0..11; >5 terlalu mahal untuk response dinamis
+
     ENVIRONMENT: str = "dev"
     class Config:
         env_file = (
@@ -0,0 +1,166 @@
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, ProcessCollector, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, SummaryMetricFamily
+
+from app.db import query_metrics, query_debug
+
+# Telemetri Prometheus (GET /metrics).
+#
+# - HTTP  : latency & status per route (template path, bukan URL mentah → kardinalitas terjaga)
+# - DB    : jumlah query & waktu DB per request (event cursor SQLAlchemy), durasi per query
+# - Pool  : status pool koneksi primary/read (app.db.pool_metrics)
+# - Cache : hit/miss cache detail game
+# - Kompresi: byte sebelum/sesudah gzip/brotli per route (app.core.compression)
+# - Celery: durasi task & waktu antre, dicatat worker ke Redis (app.services.task_metrics)
+
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+HTTP_REQUESTS = Counter(
+    "gamestore_http_requests_total", "HTTP request per route dan status",
+    ["method", "route", "status"], registry=REGISTRY,
+)
+HTTP_LATENCY = Histogram(
+    "gamestore_http_request_duration_seconds", "Latency request sampai body terakhir terkirim",
+    ["method", "route"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "gamestore_http_requests_in_progress", "Request yang sedang diproses", registry=REGISTRY,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "gamestore_http_request_db_queries", "Jumlah query DB per request",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS, registry=REGISTRY,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "gamestore_http_request_db_seconds", "Total waktu query DB per request",
+    ["method", "route"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+DB_QUERY_SECONDS = Histogram(
+    "gamestore_db_query_duration_seconds", "Durasi satu statement (cursor execute)",
+    ["operation"], buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+COMPRESSION_BYTES = Counter(
+    "gamestore_http_compression_bytes_total", "Byte body response sebelum (original) dan sesudah (sent) kompresi",
+    ["route", "encoding", "stage"], registry=REGISTRY,
+)
+COMPRESSION_SAVED_BYTES = Counter(
+    "gamestore_http_compression_saved_bytes_total", "Byte yang dihemat kompresi (original - sent)",
+    ["route", "encoding"], registry=REGISTRY,
+)
+COMPRESSION_SKIPPED = Counter(
+    "gamestore_http_compression_skipped_total", "Response yang diterima klien terkompres tapi dikirim apa adanya",
+    ["reason"], registry=REGISTRY,
+)
+
+query_metrics.on_query(lambda operation, seconds: DB_QUERY_SECONDS.labels(operation).observe(seconds))
+
+
+# COLLECTOR — dibaca saat scrape dari state yang sudah ada di memori proses
+
+class _PoolCollector:
+    def collect(self):
+        from app.db.database import engine, read_engine
+        from app.db.pool_metrics import pool_stats, engine_metrics
+
+        gauges = {
+            "size": GaugeMetricFamily("gamestore_db_pool_size", "pool_size", labels=["pool"]),
+            "capacity": GaugeMetricFamily("gamestore_db_pool_capacity", "pool_size + max_overflow", labels=["pool"]),
+            "checked_out": GaugeMetricFamily("gamestore_db_pool_checked_out", "Koneksi sedang dipinjam", labels=["pool"]),
+            "overflow": GaugeMetricFamily("gamestore_db_pool_overflow", "Koneksi di atas pool_size", labels=["pool"]),
+        }
+        timeouts = CounterMetricFamily("gamestore_db_pool_timeouts", "Checkout gagal karena pool habis", labels=["pool"])
+        wait = SummaryMetricFamily("gamestore_db_pool_checkout_wait_seconds", "Waktu tunggu checkout", labels=["pool"])
+        hold = SummaryMetricFamily("gamestore_db_pool_hold_seconds", "Lama koneksi dipinjam", labels=["pool"])
+
+        for name, eng in (("primary", engine), ("read", read_engine)):
+            if eng is None:
+                continue
+            stats = pool_stats(eng)
+            for key, family in gauges.items():
+                family.add_metric([name], stats[key])
+            timeouts.add_metric([name], stats["timeouts"])
+            metrics = engine_metrics(eng)
+            wait.add_metric([name], metrics.checkout_wait.count, metrics.checkout_wait.total)
+            hold.add_metric([name], metrics.hold.count, metrics.hold.total)
+
+        yield from gauges.values()
+        yield timeouts
+        yield wait
+        yield hold
+
+
+class _GameCacheCollector:
+    def collect(self):
+        from app.services.game_cache import cache_stats
+
+        stats = cache_stats()
+        lookups = CounterMetricFamily("gamestore_game_cache_lookups", "Lookup cache detail game", labels=["result"])
+        for result in ("local_hits", "redis_hits", "misses"):
+            lookups.add_metric([result], stats[result])
+        yield lookups
+        yield CounterMetricFamily("gamestore_game_cache_invalidations", "Key yang diinvalidasi", value=stats["invalidations"])
+        yield CounterMetricFamily("gamestore_game_cache_redis_errors", "Error / timeout Redis", value=stats["redis_errors"])
+        yield GaugeMetricFamily("gamestore_game_cache_local_size", "Entry di LRU lokal", value=stats["local_size"])
+
+
+REGISTRY.register(_PoolCollector())
+REGISTRY.register(_GameCacheCollector())
+
+
+class _StaticCollector:
+    def __init__(self, families: list):
+        self.families = families
+
+    def collect(self):
+        return self.families
+
+
+async def render() -> bytes:
+    """Exposition format Prometheus: metrics proses ini + metrics Celery dari Redis."""
+    from app.services.task_metrics import read_families
+
+    celery_registry = CollectorRegistry()
+    celery_registry.register(_StaticCollector(await read_families()))
+    return generate_latest(REGISTRY) + generate_latest(celery_registry)
+
+
+# MIDDLEWARE — ASGI murni (tidak membungkus body seperti BaseHTTPMiddleware)
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        queries = query_metrics.begin_request(f"{scope['method']} {scope['path']}")
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            elapsed = time.perf_counter() - start
+            # scope["route"] diisi router FastAPI saat match; path template, mis. /api/v1/games/{game_id}
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "<unmatched>")
+            HTTP_REQUESTS.labels(*labels, str(status)).inc()
+            HTTP_LATENCY.labels(*labels).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(*labels).observe(queries.count)
+            REQUEST_DB_SECONDS.labels(*labels).observe(queries.seconds)
+            # Mode debug: laporan N+1 + cek query_budget route (bisa raise di mode strict)
+            query_debug.finish(queries, " ".join(labels), scope.get("query_budget"))
@@ -0,0 +1,102 @@
+import decimal
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+JSON_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+
+
+# ENCODER — orjson (default app) & msgpack (internal consumer, Accept: application/msgpack)
+
+def _default(obj: Any):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _msgpack_default(obj: Any):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return _default(obj)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson + fallback untuk model pydantic/Decimal yang belum di-dump."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        import msgpack
+        return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+def _msgpack_installed() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _accept_q(accept: str, media_types: tuple[str, ...]) -> float:
+    """q tertinggi dari media type yang cocok di header Accept (0 jika tidak ada)."""
+    best = 0.0
+    for part in accept.split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if media.lower() not in media_types:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        best = max(best, q)
+    return best
+
+
+def wants_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept")
+    if not accept:
+        return False
+    q = _accept_q(accept, MSGPACK_MEDIA_TYPES)
+    # msgpack hanya jika diminta eksplisit dan tidak kalah prioritas dari JSON
+    return q > 0 and q >= _accept_q(accept, JSON_MEDIA_TYPES) and _msgpack_installed()
+
+
+# RESPONDER — jalur cepat tanpa validasi ulang response_model
+#
+# Endpoint yang mengembalikan Response langsung dilewati oleh serialisasi
+# FastAPI (validasi response_model + jsonable_encoder). response_model tetap
+# dipasang untuk dokumentasi OpenAPI. Header yang di-set dependency lain pada
+# sub-response (ETag / Last-Modified dari conditional_get) disalin ke sini,
+# karena FastAPI tidak menggabungkannya untuk Response yang dikembalikan langsung.
+
+class Responder:
+    def __init__(self, request: Request, response: Response):
+        self.msgpack = wants_msgpack(request)
+        self.sub_response = response
+
+    def __call__(self, content: Any, status_code: int = 200) -> Response:
+        response_class = MsgpackResponse if self.msgpack else FastJSONResponse
+        response = response_class(content, status_code=status_code)
+        response.headers.raw.extend(self.sub_response.headers.raw)
+        response.headers["Vary"] = "Accept"
+        return response
+
+
+def responder(request: Request, response: Response) -> Responder:
+    return Responder(request, response)
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+# Startup API: cek revisi Alembic (bukan create_all), warmup pool & cache,
+# lalu baru menandai proses siap (GET /ready). /health tetap liveness murni.
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+READY_PING_TIMEOUT = 1.0     # detik — /ready gagal cepat jika DB tidak menjawab
+
+state = {
+    "ready": False,
+    "phase": "importing",
+    "import_ms": None,
+    "startup_ms": None,
+    "phases_ms": {},
+    "db_revision": None,
+    "head_revision": None,
+    "warmed_connections": 0,
+    "warmed_games": 0,
+    "sales_partitions_created": None,
+    "redis": None,
+    "warnings": [],
+}
+
+
+class MigrationMismatch(RuntimeError):
+    pass
+
+
+# MIGRASI
+
+def _head_revisions() -> set[str]:
+    # Alembic hanya di-import saat startup, bukan saat import app
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def _current_revisions(connection) -> set[str]:
+    from alembic.runtime.migration import MigrationContext
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+async def check_migrations(engine: AsyncEngine) -> None:
+    """Bandingkan alembic_version di DB dengan head script; mode STARTUP_MIGRATION_CHECK."""
+    if settings.STARTUP_MIGRATION_CHECK == "off":
+        return
+    heads = _head_revisions()
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_current_revisions)
+    state["db_revision"] = ",".join(sorted(current)) or None
+    state["head_revision"] = ",".join(sorted(heads))
+
+    if current != heads:
+        message = (
+            f"database at revision {state['db_revision']}, code expects {state['head_revision']} "
+            f"— run `alembic upgrade head`"
+        )
+        if settings.STARTUP_MIGRATION_CHECK == "fail":
+            raise MigrationMismatch(message)
+        state["warnings"].append(message)
+        print(f"[Startup] WARNING {message}")
+
+
+# PARTISI
+
+async def ensure_partitions(session_factory) -> None:
+    """Partisi sales ke depan; gagal (mis. role tanpa hak DDL) hanya jadi warning."""
+    from app.services.partition_service import ensure_sales_partitions
+
+    try:
+        async with session_factory() as db:
+            state["sales_partitions_created"] = await ensure_sales_partitions(db)
+    except Exception as e:
+        message = f"sales partitions not ensured: {type(e).__name__}: {e}"
+        state["warnings"].append(message)
+        print(f"[Startup] WARNING {message}")
+
+
+# WARMUP
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """Buka `connections` koneksi bersamaan lalu kembalikan ke pool dalam keadaan idle."""
+    connections = min(connections, engine.sync_engine.pool.size())
+    if connections <= 0:
+        return 0
+    conns = [engine.connect() for _ in range(connections)]
+    try:
+        await asyncio.gather(*(c.start() for c in conns))
+        await asyncio.gather(*(c.execute(text("SELECT 1")) for c in conns))
+    finally:
+        for c in conns:
+            await c.close()
+    return connections
+
+
+async def warm_caches(session_factory) -> None:
+    from app.crud.games import warm_cache
+    from app.services.game_cache import ping_redis
+
+    state["redis"] = "ok" if await ping_redis() else "unavailable"
+    if settings.STARTUP_CACHE_WARMUP > 0:
+        async with session_factory() as db:
+            state["warmed_games"] = await warm_cache(db, settings.STARTUP_CACHE_WARMUP)
+
+
+# LIFECYCLE
+
+async def _phase(name: str, coro):
+    state["phase"] = name
+    start = time.perf_counter()
+    result = await coro
+    state["phases_ms"][name] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def run_startup(engine: AsyncEngine, read_engine: Optional[AsyncEngine], session_factory) -> None:
+    start = time.perf_counter()
+    await _phase("migrations", check_migrations(engine))
+    await _phase("partitions", ensure_partitions(session_factory))
+
+    engines = [engine] + ([read_engine] if read_engine is not None else [])
+    warmed = await _phase("pool", asyncio.gather(
+        *(warm_pool(e, settings.STARTUP_POOL_WARMUP) for e in engines)
+    ))
+    state["warmed_connections"] = sum(warmed)
+
+    await _phase("caches", warm_caches(session_factory))
+
+    state["startup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    state["phase"] = "ready"
+    state["ready"] = True
+    print(
+        f"[Startup] ready in {state['startup_ms']}ms "
+        f"(import {state['import_ms']}ms, {state['phases_ms']})"
+    )
+
+
+async def readiness(engine: AsyncEngine) -> tuple[bool, dict]:
+    """Siap = startup selesai + DB menjawab SELECT 1 dalam READY_PING_TIMEOUT."""
+    if not state["ready"]:
+        return False, {"status": "starting", "phase": state["phase"]}
+    try:
+        async with asyncio.timeout(READY_PING_TIMEOUT):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return False, {"status": "unavailable", "detail": f"database: {type(e).__name__}"}
+    return True, {"status": "ready", **{k: v for k, v in state.items() if k not in ("ready", "phase")}}
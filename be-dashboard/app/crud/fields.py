@@ -0,0 +1,27 @@
+from typing import Iterable, Optional
+
+
+# SPARSE FIELDSET — ?fields=id,name,price_cheap
+#
+# Field divalidasi terhadap schema response, lalu dipakai untuk daftar kolom
+# SELECT sekaligus isi payload. id selalu ikut (identitas baris & cursor).
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[list[str]]:
+    """
+    "name,price_cheap" → ["id", "name", "price_cheap"]; None jika tidak diisi.
+    ValueError jika ada field yang tidak dikenal.
+    """
+    if not fields:
+        return None
+    allowed = list(allowed)
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return ["id"] + [f for f in requested if f != "id"]
+
+
+def rows_to_dicts(rows, fields: list[str]) -> list[dict]:
+    """zip berhenti di field terakhir, jadi kolom tambahan (sort_key) tidak ikut ke payload."""
+    return [dict(zip(fields, r)) for r in rows]
@@ -1,8 +1,61 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, insert, Date, Text
 from typing import Optional
 from app.models.game import Game
-from app.schemas.game import GameCreate, GameUpdate
+from app.models.sale import Sale
+from app.models.price_history import PriceHistory
+from app.schemas.game import GameCreate, GameUpdate, GameInDB
+from app.services.rollup_service import refresh_games_days, refresh_sales_days
+from app.services.data_version_service import bump_versions, GAMES, SALES
+from app.crud.pagination import keyset_order, keyset_after, decode_cursor, next_cursor_for
+from app.services.count_service import count_rows
+from app.crud.search import name_filter, name_rank
+from app.crud.fields import rows_to_dicts
+from app.services.genre_service import has_genre, link_genres, genres_for_payload
+from app.services.price_history_service import price_change_row
+from app.services.platform_service import has_platform
+from app.services import game_cache
+
+# Kolom GameInDB — list dibaca sebagai tuple → dict (tanpa hydrate objek Game),
+# fields=None berarti semua kolom ini.
+GAME_FIELDS = ["id"] + [f for f in GameInDB.model_fields if f != "id"]
+
+def _select_fields(fields: Optional[list[str]]):
+    """Kolom GameInDB, atau hanya yang diminta lewat ?fields=."""
+    return select(*[Game.__table__.c[f] for f in fields or GAME_FIELDS])
+
+def apply_filters(
+    stmt,
+    search: Optional[str],
+    genre: Optional[str],
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+):
+    if search:
+        stmt = stmt.where(name_filter(search, search_mode))
+    if genre:
+        stmt = stmt.where(has_genre(Game.id, genre))
+    if platform:
+        stmt = stmt.where(has_platform(Game.platforms, platform))
+    return stmt
+
+async def count_all(
+    db: AsyncSession,
+    search: Optional[str],
+    genre: Optional[str],
+    count_strategy: str = "exact",
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+) -> tuple[int, str]:
+    """Total game sesuai filter; return (total, strategi count yang dipakai)."""
+    stmt = apply_filters(select(Game.id), search, genre, search_mode, platform)
+    return await count_rows(
+        db, stmt, count_strategy,
+        table="games",
+        filtered=bool(search or genre or platform),
+        cache_key=(search, genre, search_mode, platform),
+        versions=(GAMES,),
+    )
 
 async def get_all(
     db: AsyncSession,
@@ -12,47 +65,163 @@ async def get_all(
     genre: Optional[str],
     sort_by: str,
     sort_dir: str,
-) -> tuple[int, list[Game]]:
-    stmt = select(Game)
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+) -> list[dict]:
+    """List game sebagai dict; jika fields diisi, hanya kolom itu yang di-select."""
+    stmt = apply_filters(_select_fields(fields), search, genre, search_mode, platform)
 
-    if search:
-        stmt = stmt.where(Game.name.ilike(f"%{search}%"))
-    if genre:
-        stmt = stmt.where(Game.genre.ilike(f"%{genre}%"))
+    # Mode fuzzy: paling relevan dulu, sort_by jadi urutan sekunder
+    rank = name_rank(search, search_mode) if search else None
+    if rank is not None:
+        stmt = stmt.order_by(rank.desc())
 
     col = getattr(Game, sort_by)
-    stmt = stmt.order_by(col.desc() if sort_dir == "desc" else col.asc())
-
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar_one()
+    stmt = stmt.order_by(*keyset_order(col, Game.id, sort_dir))
 
     stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-    games = (await db.execute(stmt)).scalars().all()
+    rows = (await db.execute(stmt)).all()
+    return rows_to_dicts(rows, fields or GAME_FIELDS)
 
-    return total, games
+async def get_all_keyset(
+    db: AsyncSession,
+    cursor: Optional[str],
+    page_size: int,
+    search: Optional[str],
+    genre: Optional[str],
+    sort_by: str,
+    sort_dir: str,
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Seperti get_all, tetapi halaman ditentukan oleh cursor (sort_value, id)
+    dari halaman sebelumnya, bukan OFFSET. Raise ValueError jika cursor tidak valid.
+    Pada mode fuzzy, search hanya menyaring — urutan tetap mengikuti sort_by.
+    """
+    stmt = apply_filters(_select_fields(fields), search, genre, search_mode, platform)
+
+    col = getattr(Game, sort_by)
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_dir, col)
+        stmt = stmt.where(keyset_after(col, Game.id, sort_dir, value, last_id))
+
+    # Kolom sort ikut di-select (walau tidak diminta di fields) supaya cursor tetap bisa dibuat
+    stmt = (
+        stmt.add_columns(col.label("sort_key"))
+        .order_by(*keyset_order(col, Game.id, sort_dir))
+        .limit(page_size + 1)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    rows, next_cursor = next_cursor_for(
+        rows, page_size, sort_by, sort_dir, key=lambda r: (r.sort_key, r.id)
+    )
+    return rows_to_dicts(rows, fields or GAME_FIELDS), next_cursor
+
+def export_query(search: Optional[str], genre: Optional[str], platform: Optional[str] = None):
+    """Select kolom mentah (tanpa ORM) untuk export streaming, urut by id."""
+    # platforms (JSONB) dikirim sebagai teks JSON agar csv/parquet tetap satu kolom string
+    columns = [
+        cast(c, Text).label(c.key) if c.key == "platforms" else c
+        for c in Game.__table__.c
+    ]
+    stmt = select(*columns).order_by(Game.id)
+    return apply_filters(stmt, search, genre, platform=platform)
 
 async def get_by_id(db: AsyncSession, game_id: int) -> Optional[Game]:
     return await db.get(Game, game_id)
 
-async def get_by_slug(db: AsyncSession, slug: str) -> Optional[Game]:
-    stmt = select(Game).where(Game.slug == slug)
-    return (await db.execute(stmt)).scalar_one_or_none()
+async def get_fields_by_id(db: AsyncSession, game_id: int, fields: Optional[list[str]] = None) -> Optional[dict]:
+    """Detail game sebagai dict — semua kolom GameInDB, atau yang diminta lewat ?fields=."""
+    fields = fields or GAME_FIELDS
+    row = (await db.execute(_select_fields(fields).where(Game.id == game_id))).first()
+    return dict(zip(fields, row)) if row else None
+
+async def existing_ids(db: AsyncSession, game_ids: list[int]) -> set[int]:
+    """Subset game_ids yang ada di tabel games — satu query untuk validasi bulk."""
+    if not game_ids:
+        return set()
+    stmt = select(Game.id).where(Game.id.in_(game_ids))
+    return set((await db.execute(stmt)).scalars().all())
+
+async def find_conflict(db: AsyncSession, game_id: int, slug: str) -> Optional[str]:
+    """'id' / 'slug' jika sudah dipakai game lain, None jika aman — satu query untuk create."""
+    stmt = select(Game.id, Game.slug).where((Game.id == game_id) | (Game.slug == slug)).limit(2)
+    rows = (await db.execute(stmt)).all()
+    if any(r.id == game_id for r in rows):
+        return "id"
+    return "slug" if rows else None
+
+async def get_cached(db: AsyncSession, game_id: int) -> Optional[dict]:
+    """Detail game (dict GameInDB) lewat cache LRU → Redis → DB."""
+    return await game_cache.get_or_load(
+        game_cache.id_key(game_id), lambda: get_fields_by_id(db, game_id)
+    )
+
+async def warm_cache(db: AsyncSession, limit: int) -> int:
+    """Isi LRU lokal dengan `limit` game terpopuler (ratings_count) — satu query."""
+    stmt = _select_fields(None).order_by(Game.ratings_count.desc().nulls_last()).limit(limit)
+    games = rows_to_dicts((await db.execute(stmt)).all(), GAME_FIELDS)
+    for game in games:
+        game_cache.prime(game_cache.id_key(game["id"]), game)
+    return len(games)
 
 async def create(db: AsyncSession, payload: GameCreate) -> Game:
-    game = Game(**payload.model_dump())
+    genres = genres_for_payload(payload.genres, payload.genre)
+    game = Game(**payload.model_dump(exclude={"genres"}))
+    if game.genre is None and genres:
+        game.genre = genres[0]
     db.add(game)
+    await db.flush()
+    await db.refresh(game)  # ambil updated_at dari server_default
+    await link_genres(db, {game.id: genres})
+    await refresh_games_days(db, {game.updated_at.date()})
+    if game.price_cheap is not None:
+        await db.execute(insert(PriceHistory).values(
+            game_id=game.id, recorded_at=game.updated_at, price=game.price_cheap
+        ))
+    await bump_versions(db, GAMES)
     await db.commit()
-    await db.refresh(game)
     return game
 
 async def update(db: AsyncSession, game: Game, payload: GameUpdate) -> Game:
+    old_day = game.updated_at.date() if game.updated_at else None
+    old_price = game.price_cheap
     update_data = payload.model_dump(exclude_unset=True)
+    genres = update_data.pop("genres", None)
+    if genres and "genre" not in update_data:
+        update_data["genre"] = genres[0]   # genre utama = genre pertama
     for k, v in update_data.items():
         setattr(game, k, v)
+    await db.flush()
+    await db.refresh(game)  # updated_at baru dari onupdate
+    if genres is not None or "genre" in update_data:
+        await link_genres(db, {game.id: genres_for_payload(genres, game.genre)})
+    await refresh_games_days(db, {old_day, game.updated_at.date() if game.updated_at else None})
+    # Repricing manual (PATCH price_cheap) ikut tercatat di riwayat harga, satu transaksi
+    change = price_change_row(game.id, old_price, game.price_cheap, game.updated_at)
+    if change:
+        await db.execute(insert(PriceHistory).values(**change))
+    await bump_versions(db, GAMES)
     await db.commit()
-    await db.refresh(game)
+    await game_cache.invalidate([game.id])
     return game
 
 async def delete(db: AsyncSession, game: Game) -> None:
+    # Sales milik game ikut terhapus (cascade), jadi rollup sales juga harus diperbarui
+    sale_days = (await db.execute(
+        select(cast(Sale.created_at, Date)).where(Sale.game_id == game.id)
+    )).scalars().all()
+    game_day = game.updated_at.date() if game.updated_at else None
+    game_id = game.id
+
     await db.delete(game)
-    await db.commit()
\ No newline at end of file
+    await db.flush()
+    await refresh_games_days(db, {game_day})
+    await refresh_sales_days(db, sale_days)
+    await bump_versions(db, GAMES, SALES)
+    await db.commit()
+    await game_cache.invalidate([game_id])
\ No newline at end of file
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import DateTime, or_, and_, tuple_
+
+PAGINATION_MODES = ["page", "cursor"]
+
+
+# Urutan list dibuat deterministik: kolom sort lalu id sebagai tie-breaker,
+# sehingga posisi setiap baris bisa dinyatakan dengan pasangan (sort_value, id)
+# — itulah isi cursor. Penempatan NULL mengikuti default Postgres (akhir untuk
+# ASC, awal untuk DESC) supaya satu index (col, id) melayani kedua arah.
+
+def keyset_order(col, id_col, sort_dir: str) -> list:
+    if sort_dir == "desc":
+        return [col.desc().nulls_first(), id_col.desc()]
+    return [col.asc().nulls_last(), id_col.asc()]
+
+
+def keyset_after(col, id_col, sort_dir: str, value: Any, last_id: int):
+    """Predikat 'baris setelah (value, last_id)' sesuai keyset_order."""
+    key = tuple_(col, id_col)
+
+    if sort_dir == "desc":
+        if value is None:
+            # Masih di blok NULL (paling awal) — sisa NULL lalu semua non-NULL
+            return or_(and_(col.is_(None), id_col < last_id), col.is_not(None))
+        return key < tuple_(value, last_id)
+
+    if value is None:
+        # Sudah di blok NULL (paling akhir) — lanjut hanya berdasarkan id
+        return and_(col.is_(None), id_col > last_id)
+    return or_(key > tuple_(value, last_id), col.is_(None))
+
+
+def encode_cursor(sort_by: str, sort_dir: str, value: Any, last_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps({"s": sort_by, "d": sort_dir, "v": value, "i": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_dir: str, col) -> tuple[Any, int]:
+    """
+    Kembalikan (value, last_id) dari cursor opaque.
+    ValueError jika cursor rusak atau dibuat untuk sort yang berbeda.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = data["v"], int(data["i"])
+        if data["s"] != sort_by or data["d"] != sort_dir:
+            raise ValueError("cursor does not match sort_by/sort_dir")
+        if value is not None and isinstance(col.type, DateTime):
+            value = datetime.fromisoformat(value)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"invalid cursor: {e}")
+    return value, last_id
+
+
+def next_cursor_for(rows: list, page_size: int, sort_by: str, sort_dir: str, key) -> tuple[list, Optional[str]]:
+    """
+    rows diambil dengan limit page_size + 1; baris ekstra menandakan masih ada
+    halaman berikutnya. key(row) -> (sort_value, id) untuk baris terakhir.
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    value, last_id = key(rows[-1])
+    return rows, encode_cursor(sort_by, sort_dir, value, last_id)
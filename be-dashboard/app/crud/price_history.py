@@ -0,0 +1,66 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, Date
+from typing import Optional
+from datetime import date, timedelta
+from app.services.genre_service import has_genre
+from app.models.price_history import PriceHistory
+from app.schemas.price_history import PricePoint
+
+async def get_series(
+    db: AsyncSession,
+    points: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    game_id: Optional[int] = None,
+    genre: Optional[str] = None,
+) -> list[PricePoint]:
+    """
+    Riwayat harga yang di-downsample di DB menjadi maksimal `points` bucket
+    dengan lebar waktu sama (width_bucket atas epoch recorded_at).
+    """
+    base = select().select_from(PriceHistory)
+
+    if game_id is not None:
+        base = base.where(PriceHistory.game_id == game_id)
+    if genre:
+        base = base.where(has_genre(PriceHistory.game_id, genre))
+    # Batas dibandingkan langsung ke recorded_at (bukan cast per baris) agar index terpakai
+    if date_from:
+        base = base.where(PriceHistory.recorded_at >= literal(date_from, Date))
+    if date_to:
+        base = base.where(PriceHistory.recorded_at < literal(date_to + timedelta(days=1), Date))
+
+    epoch = func.extract("epoch", PriceHistory.recorded_at)
+
+    # Rentang waktu series — untuk satu game cukup baca ujung index (game_id, recorded_at)
+    lo, hi = (await db.execute(base.add_columns(func.min(epoch), func.max(epoch)))).one()
+    if lo is None:
+        return []
+
+    # +1 detik agar titik terakhir tidak jatuh ke bucket points+1
+    bucket = func.width_bucket(epoch, float(lo), float(hi) + 1, points).label("bucket")
+
+    stmt = (
+        base.add_columns(
+            bucket,
+            func.min(PriceHistory.recorded_at).label("recorded_at"),
+            func.avg(PriceHistory.price).label("avg_price"),
+            func.min(PriceHistory.price).label("min_price"),
+            func.max(PriceHistory.price).label("max_price"),
+            func.count().label("changes"),
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    return [
+        PricePoint(
+            recorded_at=r.recorded_at,
+            avg_price=round(r.avg_price, 2),
+            min_price=round(r.min_price, 2),
+            max_price=round(r.max_price, 2),
+            changes=r.changes,
+        )
+        for r in rows
+    ]
@@ -1,10 +1,97 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, func, exists, values, column, literal_column, Integer, Float, Boolean
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import update as sql_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import Optional
-from app.models.sale import Sale
+from app.models.sale import Sale, SaleGameKey
 from app.models.game import Game
-from app.schemas.sale import SaleCreate, SaleUpdate, SaleInDB
+from app.schemas.sale import SaleCreate, SaleUpdate
+from app.services.rollup_service import refresh_sales_days
+from app.services.data_version_service import bump_versions, SALES, GAMES
+from app.crud.pagination import keyset_order, keyset_after, decode_cursor, next_cursor_for
+from app.services.count_service import count_rows
+from app.crud.search import name_filter, name_rank
+from app.crud.fields import rows_to_dicts
+from app.crud.games import existing_ids
+from app.services.genre_service import has_genre
+from app.services.platform_service import has_platform
+
+FOREIGN_KEY_VIOLATION = "23503"   # SQLSTATE — game_id tidak ada (lagi) di tabel games
+UNIQUE_VIOLATION = "23505"        # SQLSTATE — dipakai bersama SALE_UNIQUE_CONSTRAINT
+SALE_UNIQUE_CONSTRAINT = "sales_game_id_unique"   # PK sales_game_keys: satu sale per game
+
+SORT_MAP = {
+    "our_price": Sale.our_price,
+    "updated_at": Sale.updated_at,
+    "created_at": Sale.created_at,
+    "game_name": Game.name,
+    "genre": Game.genre,
+}
+
+# Kolom SaleInDB — list/detail dibaca sebagai tuple dari select kolom ini,
+# bukan objek Sale + Game penuh (background_image, platforms, dst. tidak ikut).
+SALE_COLUMNS = (
+    Sale.id,
+    Sale.game_id,
+    Sale.our_price,
+    Sale.created_at,
+    Sale.updated_at,
+    Game.name.label("game_name"),
+    Game.genre.label("game_genre"),
+    Game.price_cheap,
+    Game.price_external,
+)
+_SALE_FIELDS = tuple(c.key for c in SALE_COLUMNS)
+_COLUMN_BY_FIELD = {c.key: c for c in SALE_COLUMNS}
+
+
+def _projected(fields: Optional[list[str]] = None):
+    """Semua kolom SaleInDB, atau hanya yang diminta lewat ?fields=."""
+    columns = SALE_COLUMNS if fields is None else [_COLUMN_BY_FIELD[f] for f in fields]
+    return select(*columns).select_from(Sale).join(Game, Sale.game_id == Game.id)
+
+
+def _to_response(rows, fields: Optional[list[str]]) -> list[dict]:
+    # Nilai dari DB sudah bertipe benar → dict langsung, tanpa membangun SaleInDB per baris
+    return rows_to_dicts(rows, fields or _SALE_FIELDS)
+
+
+def apply_filters(
+    stmt,
+    search: Optional[str],
+    genre: Optional[str],
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+):
+    """Filter sales berdasarkan kolom Game — stmt harus sudah join ke games."""
+    if search:
+        stmt = stmt.where(name_filter(search, search_mode))
+    if genre:
+        stmt = stmt.where(has_genre(Game.id, genre))
+    if platform:
+        stmt = stmt.where(has_platform(Game.platforms, platform))
+    return stmt
+
+
+async def count_all(
+    db: AsyncSession,
+    search: Optional[str],
+    genre: Optional[str],
+    count_strategy: str = "exact",
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+) -> tuple[int, str]:
+    """Total sales sesuai filter; return (total, strategi count yang dipakai)."""
+    stmt = apply_filters(select(Sale.id).join(Sale.game), search, genre, search_mode, platform)
+    return await count_rows(
+        db, stmt, count_strategy,
+        table="sales",
+        filtered=bool(search or genre or platform),
+        cache_key=(search, genre, search_mode, platform),
+        versions=(GAMES, SALES),
+    )
+
 
 async def get_all(
     db: AsyncSession,
@@ -14,68 +101,237 @@ async def get_all(
     genre: Optional[str],
     sort_by: str,
     sort_dir: str,
-) -> tuple[int, list[SaleInDB]]:
-    stmt = select(Sale).join(Sale.game)
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+) -> list[dict]:
+    """List sales sebagai dict; jika fields diisi, hanya kolom itu yang di-select."""
+    stmt = apply_filters(_projected(fields), search, genre, search_mode, platform)
 
-    if search:
-        stmt = stmt.where(Game.name.ilike(f"%{search}%"))
-    if genre:
-        stmt = stmt.where(Game.genre.ilike(f"%{genre}%"))
-
-    sort_map = {
-        "our_price": Sale.our_price,
-        "updated_at": Sale.updated_at,
-        "created_at": Sale.created_at,
-        "game_name": Game.name,
-        "genre": Game.genre,
-    }
-    col = sort_map.get(sort_by, Sale.updated_at)
-    stmt = stmt.order_by(col.desc() if sort_dir == "desc" else col.asc())
-
-    count_stmt = select(func.count()).select_from(stmt.subquery())
-    total = (await db.execute(count_stmt)).scalar_one()
-
-    stmt = stmt.options(joinedload(Sale.game)).offset((page - 1) * page_size).limit(page_size)
-    sales = (await db.execute(stmt)).scalars().all()
-
-    result = []
-    for s in sales:
-        result.append(SaleInDB(
-            id=s.id,
-            game_id=s.game_id,
-            our_price=s.our_price,
-            created_at=s.created_at,
-            updated_at=s.updated_at,
-            game_name=s.game.name if s.game else None,
-            game_genre=s.game.genre if s.game else None,
-            price_cheap=s.game.price_cheap if s.game else None,
-            price_external=s.game.price_external if s.game else None,
-        ))
-    return total, result
+    # Mode fuzzy: paling relevan dulu, sort_by jadi urutan sekunder
+    rank = name_rank(search, search_mode) if search else None
+    if rank is not None:
+        stmt = stmt.order_by(rank.desc())
+
+    col = SORT_MAP.get(sort_by, Sale.updated_at)
+    stmt = stmt.order_by(*keyset_order(col, Sale.id, sort_dir))
+
+    stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+    rows = (await db.execute(stmt)).all()
+
+    return _to_response(rows, fields)
+
+
+async def get_all_keyset(
+    db: AsyncSession,
+    cursor: Optional[str],
+    page_size: int,
+    search: Optional[str],
+    genre: Optional[str],
+    sort_by: str,
+    sort_dir: str,
+    search_mode: str = "contains",
+    platform: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Seperti get_all, tetapi halaman ditentukan oleh cursor (sort_value, id)
+    dari halaman sebelumnya, bukan OFFSET. Raise ValueError jika cursor tidak valid.
+    Pada mode fuzzy, search hanya menyaring — urutan tetap mengikuti sort_by.
+    """
+    stmt = apply_filters(_projected(fields), search, genre, search_mode, platform)
+
+    col = SORT_MAP.get(sort_by, Sale.updated_at)
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, sort_dir, col)
+        stmt = stmt.where(keyset_after(col, Sale.id, sort_dir, value, last_id))
+
+    # Nilai sort ikut di-select supaya cursor bisa dibuat juga untuk sort join (game_name/genre)
+    stmt = (
+        stmt.add_columns(col.label("sort_key"))
+        .order_by(*keyset_order(col, Sale.id, sort_dir))
+        .limit(page_size + 1)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    rows, next_cursor = next_cursor_for(
+        rows, page_size, sort_by, sort_dir, key=lambda r: (r.sort_key, r.id)
+    )
+    return _to_response(rows, fields), next_cursor
+
+
+def export_query(search: Optional[str], genre: Optional[str], platform: Optional[str] = None):
+    """Kolom yang sama dengan SaleInDB, tanpa ORM, urut by id."""
+    stmt = _projected().order_by(Sale.id)
+    return apply_filters(stmt, search, genre, platform=platform)
 
 
 async def get_by_id(db: AsyncSession, sale_id: int) -> Optional[Sale]:
-    stmt = select(Sale).where(Sale.id == sale_id).options(joinedload(Sale.game))
-    return (await db.execute(stmt)).scalar_one_or_none()
+    """Objek Sale saja (tanpa Game) — untuk update/delete."""
+    return await db.get(Sale, sale_id)
+
+
+async def get_detail(
+    db: AsyncSession,
+    sale_id: int,
+    fields: Optional[list[str]] = None,
+) -> Optional[dict]:
+    """Sale + kolom game untuk response, satu select kolom tanpa hydrate ORM."""
+    row = (await db.execute(_projected(fields).where(Sale.id == sale_id))).first()
+    if row is None:
+        return None
+    return _to_response([row], fields)[0]
+
+
+def _is_missing_game(exc: IntegrityError) -> bool:
+    # asyncpg (lewat adapter SQLAlchemy) dan psycopg2 sama-sama mengisi pgcode
+    return getattr(exc.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION
+
+
+def _constraint_name(exc: IntegrityError) -> Optional[str]:
+    # psycopg2: diag.constraint_name; asyncpg: exception asli ada di __cause__ adapter SQLAlchemy
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    return getattr(exc.orig.__cause__, "constraint_name", None)
+
+
+def _is_sale_conflict(exc: IntegrityError) -> bool:
+    """Game sudah punya sale (trigger sales_game_keys menolak) — bukan unique lain."""
+    return (
+        getattr(exc.orig, "pgcode", None) == UNIQUE_VIOLATION
+        and _constraint_name(exc) == SALE_UNIQUE_CONSTRAINT
+    )
 
 
-async def create(db: AsyncSession, payload: SaleCreate) -> Sale:
+async def create(db: AsyncSession, payload: SaleCreate) -> Optional[Sale]:
+    """None jika game dihapus di antara validasi dan insert (FK ditolak DB)."""
     sale = Sale(**payload.model_dump())
     db.add(sale)
+    try:
+        await db.flush()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_missing_game(e):
+            return None
+        raise
+    await db.refresh(sale)  # ambil created_at dari server_default
+    await refresh_sales_days(db, {sale.created_at.date()})
+    await bump_versions(db, SALES)
     await db.commit()
-    await db.refresh(sale)
     return sale
 
 
-async def update(db: AsyncSession, sale: Sale, payload: SaleUpdate) -> Sale:
+async def update(db: AsyncSession, sale: Sale, payload: SaleUpdate) -> Optional[dict]:
+    """None jika game_id baru dihapus di antara validasi dan update (FK ditolak DB)."""
     update_data = payload.model_dump(exclude_unset=True)
     for k, v in update_data.items():
         setattr(sale, k, v)
+    try:
+        await db.flush()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_missing_game(e):
+            return None
+        raise
+    if "our_price" in update_data and sale.created_at:
+        await refresh_sales_days(db, {sale.created_at.date()})
+    await bump_versions(db, SALES)
     await db.commit()
-    await db.refresh(sale)
-    return sale
+    return await get_detail(db, sale.id)
 
 
 async def delete(db: AsyncSession, sale: Sale) -> None:
+    day = sale.created_at.date() if sale.created_at else None
     await db.delete(sale)
-    await db.commit()
\ No newline at end of file
+    await db.flush()
+    await refresh_sales_days(db, {day})
+    await bump_versions(db, SALES)
+    await db.commit()
+
+
+# BULK — satu statement per chunk. sales dipartisi sehingga tidak ada UNIQUE (game_id)
+# untuk ON CONFLICT; "sudah punya sale" dibaca dari sales_game_keys (satu sale per game)
+
+BULK_MODES = ["insert", "upsert", "update"]
+BULK_CHUNK_SIZE = 5000      # baris per statement (2 parameter per baris, di bawah batas 32767 asyncpg)
+
+_BULK_RETURNING = (Sale.id, Sale.game_id, Sale.our_price, Sale.created_at)
+
+
+def _bulk_stmt(rows: list[dict], mode: str):
+    v = select(
+        values(column("game_id", Integer), column("our_price", Float), name="v_rows").data(
+            [(r["game_id"], r["our_price"]) for r in rows]
+        )
+    ).cte("v")
+
+    updated = (
+        sql_update(Sale)
+        .where(Sale.game_id == v.c.game_id)
+        .values(our_price=v.c.our_price, updated_at=func.now())
+        .returning(*_BULK_RETURNING, literal_column("false", Boolean).label("inserted"))
+    )
+    if mode == "update":
+        return updated.execution_options(synchronize_session=False)
+
+    # Hanya game yang belum punya sale; UPDATE & INSERT memakai snapshot statement yang sama
+    inserted = (
+        pg_insert(Sale)
+        .from_select(
+            ["game_id", "our_price"],
+            select(v.c.game_id, v.c.our_price).where(~exists().where(SaleGameKey.game_id == v.c.game_id)),
+        )
+        .returning(*_BULK_RETURNING, literal_column("true", Boolean).label("inserted"))
+        .cte("inserted")
+    )
+    if mode == "insert":
+        return select(inserted)
+    return select(updated.cte("updated")).union_all(select(inserted))
+
+
+async def bulk_write(db: AsyncSession, items: list[SaleCreate], mode: str) -> tuple[dict[int, tuple], set[int]]:
+    """
+    Tulis banyak sale sekaligus lalu commit sekali. items harus sudah divalidasi:
+    game_id unik di dalam batch dan ada di tabel games.
+    Return (written, missing): written = {game_id: row(id, game_id, our_price, created_at,
+    inserted)} untuk baris yang tertulis; missing = game_id yang dihapus setelah validasi
+    (FK ditolak). game_id lain yang tidak ada di written = sudah punya sale (insert)
+    atau belum punya sale (update).
+    """
+    missing: set[int] = set()
+    conflict_retried = False
+    while True:
+        written: dict[int, tuple] = {}
+        pending = [item for item in items if item.game_id not in missing]
+        chunk_ids: list[int] = []
+        try:
+            for i in range(0, len(pending), BULK_CHUNK_SIZE):
+                chunk = pending[i:i + BULK_CHUNK_SIZE]
+                chunk_ids = [item.game_id for item in chunk]
+                rows = [item.model_dump() for item in chunk]
+                for r in (await db.execute(_bulk_stmt(rows, mode))).all():
+                    written[r.game_id] = r
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if _is_missing_game(e):
+                # Game dihapus setelah validasi → cek ulang chunk yang gagal, keluarkan dari batch
+                gone = set(chunk_ids) - await existing_ids(db, chunk_ids)
+                if not gone:
+                    raise
+                missing |= gone
+                continue
+            if _is_sale_conflict(e) and not conflict_retried:
+                # Request lain membuat sale untuk game yang sama setelah snapshot statement ini
+                # → ulangi sekali, game itu kini terbaca "sudah ada"
+                conflict_retried = True
+                continue
+            raise
+
+    if written:
+        await refresh_sales_days(db, {r.created_at.date() for r in written.values() if r.created_at})
+        await bump_versions(db, SALES)
+    await db.commit()
+    return written, missing
+
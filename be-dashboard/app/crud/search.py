@@ -0,0 +1,45 @@
+from typing import Optional
+from sqlalchemy import text, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.game import Game
+
+SEARCH_MODES = ["contains", "fuzzy"]
+
+# Status extension pg_trgm dicek sekali per proses
+_trgm_available: Optional[bool] = None
+
+
+async def trigram_available(db: AsyncSession) -> bool:
+    global _trgm_available
+    if _trgm_available is None:
+        row = (await db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))).first()
+        _trgm_available = row is not None
+    return _trgm_available
+
+
+async def resolve_search_mode(db: AsyncSession, search: Optional[str], search_mode: str) -> str:
+    """
+    Mode yang benar-benar dipakai:
+    - contains : ILIKE '%term%' (memakai index trigram jika ada)
+    - fuzzy    : word similarity pg_trgm, toleran typo, diurutkan by relevansi
+    - words    : fallback fuzzy tanpa pg_trgm — setiap kata harus muncul (urutan bebas)
+    """
+    if not search or search_mode != "fuzzy":
+        return "contains"
+    return "fuzzy" if await trigram_available(db) else "words"
+
+
+def name_filter(search: str, mode: str):
+    if mode == "fuzzy":
+        # name %> term  ⇔  word_similarity(term, name) >= pg_trgm.word_similarity_threshold
+        return or_(Game.name.op("%>")(search), Game.name.ilike(f"%{search}%"))
+    if mode == "words":
+        return and_(*[Game.name.ilike(f"%{word}%") for word in search.split()])
+    return Game.name.ilike(f"%{search}%")
+
+
+def name_rank(search: str, mode: str):
+    """Ekspresi relevansi untuk ORDER BY, atau None jika mode tidak memberi peringkat."""
+    if mode == "fuzzy":
+        return func.word_similarity(search, Game.name)
+    return None
@@ -1,18 +1,90 @@
+import time
+from fastapi import Request, Response
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from typing import AsyncGenerator
 from app.core.config import settings
+from app.db import pool_metrics, query_metrics, query_debug
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+# Cookie penanda "client ini baru menulis" — nilainya epoch detik batas
+# window read-your-writes. Selama window, read session diarahkan ke primary.
+RYW_COOKIE = "db_rw_until"
+
+def _create_engine(url: str, name: str):
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=pool_metrics.InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # cache asyncpg + cache statement milik dialect SQLAlchemy
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    pool_metrics.instrument(engine)
+    query_metrics.instrument(engine)
+    return engine
+
+query_debug.install()
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+# Replica opsional untuk endpoint read-only; tanpa DATABASE_READ_URL semua ke primary
+read_engine = _create_engine(settings.DATABASE_READ_URL, "read") if settings.DATABASE_READ_URL else None
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, expire_on_commit=False) if read_engine is not None else AsyncSessionLocal
+)
+
 class Base(DeclarativeBase):
     pass
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        yield session
+@event.listens_for(Session, "after_commit")
+def _mark_client_write(session: Session):
+    # Session dari get_db membawa sub-response; commit = client baru menulis
+    response = session.info.get("response")
+    if response is None or read_engine is None:
+        return
+    response.set_cookie(
+        RYW_COOKIE,
+        str(int(time.time()) + settings.DB_READ_YOUR_WRITES_SECONDS),
+        max_age=settings.DB_READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        samesite="lax",
+    )
+
+def _recently_wrote(request: Request) -> bool:
+    try:
+        return int(request.cookies.get(RYW_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Replica, kecuali client menulis dalam DB_READ_YOUR_WRITES_SECONDS terakhir."""
+    if read_engine is None or _recently_wrote(request):
+        return AsyncSessionLocal
+    return ReadSessionLocal
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    hold = pool_metrics.begin_request()
+    try:
+        async with AsyncSessionLocal(info={"response": response}) as session:
+            yield session
+    finally:
+        pool_metrics.end_request(hold, f"{request.method} {request.url.path}", settings.DB_SLOW_HOLD_MS)
 
-async def init_db():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session untuk endpoint read-only (dashboard, list, detail)."""
+    hold = pool_metrics.begin_request()
+    try:
+        async with read_sessionmaker(request)() as session:
+            yield session
+    finally:
+        pool_metrics.end_request(hold, f"{request.method} {request.url.path}", settings.DB_SLOW_HOLD_MS)
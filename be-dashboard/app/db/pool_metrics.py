@@ -0,0 +1,163 @@
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Metrics pool koneksi async engine (per proses API, per pool — primary / read).
+# Pool diidentifikasi lewat pool_logging_name yang dipasang saat create engine.
+#
+# - checkout_wait : waktu mendapatkan koneksi dari pool (antre saat pool penuh,
+#                   termasuk connect baru / pre-ping)
+# - hold          : lama satu koneksi dipinjam sebelum dikembalikan
+# - request_hold  : total hold semua koneksi dalam satu request (lewat get_db)
+# - timeouts      : checkout yang gagal karena pool habis (DB_POOL_TIMEOUT)
+
+RECENT_SAMPLES = 1024        # sampel terakhir untuk persentil
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class _Timing:
+    """Akumulator durasi (detik) — count/sum/max + persentil dari sampel terakhir."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._recent)
+
+        def pct(q: float) -> Optional[float]:
+            return _ms(samples[min(len(samples) - 1, int(q * len(samples)))]) if samples else None
+
+        return {
+            "count": self.count,
+            "avg_ms": _ms(self.total / self.count) if self.count else None,
+            "max_ms": _ms(self.max),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+        }
+
+
+class _PoolMetrics:
+    def __init__(self):
+        self.checkout_wait = _Timing()
+        self.hold = _Timing()
+        self.counters = {"timeouts": 0, "connects": 0, "invalidations": 0}
+
+
+_pools: dict[str, _PoolMetrics] = {}
+request_hold = _Timing()
+
+
+def _metrics_for(pool) -> _PoolMetrics:
+    name = pool._orig_logging_name or "default"
+    if name not in _pools:
+        _pools[name] = _PoolMetrics()
+    return _pools[name]
+
+
+# Total hold koneksi untuk request yang sedang berjalan: [detik, jumlah checkout]
+_request_hold: ContextVar[Optional[list]] = ContextVar("db_request_hold", default=None)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool yang mengukur waktu tunggu checkout dan timeout."""
+
+    def connect(self):
+        metrics = _metrics_for(self)
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.counters["timeouts"] += 1
+            raise
+        finally:
+            metrics.checkout_wait.observe(time.perf_counter() - start)
+
+
+def instrument(engine: AsyncEngine) -> None:
+    """Pasang listener checkout/checkin untuk mengukur hold time koneksi."""
+    pool = engine.sync_engine.pool
+    metrics = _metrics_for(pool)
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.counters["connects"] += 1
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_at"] = time.perf_counter()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checkout_at", None)
+        if started is None:
+            return
+        held = time.perf_counter() - started
+        metrics.hold.observe(held)
+        acc = _request_hold.get()
+        if acc is not None:
+            acc[0] += held
+            acc[1] += 1
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.counters["invalidations"] += 1
+
+
+# PER REQUEST — dipakai get_db
+
+def begin_request() -> list:
+    acc = [0.0, 0]
+    _request_hold.set(acc)
+    return acc
+
+
+def end_request(acc: list, label: str, slow_ms: int) -> None:
+    seconds, checkouts = acc
+    if not checkouts:
+        return   # request tidak pernah menyentuh DB
+    request_hold.observe(seconds)
+    if slow_ms and seconds * 1000 >= slow_ms:
+        print(f"[DBPool] {label} held connections {seconds * 1000:.0f}ms ({checkouts} checkout)")
+
+
+# SNAPSHOT
+
+def engine_metrics(engine: AsyncEngine) -> _PoolMetrics:
+    return _metrics_for(engine.sync_engine.pool)
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    metrics = _metrics_for(pool)
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "capacity": capacity,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),   # koneksi di atas pool_size yang sedang terbuka
+        "utilization": round(pool.checkedout() / capacity, 4) if capacity else None,
+        "timeout_s": pool.timeout(),
+        **metrics.counters,
+        "checkout_wait": metrics.checkout_wait.snapshot(),
+        "hold": metrics.hold.snapshot(),
+    }
@@ -0,0 +1,103 @@
+from typing import Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.db import query_metrics
+from app.db.query_metrics import QueryStats
+
+# Mode instrumentasi query untuk dev/staging (QUERY_DEBUG=true):
+#
+# - slow-query log : statement di atas SLOW_QUERY_MS dicetak beserta EXPLAIN-nya
+# - N+1 detector   : SQL yang sama (bentuk statement setelah compile, parameter
+#                    terpisah) dieksekusi >= NPLUSONE_THRESHOLD kali dalam satu
+#                    request / task Celery
+# - query budget   : route dengan Depends(query_budget(n)) dicek jumlah query-nya;
+#                    QUERY_BUDGET_STRICT=true membuat pelanggaran menjadi exception
+#                    (TestClient meneruskannya → test gagal)
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+SQL_PREVIEW = 300            # karakter SQL yang dicetak di log
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _preview(statement: str) -> str:
+    sql = " ".join(statement.split())
+    return sql if len(sql) <= SQL_PREVIEW else sql[:SQL_PREVIEW] + "…"
+
+
+# SLOW QUERY + EXPLAIN
+
+def _explain(conn, statement: str, parameters) -> str:
+    """
+    EXPLAIN (tanpa ANALYZE → statement tidak dieksekusi ulang) lewat cursor DBAPI
+    baru di koneksi yang sama, di dalam SAVEPOINT supaya kegagalan EXPLAIN tidak
+    membatalkan transaksi request.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT query_debug_explain")
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(str(row[0]) for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_debug_explain")
+            plan = f"(EXPLAIN failed: {e})"
+        cursor.execute("RELEASE SAVEPOINT query_debug_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def _on_statement(conn, statement, parameters, context, executemany, seconds) -> None:
+    if seconds * 1000 < settings.SLOW_QUERY_MS:
+        return
+    stats = query_metrics.current()
+    label = stats.label if stats is not None and stats.label else "-"
+    print(f"[SlowQuery] {seconds * 1000:.0f}ms {label}\n  {_preview(statement)}")
+
+    streaming = context is not None and context.execution_options.get("stream_results")
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and not streaming and query_metrics.statement_operation(statement) in EXPLAINABLE:
+        for line in _explain(conn, statement, parameters).splitlines():
+            print(f"    {line}")
+
+
+_installed = False
+
+
+def install() -> None:
+    """Aktifkan hook statement jika QUERY_DEBUG; aman dipanggil berkali-kali."""
+    global _installed
+    if settings.QUERY_DEBUG and not _installed:
+        query_metrics.on_statement(_on_statement)
+        _installed = True
+
+
+# N+1 + BUDGET — dipanggil di akhir request (MetricsMiddleware) / task Celery
+
+def finish(stats: QueryStats, label: str, budget: Optional[int] = None) -> None:
+    if not settings.QUERY_DEBUG:
+        return
+
+    if stats.statements:
+        for statement, times in stats.statements.most_common():
+            if times < settings.NPLUSONE_THRESHOLD:
+                break
+            print(f"[N+1] {label}: {times}x {_preview(statement)}")
+
+    if budget is not None and stats.count > budget:
+        message = f"{label} ran {stats.count} queries, budget {budget}"
+        print(f"[QueryBudget] {message}")
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+
+
+def query_budget(max_queries: int):
+    """Dependency: batas jumlah query untuk route ini (dicek saat QUERY_DEBUG)."""
+    def dependency(request: Request) -> None:
+        request.scope["query_budget"] = max_queries
+
+    return dependency
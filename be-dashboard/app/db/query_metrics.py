@@ -0,0 +1,83 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Instrumentasi query lewat event cursor SQLAlchemy: setiap statement diukur
+# lalu diatribusikan ke request (atau task) yang sedang berjalan via contextvar.
+# Consumer mendaftar lewat on_query() (Prometheus) atau on_statement()
+# (slow-query log / N+1 detector di app.db.query_debug).
+
+
+class QueryStats:
+    """Akumulator query dalam satu request/task."""
+
+    def __init__(self, label: Optional[str] = None, track_statements: bool = False):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        # SQL hasil compile → jumlah eksekusi; hanya diisi jika diminta (mode debug)
+        self.statements: Optional[Counter] = Counter() if track_statements else None
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+_listeners: list[Callable[[str, float], None]] = []
+_statement_hooks: list[Callable] = []
+
+
+def on_query(listener: Callable[[str, float], None]) -> None:
+    """listener(operation, seconds) dipanggil setelah setiap statement selesai."""
+    _listeners.append(listener)
+
+
+def on_statement(hook: Callable) -> None:
+    """hook(conn, statement, parameters, context, executemany, seconds) — detail statement."""
+    _statement_hooks.append(hook)
+
+
+def begin_request(label: Optional[str] = None) -> QueryStats:
+    stats = QueryStats(label, track_statements=bool(_statement_hooks))
+    _current.set(stats)
+    return stats
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def statement_operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements[statement] += 1
+    operation = statement_operation(statement)
+    for listener in _listeners:
+        listener(operation, elapsed)
+    for hook in _statement_hooks:
+        hook(conn, statement, parameters, context, executemany, elapsed)
+
+
+def instrument(engine) -> None:
+    """Pasang listener cursor di engine (AsyncEngine atau Engine sync)."""
+    target = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
@@ -1,16 +1,27 @@
-from fastapi import FastAPI
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.db.database import init_db
+from app.db.database import engine, read_engine, AsyncSessionLocal
 from app.routers.api_router import api_router
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.core import startup
+from app.core.metrics import MetricsMiddleware, render as render_metrics
+from app.core.compression import CompressionMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
+    # Skema dikelola Alembic — startup hanya memverifikasi revisi, lalu warmup
+    await startup.run_startup(engine, read_engine, AsyncSessionLocal)
     yield
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 
 app = FastAPI(
@@ -18,8 +29,12 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,   # orjson untuk semua route
 )
 
+# Paling dalam: metrics mengukur sampai body terkompres terakhir terkirim
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
@@ -27,10 +42,28 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+# Liveness: proses hidup (tanpa menyentuh DB)
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+# Readiness: startup selesai (migrasi dicek, pool & cache hangat) dan DB menjawab
+@app.get("/ready")
+async def ready():
+    ok, body = await startup.readiness(engine)
+    return FastJSONResponse(body, status_code=200 if ok else 503)
+
+
+# Prometheus: latency per route, query DB per request, pool, cache, task Celery
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(await render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+startup.state["import_ms"] = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 1)
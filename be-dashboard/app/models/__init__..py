@@ -1,3 +1,7 @@
 from app.models.game import Game
-from app.models.sale import Sale
-from app.models.sync_log import SyncLog
\ No newline at end of file
+from app.models.sale import Sale, SaleGameKey
+from app.models.sync_log import SyncLog, SyncLogDaily
+from app.models.rollup import SalesDaily, GamesDaily
+from app.models.price_history import PriceHistory
+from app.models.data_version import DataVersion
+from app.models.genre import Genre, GameGenre
\ No newline at end of file
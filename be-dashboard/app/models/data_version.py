@@ -0,0 +1,11 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class DataVersion(Base):
+    """Counter versi data per domain (games, sales) — dinaikkan setiap kali data ditulis"""
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
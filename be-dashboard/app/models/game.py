@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -6,6 +7,16 @@ from app.db.database import Base
 class Game(Base):
     """Data game — gabungan metadata RAWG + harga CheapShark"""
     __tablename__ = "games"
+    __table_args__ = (
+        # (sort_column, id) untuk keyset pagination
+        Index("ix_games_name_id", "name", "id"),
+        Index("ix_games_released_id", "released", "id"),
+        Index("ix_games_rating_id", "rating", "id"),
+        Index("ix_games_updated_at_id", "updated_at", "id"),
+        # filter platform (platforms @> '["PC"]')
+        Index("ix_games_platforms_gin", "platforms", postgresql_using="gin", postgresql_ops={"platforms": "jsonb_path_ops"}),
+        # ix_games_name_trgm (GIN pg_trgm) hanya dibuat lewat migrasi karena butuh extension
+    )
 
     id = Column(Integer, primary_key=True)            # ID dari RAWG
     slug = Column(String(255), unique=True, nullable=False)
@@ -16,7 +27,7 @@ class Game(Base):
     ratings_count = Column(Integer, nullable=True)
     metacritic = Column(Integer, nullable=True)
     background_image = Column(Text, nullable=True)
-    platforms = Column(Text, nullable=True)           # JSON string
+    platforms = Column(JSONB(none_as_null=True), nullable=True)   # list nama platform; None → SQL NULL, bukan JSON 'null'
 
     # ── Harga dari CheapShark ─────────────────────────────────────────────────
     price_external = Column(Float, nullable=True)     # harga normal di Steam/external store
@@ -24,6 +35,6 @@ class Game(Base):
     cheapshark_game_id = Column(String(50), nullable=True)  # ID game di CheapShark
 
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now(), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now(), nullable=True, index=True)
 
     sales = relationship("Sale", back_populates="game", cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from app.db.database import Base
+
+class Genre(Base):
+    """Lookup genre RAWG"""
+    __tablename__ = "genres"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False)
+
+
+class GameGenre(Base):
+    """Junction game ↔ genre — satu game bisa punya banyak genre"""
+    __tablename__ = "game_genres"
+    __table_args__ = (
+        # Filter per genre: genre_id → daftar game_id (index-only scan)
+        Index("ix_game_genres_genre_id_game_id", "genre_id", "game_id"),
+    )
+
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    genre_id = Column(Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, DateTime, REAL, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class PriceHistory(Base):
+    """
+    Riwayat price_cheap per game — append-only, hanya dicatat saat harga berubah.
+    Sengaja ringkas: tanpa surrogate id, harga disimpan sebagai REAL (4 byte).
+    """
+    __tablename__ = "price_history"
+    __table_args__ = (
+        # BRIN kecil & murah untuk query rentang waktu di tabel append-only
+        Index("ix_price_history_recorded_at_brin", "recorded_at", postgresql_using="brin"),
+    )
+
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    recorded_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    price = Column(REAL, nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, Date
+from app.db.database import Base
+
+class SalesDaily(Base):
+    """Rollup harian sales — dipelihara saat sale ditulis, dibaca oleh dashboard"""
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)              # cast(sales.created_at, Date)
+    sales_count = Column(Integer, nullable=False, default=0)
+    max_our_price = Column(Float, nullable=True)
+
+
+class GamesDaily(Base):
+    """Rollup harian game per updated_at — dipelihara per hari saat game ditulis / di-sync"""
+    __tablename__ = "games_daily"
+
+    day = Column(Date, primary_key=True)              # cast(games.updated_at, Date)
+    games_count = Column(Integer, nullable=False, default=0)
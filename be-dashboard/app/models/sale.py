@@ -1,19 +1,43 @@
 
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 class Sale(Base):
+    """
+    Tabel dipartisi RANGE (created_at) per bulan UTC — sales_YYYY_MM + sales_default,
+    dibuat lewat migrasi dan sales_ensure_partitions() (app.services.partition_service).
+    Filter tanggal harus berupa rentang pada created_at (bukan cast) agar partisi terpangkas.
+    """
     __tablename__ = "sales"
     __table_args__ = (
-        UniqueConstraint("game_id", name="sales_game_id_unique"),
+        Index("ix_sales_game_id", "game_id"),
+        # (sort_column, id) untuk keyset pagination
+        Index("ix_sales_our_price_id", "our_price", "id"),
+        Index("ix_sales_updated_at_id", "updated_at", "id"),
+        Index("ix_sales_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    # PK tabel (id, created_at) karena kolom partisi wajib ikut; identitas ORM cukup id
+    __mapper_args__ = {"primary_key": ["id"]}
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     game_id = Column(Integer, ForeignKey("games.id"), nullable=False)
     our_price = Column(Float, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now(), nullable=True)
 
-    game = relationship("Game", back_populates="sales")
\ No newline at end of file
+    game = relationship("Game", back_populates="sales")
+
+
+class SaleGameKey(Base):
+    """
+    Satu sale per game. UNIQUE (game_id) tidak bisa dipasang di tabel partisi,
+    jadi dijaga tabel ini — diisi trigger sales_game_key_sync di sales, tidak
+    pernah ditulis aplikasi. Nama PK tetap sales_game_id_unique.
+    """
+    __tablename__ = "sales_game_keys"
+
+    game_id = Column(Integer, primary_key=True)
+    sale_id = Column(Integer, nullable=False)
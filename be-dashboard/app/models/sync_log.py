@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Text, Index
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 class SyncLog(Base):
-    """Mencatat waktu terakhir sinkronisasi"""
+    """Satu baris per run sync — dipadatkan ke sync_logs_daily setelah SYNC_LOG_RETENTION_DAYS"""
     __tablename__ = "sync_logs"
+    __table_args__ = (
+        # run terakhir per source & filter rentang waktu riwayat
+        Index("ix_sync_logs_source_synced_at", "source", "synced_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     source = Column(String(50), nullable=False)
@@ -14,5 +17,23 @@ class SyncLog(Base):
     records_inserted = Column(Integer, default=0)
     records_updated = Column(Integer, default=0)
     records_skipped = Column(Integer, default=0)      # game tidak ditemukan di CheapShark
+    duration_seconds = Column(Float, nullable=True)   # NULL untuk log sebelum kolom ini ada
     status = Column(String(20), default="success")
-    message = Column(Text, nullable=True)
\ No newline at end of file
+    message = Column(Text, nullable=True)
+
+
+class SyncLogDaily(Base):
+    """Ringkasan harian sync_logs yang sudah lewat masa retensi (dijumlahkan, bukan dirata-rata)"""
+    __tablename__ = "sync_logs_daily"
+
+    source = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)              # cast(sync_logs.synced_at, Date)
+    runs = Column(Integer, nullable=False, default=0)
+    success_runs = Column(Integer, nullable=False, default=0)
+    records_fetched = Column(Integer, nullable=False, default=0)
+    records_inserted = Column(Integer, nullable=False, default=0)
+    records_updated = Column(Integer, nullable=False, default=0)
+    records_skipped = Column(Integer, nullable=False, default=0)
+    # games/menit hanya dari run yang durasinya tercatat
+    timed_records_fetched = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Float, nullable=False, default=0)
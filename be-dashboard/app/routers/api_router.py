@@ -3,7 +3,8 @@ from app.routers import (
     dashboard,
     games,
     sales,
-    sync
+    sync,
+    system,
 )
 
 api_router = APIRouter()
@@ -11,4 +12,5 @@ api_router = APIRouter()
 api_router.include_router(games.router, prefix="/games", tags=["Games"])
 api_router.include_router(sales.router, prefix="/sales", tags=["Sales"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
-api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
\ No newline at end of file
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(system.router, prefix="/system", tags=["System"])
\ No newline at end of file
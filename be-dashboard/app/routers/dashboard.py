@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, cast, Date
+from sqlalchemy import select, func, cast, tablesample, true, Date
+from sqlalchemy.orm import aliased
 from typing import Optional
 from datetime import date
-from app.db.database import get_db
+from app.db.database import get_read_db
+from app.core.conditional import conditional_get
+from app.db.query_debug import query_budget
+from app.core.responses import Responder, responder
+from app.services.data_version_service import GAMES, SALES
 from app.models.game import Game
 from app.models.sale import Sale
+from app.models.rollup import SalesDaily, GamesDaily
+from app.models.genre import Genre
+from app.services.genre_service import has_genre, join_genres
+from app.services.platform_service import has_platform, platform_values
+from app.services.rollup_service import GRANULARITIES, bucket_col, day_between, fill_gaps, check_bucket_range
+from app.crud.price_history import get_series
+from app.schemas.price_history import PriceSeries
 from app.schemas.dashboard import (
     PriceRangeByGenre,
     PriceRatioItem,
@@ -14,9 +26,23 @@ from app.schemas.dashboard import (
     AvgRatingByGenre,
     SalesByDate,
     MaxPriceByDate,
+    PricePercentilesByGenre,
+    HistogramBucket,
+    PriceHistogramByGenre,
+    PlatformSummary,
 )
 
-router = APIRouter()
+# Semua endpoint dashboard bergantung pada data games & sales → 304 jika keduanya belum berubah.
+# Budget: 1 lookup versi + maksimal 3 query agregat per endpoint.
+router = APIRouter(dependencies=[Depends(conditional_get(GAMES, SALES)), Depends(query_budget(4))])
+
+
+def _check_range(date_from: Optional[date], date_to: Optional[date], granularity: str) -> None:
+    """Tolak rentang time series yang terlalu panjang sebelum query (400, bukan jutaan baris kosong)."""
+    try:
+        check_bucket_range(date_from, date_to, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # =============================================================================
 # PUBLIC — Data umum game (tidak butuh konteks penjualan toko)
@@ -24,53 +50,61 @@ router = APIRouter()
 
 # Ringkasan umum (total game, total sales, rata-rata harga global & toko)
 @router.get("/summary")
-async def get_summary(db: AsyncSession = Depends(get_db)):
-    total_games = (await db.execute(select(func.count(Game.id)))).scalar_one()
-    total_sales = (await db.execute(select(func.count(Sale.id)))).scalar_one()
-
-    avg_global = (await db.execute(
-        select(func.avg(Game.price_cheap)).where(Game.price_cheap != None)
-    )).scalar_one()
+async def get_summary(
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    games_stmt = select(func.count(Game.id), func.avg(Game.price_cheap))
+    sales_stmt = select(func.count(Sale.id), func.avg(Sale.our_price))
+    if platform:
+        games_stmt = games_stmt.where(has_platform(Game.platforms, platform))
+        sales_stmt = sales_stmt.where(
+            Sale.game_id.in_(select(Game.id).where(has_platform(Game.platforms, platform)))
+        )
 
-    avg_our = (await db.execute(
-        select(func.avg(Sale.our_price))
-    )).scalar_one()
+    # avg() mengabaikan NULL, jadi sama dengan filter price_cheap != None
+    total_games, avg_global = (await db.execute(games_stmt)).one()
+    total_sales, avg_our = (await db.execute(sales_stmt)).one()
 
-    return {
+    return out({
         "total_games": total_games,
         "total_sales": total_sales,
         "avg_global_price": round(avg_global or 0, 2),
         "avg_our_price": round(avg_our or 0, 2),
-    }
+    })
 
 # Rentang harga (min, max, rata-rata) per genre
 @router.get("/price-range-by-genre", response_model=list[PriceRangeByGenre])
 async def price_range_by_genre(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    stmt = (
+    stmt = join_genres(
         select(
-            Game.genre,
+            Genre.name.label("genre"),
             func.min(Game.price_cheap).label("min_price"),
             func.max(Game.price_cheap).label("max_price"),
             func.avg(Game.price_cheap).label("avg_price"),
             func.count(Game.id).label("game_count"),
-        )
-        .where(Game.genre != None)
-        .where(Game.price_cheap != None)
-    )
+        ),
+        Game.id,
+    ).where(Game.price_cheap != None)
 
     if date_from:
         stmt = stmt.where(cast(Game.updated_at, Date) >= date_from)
     if date_to:
         stmt = stmt.where(cast(Game.updated_at, Date) <= date_to)
+    if platform:
+        stmt = stmt.where(has_platform(Game.platforms, platform))
 
-    stmt = stmt.group_by(Game.genre).order_by(func.avg(Game.price_cheap).desc())
+    stmt = stmt.group_by(Genre.name).order_by(func.avg(Game.price_cheap).desc())
     rows = (await db.execute(stmt)).all()
 
-    return [
+    return out([
         PriceRangeByGenre(
             genre=r.genre,
             min_price=round(r.min_price, 2) if r.min_price is not None else None,
@@ -79,126 +113,144 @@ async def price_range_by_genre(
             game_count=r.game_count,
         )
         for r in rows
-    ]
+    ])
 
 # Rata-rata rating per genre
 @router.get("/avg-rating-by-genre", response_model=list[AvgRatingByGenre])
 async def avg_rating_by_genre(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    stmt = (
+    stmt = join_genres(
         select(
-            Game.genre,
+            Genre.name.label("genre"),
             func.avg(Game.rating).label("avg_rating"),
             func.count(Game.id).label("game_count"),
-        )
-        .where(Game.genre != None)
-        .where(Game.rating != None)
-    )
+        ),
+        Game.id,
+    ).where(Game.rating != None)
 
     if date_from:
         stmt = stmt.where(cast(Game.updated_at, Date) >= date_from)
     if date_to:
         stmt = stmt.where(cast(Game.updated_at, Date) <= date_to)
+    if platform:
+        stmt = stmt.where(has_platform(Game.platforms, platform))
 
-    stmt = stmt.group_by(Game.genre).order_by(func.avg(Game.rating).desc())
+    stmt = stmt.group_by(Genre.name).order_by(func.avg(Game.rating).desc())
     rows = (await db.execute(stmt)).all()
 
-    return [
+    return out([
         AvgRatingByGenre(
             genre=r.genre,
             avg_rating=round(r.avg_rating, 2),
             game_count=r.game_count,
         )
         for r in rows
-    ]
+    ])
 
-# Jumlah game yang diupdate per tanggal (updated_at)
+# Jumlah game yang diupdate per tanggal (updated_at) — dibaca dari rollup harian
 @router.get("/games-by-date", response_model=list[GamesByDate])
 async def games_by_date(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    granularity: str = Query("day", enum=GRANULARITIES),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    date_col = cast(Game.updated_at, Date).label("date")
+    _check_range(date_from, date_to, granularity)
+    bucket = bucket_col(GamesDaily.day, granularity).label("bucket")
 
-    stmt = (
-        select(date_col, func.count(Game.id).label("count"))
-        .where(Game.updated_at != None)
-    )
+    stmt = select(bucket, func.sum(GamesDaily.games_count).label("count"))
 
     if date_from:
-        stmt = stmt.where(cast(Game.updated_at, Date) >= date_from)
+        stmt = stmt.where(GamesDaily.day >= date_from)
     if date_to:
-        stmt = stmt.where(cast(Game.updated_at, Date) <= date_to)
+        stmt = stmt.where(GamesDaily.day <= date_to)
 
-    stmt = stmt.group_by(date_col).order_by(date_col)
+    stmt = stmt.group_by(bucket).order_by(bucket)
     rows = (await db.execute(stmt)).all()
 
-    return [GamesByDate(date=str(r.date), count=r.count) for r in rows]
+    series = fill_gaps({r.bucket: r.count for r in rows}, date_from, date_to, granularity, empty=0)
+    return out([GamesByDate(date=str(d), count=c) for d, c in series])
 
 # =============================================================================
 # STORE — Data penjualan & perbandingan harga toko vs global
 # =============================================================================
 
-# Perbandingan harga toko vs global (price ratio) per game, dengan filter genre
+# Perbandingan harga toko vs global (price ratio) per game, dengan filter genre & platform
 @router.get("/price-ratio", response_model=list[PriceRatioItem])
 async def price_ratio(
     genre: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
     stmt = (
-        select(Sale, Game)
+        select(
+            Game.id.label("game_id"),
+            Game.name.label("game_name"),
+            Game.genre,
+            Sale.our_price,
+            Game.price_cheap,
+        )
+        .select_from(Sale)
         .join(Game, Sale.game_id == Game.id)
         .where(Game.price_cheap != None)
     )
 
     if genre:
-        stmt = stmt.where(Game.genre.ilike(f"%{genre}%"))
+        stmt = stmt.where(has_genre(Game.id, genre))
+    if platform:
+        stmt = stmt.where(has_platform(Game.platforms, platform))
 
     rows = (await db.execute(stmt)).all()
 
-    result = []
-    for sale, game in rows:
-        ratio = round(sale.our_price / game.price_cheap, 4) if game.price_cheap else None
-        result.append(PriceRatioItem(
-            game_id=game.id,
-            game_name=game.name,
-            genre=game.genre,
-            our_price=sale.our_price,
-            price_cheap=game.price_cheap,
-            ratio=ratio,
-        ))
+    # Satu item per sale → dict langsung dari row (bentuk PriceRatioItem), tanpa model per baris
+    result = [
+        {
+            "game_id": r.game_id,
+            "game_name": r.game_name,
+            "genre": r.genre,
+            "our_price": r.our_price,
+            "price_cheap": r.price_cheap,
+            "ratio": round(r.our_price / r.price_cheap, 4) if r.price_cheap else None,
+        }
+        for r in rows
+    ]
 
-    result.sort(key=lambda x: x.ratio or 0, reverse=True)
-    return result
+    result.sort(key=lambda x: x["ratio"] or 0, reverse=True)
+    return out(result)
 
 # Price gap per genre
 @router.get("/price-gap-by-genre", response_model=list[PriceGapByGenre])
 async def price_gap_by_genre(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    stmt = (
+    stmt = join_genres(
         select(
-            Game.genre,
+            Genre.name.label("genre"),
             func.avg(Sale.our_price).label("avg_our_price"),
             func.avg(Game.price_cheap).label("avg_global_price"),
         )
-        .join(Sale, Game.id == Sale.game_id)
-        .where(Game.genre != None)
-        .where(Game.price_cheap != None)
-    )
+        .select_from(Game)
+        .join(Sale, Game.id == Sale.game_id),
+        Game.id,
+    ).where(Game.price_cheap != None)
 
-    if date_from:
-        stmt = stmt.where(cast(Sale.created_at, Date) >= date_from)
-    if date_to:
-        stmt = stmt.where(cast(Sale.created_at, Date) <= date_to)
+    # Rentang pada created_at → hanya partisi sales bulan terkait yang dibaca
+    stmt = stmt.where(*day_between(Sale.created_at, date_from, date_to))
+    if platform:
+        stmt = stmt.where(has_platform(Game.platforms, platform))
 
-    stmt = stmt.group_by(Game.genre).order_by(Game.genre)
+    stmt = stmt.group_by(Genre.name).order_by(Genre.name)
     rows = (await db.execute(stmt)).all()
 
     result = []
@@ -216,53 +268,278 @@ async def price_gap_by_genre(
             gap_percent=gap_pct,
         ))
 
-    return result
+    return out(result)
 
-# Jumlah penjualan per tanggal (created_at)
+# Jumlah penjualan per tanggal (created_at) — dibaca dari rollup harian
 @router.get("/sales-by-date", response_model=list[SalesByDate])
 async def sales_by_date(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    granularity: str = Query("day", enum=GRANULARITIES),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    date_col = cast(Sale.created_at, Date).label("date")
+    _check_range(date_from, date_to, granularity)
+    bucket = bucket_col(SalesDaily.day, granularity).label("bucket")
 
-    stmt = (
-        select(date_col, func.count(Sale.id).label("count"))
-        .where(Sale.created_at != None)
-    )
+    stmt = select(bucket, func.sum(SalesDaily.sales_count).label("count"))
 
     if date_from:
-        stmt = stmt.where(cast(Sale.created_at, Date) >= date_from)
+        stmt = stmt.where(SalesDaily.day >= date_from)
     if date_to:
-        stmt = stmt.where(cast(Sale.created_at, Date) <= date_to)
+        stmt = stmt.where(SalesDaily.day <= date_to)
 
-    stmt = stmt.group_by(date_col).order_by(date_col)
+    stmt = stmt.group_by(bucket).order_by(bucket)
     rows = (await db.execute(stmt)).all()
 
-    return [SalesByDate(date=str(r.date), count=r.count) for r in rows]
+    series = fill_gaps({r.bucket: r.count for r in rows}, date_from, date_to, granularity, empty=0)
+    return out([SalesByDate(date=str(d), count=c) for d, c in series])
 
-# Harga maksimum per tanggal (created_at)
+# Harga maksimum per tanggal (created_at) — dibaca dari rollup harian
 @router.get("/max-price-by-date", response_model=list[MaxPriceByDate])
 async def max_price_by_date(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: AsyncSession = Depends(get_db),
+    granularity: str = Query("day", enum=GRANULARITIES),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    date_col = cast(Sale.created_at, Date).label("date")
+    _check_range(date_from, date_to, granularity)
+    bucket = bucket_col(SalesDaily.day, granularity).label("bucket")
 
     stmt = (
-        select(date_col, func.max(Sale.our_price).label("max_price"))
-        .where(Sale.created_at != None)
-        .where(Sale.our_price != None)
+        select(bucket, func.max(SalesDaily.max_our_price).label("max_price"))
+        .where(SalesDaily.max_our_price != None)
     )
 
     if date_from:
-        stmt = stmt.where(cast(Sale.created_at, Date) >= date_from)
+        stmt = stmt.where(SalesDaily.day >= date_from)
     if date_to:
-        stmt = stmt.where(cast(Sale.created_at, Date) <= date_to)
+        stmt = stmt.where(SalesDaily.day <= date_to)
 
-    stmt = stmt.group_by(date_col).order_by(date_col)
+    stmt = stmt.group_by(bucket).order_by(bucket)
     rows = (await db.execute(stmt)).all()
 
-    return [MaxPriceByDate(date=str(r.date), max_price=round(r.max_price, 2)) for r in rows]
\ No newline at end of file
+    series = fill_gaps({r.bucket: round(r.max_price, 2) for r in rows}, date_from, date_to, granularity)
+    return out([MaxPriceByDate(date=str(d), max_price=p) for d, p in series])
+
+# =============================================================================
+# PLATFORM — agregasi per elemen games.platforms (JSONB), dihitung di database
+# =============================================================================
+
+# Jumlah game & sales serta harga per platform (game multi-platform dihitung di setiap platform)
+@router.get("/platform-summary", response_model=list[PlatformSummary])
+async def platform_summary(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    genre: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    plat = platform_values(Game.platforms)
+
+    # sales_game_id_unique → maksimal satu sale per game, outer join tidak menggandakan game
+    stmt = (
+        select(
+            plat.c.value.label("platform"),
+            func.count(Game.id).label("game_count"),
+            func.count(Sale.id).label("sales_count"),
+            func.min(Game.price_cheap).label("min_price"),
+            func.max(Game.price_cheap).label("max_price"),
+            func.avg(Game.price_cheap).label("avg_price"),
+            func.avg(Sale.our_price).label("avg_our_price"),
+        )
+        .select_from(Game)
+        .join(plat, true())
+        .outerjoin(Sale, Sale.game_id == Game.id)
+    )
+
+    if date_from:
+        stmt = stmt.where(cast(Game.updated_at, Date) >= date_from)
+    if date_to:
+        stmt = stmt.where(cast(Game.updated_at, Date) <= date_to)
+    if genre:
+        stmt = stmt.where(has_genre(Game.id, genre))
+
+    stmt = stmt.group_by(plat.c.value).order_by(func.count(Game.id).desc(), plat.c.value)
+    rows = (await db.execute(stmt)).all()
+
+    return out([
+        PlatformSummary(
+            platform=r.platform,
+            game_count=r.game_count,
+            sales_count=r.sales_count,
+            min_price=_round_or_none(r.min_price),
+            max_price=_round_or_none(r.max_price),
+            avg_price=_round_or_none(r.avg_price),
+            avg_our_price=_round_or_none(r.avg_our_price),
+        )
+        for r in rows
+    ])
+
+# =============================================================================
+# DISTRIBUSI HARGA — percentile & histogram, dihitung di database
+# =============================================================================
+
+PERCENTILES = (0.5, 0.9, 0.99)
+HISTOGRAM_FIELDS = ["price_cheap", "our_price"]
+
+
+def _game_source(sample_percent: Optional[float]):
+    """Game biasa, atau TABLESAMPLE SYSTEM untuk mode approximate di tabel besar."""
+    if sample_percent is None:
+        return Game
+    return aliased(Game, tablesample(Game, func.system(sample_percent), name="games_sample"))
+
+
+def _percentiles(col):
+    return [func.percentile_cont(p).within_group(col) for p in PERCENTILES]
+
+
+def _round_or_none(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+# Median, p90, p99 price_cheap & our_price per genre
+@router.get("/price-percentiles-by-genre", response_model=list[PricePercentilesByGenre])
+async def price_percentiles_by_genre(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    platform: Optional[str] = None,
+    sample_percent: Optional[float] = Query(None, gt=0, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    g = _game_source(sample_percent)
+
+    stmt = join_genres(
+        select(
+            Genre.name.label("genre"),
+            func.count(g.id).label("game_count"),
+            func.count(Sale.id).label("sales_count"),
+            *_percentiles(g.price_cheap),
+            *_percentiles(Sale.our_price),
+        )
+        .select_from(g)
+        .outerjoin(Sale, Sale.game_id == g.id),
+        g.id,
+    )
+
+    if date_from:
+        stmt = stmt.where(cast(g.updated_at, Date) >= date_from)
+    if date_to:
+        stmt = stmt.where(cast(g.updated_at, Date) <= date_to)
+    if platform:
+        stmt = stmt.where(has_platform(g.platforms, platform))
+
+    stmt = stmt.group_by(Genre.name).order_by(Genre.name)
+    rows = (await db.execute(stmt)).all()
+
+    return out([
+        PricePercentilesByGenre(
+            genre=r[0],
+            game_count=r[1],
+            sales_count=r[2],
+            price_cheap_p50=_round_or_none(r[3]),
+            price_cheap_p90=_round_or_none(r[4]),
+            price_cheap_p99=_round_or_none(r[5]),
+            our_price_p50=_round_or_none(r[6]),
+            our_price_p90=_round_or_none(r[7]),
+            our_price_p99=_round_or_none(r[8]),
+            sampled=sample_percent is not None,
+        )
+        for r in rows
+    ])
+
+# Histogram harga per genre dengan bucket lebar tetap (width_bucket)
+@router.get("/price-histogram-by-genre", response_model=list[PriceHistogramByGenre])
+async def price_histogram_by_genre(
+    field: str = Query("price_cheap", enum=HISTOGRAM_FIELDS),
+    buckets: int = Query(10, ge=1, le=100),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, gt=0),
+    genre: Optional[str] = None,
+    platform: Optional[str] = None,
+    sample_percent: Optional[float] = Query(None, gt=0, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    g = _game_source(sample_percent)
+
+    if field == "our_price":
+        price_col = Sale.our_price
+        base = select().select_from(g).join(Sale, Sale.game_id == g.id)
+    else:
+        price_col = g.price_cheap
+        base = select().select_from(g)
+
+    base = base.where(price_col != None)
+    if genre:
+        base = base.where(has_genre(g.id, genre))
+    if platform:
+        base = base.where(has_platform(g.platforms, platform))
+
+    # Batas histogram: dari parameter, atau min/max di DB (satu agregat ringan)
+    if min_price is None or max_price is None:
+        lo, hi = (await db.execute(
+            base.add_columns(func.min(price_col), func.max(price_col))
+        )).one()
+        if lo is None:
+            return out([])
+        min_price = lo if min_price is None else min_price
+        max_price = hi if max_price is None else max_price
+    if max_price <= min_price:
+        max_price = min_price + 1
+
+    # width_bucket mengembalikan buckets+1 untuk nilai == max → digabung ke bucket terakhir
+    bucket = func.least(
+        func.greatest(func.width_bucket(price_col, min_price, max_price, buckets), 1),
+        buckets,
+    ).label("bucket")
+
+    stmt = (
+        join_genres(base.add_columns(Genre.name.label("genre"), bucket, func.count().label("count")), g.id)
+        .where(price_col >= min_price)
+        .where(price_col <= max_price)
+        .group_by(Genre.name, bucket)
+        .order_by(Genre.name, bucket)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    width = (max_price - min_price) / buckets
+    counts: dict[str, dict[int, int]] = {}
+    for r in rows:
+        counts.setdefault(r.genre, {})[r.bucket] = r.count
+
+    return out([
+        PriceHistogramByGenre(
+            genre=genre_name,
+            field=field,
+            total=sum(per_bucket.values()),
+            buckets=[
+                HistogramBucket(
+                    bucket=i,
+                    lower=round(min_price + (i - 1) * width, 2),
+                    upper=round(min_price + i * width, 2),
+                    count=per_bucket.get(i, 0),
+                )
+                for i in range(1, buckets + 1)
+            ],
+            sampled=sample_percent is not None,
+        )
+        for genre_name, per_bucket in counts.items()
+    ])
+
+
+# Tren harga global per genre dari riwayat harga, di-downsample menjadi maksimal `points` titik
+@router.get("/price-history-by-genre", response_model=PriceSeries)
+async def price_history_by_genre(
+    genre: str,
+    points: int = Query(100, ge=1, le=1000),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    series = await get_series(db, points, date_from, date_to, genre=genre)
+    return out(PriceSeries(genre=genre, points=series))
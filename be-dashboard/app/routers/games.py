@@ -1,60 +1,141 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import Optional
-from app.db.database import get_db
-from app.models.sync_log import SyncLog
+from datetime import date
+from app.db.database import get_db, get_read_db, read_sessionmaker
+from app.core.conditional import conditional_get
+from app.db.query_debug import query_budget
+from app.core.responses import Responder, responder
+from app.services.data_version_service import GAMES
+from app.services import sync_history_service
 from app.schemas.game import GameCreate, GameUpdate, GameInDB, PaginatedGame
 from app.schemas.sync_log import SyncLogInDB
-from app.services.sync_service import sync_games
+from app.schemas.price_history import PriceSeries
 from app.crud.games import (
     get_all,
+    get_all_keyset,
+    count_all,
     get_by_id,
-    get_by_slug,
+    get_cached,
+    existing_ids,
+    find_conflict,
     create,
     update,
     delete,
 )
+from app.crud.games import export_query
+from app.crud.price_history import get_series
+from app.crud.pagination import PAGINATION_MODES
+from app.services.count_service import COUNT_STRATEGIES
+from app.crud.search import SEARCH_MODES, resolve_search_mode
+from app.crud.fields import parse_fields
+from app.services.export_service import EXPORT_FORMATS, export_response
 
 router = APIRouter()
 
+FIELDS_HELP = "Field GameInDB dipisah koma, mis. id,name,price_cheap — hanya kolom ini yang di-select & dikirim"
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    try:
+        return parse_fields(fields, GameInDB.model_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 ############################################################
 # READ
 ############################################################
 
 # Read: list dengan pagination, filter, dan sorting
-@router.get("", response_model=PaginatedGame)
+@router.get("", response_model=PaginatedGame, dependencies=[Depends(conditional_get(GAMES)), Depends(query_budget(4))])
 async def list_games(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     genre: Optional[str] = None,
+    platform: Optional[str] = None,    # nama platform exact, mis. "PC"
     sort_by: str = Query("updated_at", enum=["name", "released", "rating", "updated_at"]),
     sort_dir: str = Query("desc", enum=["asc", "desc"]),
-    db: AsyncSession = Depends(get_db),
+    pagination: str = Query("page", enum=PAGINATION_MODES),
+    cursor: Optional[str] = None,       # next_cursor dari response sebelumnya (pagination=cursor)
+    count_strategy: str = Query("exact", enum=COUNT_STRATEGIES),
+    search_mode: str = Query("contains", enum=SEARCH_MODES),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    selected = _parse_fields(fields)
+    mode = await resolve_search_mode(db, search, search_mode)
+
+    next_cursor = None
+    if pagination == "cursor":
+        try:
+            games, next_cursor = await get_all_keyset(
+                db, cursor, page_size, search, genre, sort_by, sort_dir, mode, platform, selected
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        games = await get_all(db, page, page_size, search, genre, sort_by, sort_dir, mode, platform, selected)
+
+    total, used_strategy = await count_all(db, search, genre, count_strategy, mode, platform)
+
+    # data sudah berupa dict dari select kolom (parsial jika ?fields=) → langsung di-encode
+    return out({
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "data": games,
+        "next_cursor": next_cursor,
+        "count_strategy": used_strategy,
+    })
+
+# Read: export seluruh game (opsional difilter) secara streaming — csv / ndjson / parquet
+@router.get("/export")
+async def export_games(
+    request: Request,
+    format: str = Query("csv", enum=EXPORT_FORMATS),
+    search: Optional[str] = None,
+    genre: Optional[str] = None,
+    platform: Optional[str] = None,
 ):
-    total, games = await get_all(db, page, page_size, search, genre, sort_by, sort_dir)
-    return PaginatedGame(total=total, page=page, page_size=page_size, data=games)
-
-# Read: Endpoint untuk mendapatkan log sinkronisasi terakhir
-@router.get("/last-sync", response_model=Optional[SyncLogInDB])
-async def get_last_sync(db: AsyncSession = Depends(get_db)):
-    stmt = (
-        select(SyncLog)
-        .where(SyncLog.source == "rawg+cheapshark")  # fix: sesuai source di sync_service
-        .order_by(SyncLog.synced_at.desc())
-        .limit(1)
-    )
-    log = (await db.execute(stmt)).scalar_one_or_none()
-    return log
+    return export_response(export_query(search, genre, platform), format, "games", read_sessionmaker(request))
+
+# Read: log sinkronisasi terakhir — alias lama dari /sync/last
+@router.get("/last-sync", response_model=Optional[SyncLogInDB], deprecated=True)
+async def get_last_sync(db: AsyncSession = Depends(get_read_db)):
+    """Deprecated: pakai GET /sync/last."""
+    return await sync_history_service.get_last(db)
 
 # Read: detail game by ID
-@router.get("/{game_id}", response_model=GameInDB)
-async def get_game(game_id: int, db: AsyncSession = Depends(get_db)):
-    game = await get_by_id(db, game_id)
+@router.get("/{game_id}", response_model=GameInDB, dependencies=[Depends(query_budget(1))])
+async def get_game(
+    game_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: AsyncSession = Depends(get_db),    # primary: miss cache tidak boleh terisi data replica yang tertinggal
+    out: Responder = Depends(responder),
+):
+    selected = _parse_fields(fields)
+    game = await get_cached(db, game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
-    return game
+    # Detail penuh di-cache; fields= cukup memotong dict, tanpa query tambahan
+    return out(game if selected is None else {f: game[f] for f in selected})
+
+# Read: riwayat harga game, di-downsample menjadi maksimal `points` titik
+@router.get("/{game_id}/price-history", response_model=PriceSeries, dependencies=[Depends(query_budget(3))])
+async def get_game_price_history(
+    game_id: int,
+    points: int = Query(100, ge=1, le=1000),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    if not await existing_ids(db, [game_id]):
+        raise HTTPException(status_code=404, detail="Game not found")
+    series = await get_series(db, points, date_from, date_to, game_id=game_id)
+    return out(PriceSeries(game_id=game_id, points=series))
 
 
 ############################################################
@@ -64,9 +145,10 @@ async def get_game(game_id: int, db: AsyncSession = Depends(get_db)):
 # Create: buat game baru
 @router.post("", response_model=GameInDB, status_code=201)
 async def create_game(payload: GameCreate, db: AsyncSession = Depends(get_db)):
-    if await get_by_id(db, payload.id):
+    conflict = await find_conflict(db, payload.id, payload.slug)
+    if conflict == "id":
         raise HTTPException(status_code=409, detail=f"Game with ID {payload.id} already exists")
-    if await get_by_slug(db, payload.slug):
+    if conflict == "slug":
         raise HTTPException(status_code=409, detail=f"Game with slug '{payload.slug}' already exists")
     return await create(db, payload)
 
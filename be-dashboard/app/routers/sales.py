@@ -1,56 +1,127 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.db.database import get_db
-from app.schemas.sale import SaleCreate, SaleUpdate, SaleInDB, PaginatedSales
+from app.db.database import get_db, get_read_db, read_sessionmaker
+from app.core.conditional import conditional_get
+from app.db.query_debug import query_budget
+from app.core.responses import Responder, responder
+from app.services.data_version_service import GAMES, SALES
+from app.schemas.sale import SaleCreate, SaleUpdate, SaleInDB, PaginatedSales, SaleBulkResult
 from app.crud.sales import (
     get_all,
+    get_all_keyset,
+    count_all,
     get_by_id,
+    get_detail,
     create,
     update,
     delete,
 )
-from app.crud.games import get_by_id as get_game_by_id
+from app.crud.sales import export_query
+from app.crud.pagination import PAGINATION_MODES
+from app.services.count_service import COUNT_STRATEGIES
+from app.crud.search import SEARCH_MODES, resolve_search_mode
+from app.crud.fields import parse_fields
+from app.crud.games import get_cached as get_cached_game
+from app.services.export_service import EXPORT_FORMATS, export_response
+from app.services.sale_bulk_service import parse_items, apply_bulk
 
 router = APIRouter()
 
+FIELDS_HELP = "Field SaleInDB dipisah koma, mis. id,game_name,our_price — hanya kolom ini yang di-select & dikirim"
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    try:
+        return parse_fields(fields, SaleInDB.model_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Body bulk dibaca manual (JSON array atau NDJSON) agar item invalid dilaporkan per item, bukan 422 untuk semuanya
+BULK_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/SaleCreate"}}},
+            "application/x-ndjson": {"schema": {"type": "string", "description": "Satu SaleCreate (JSON) per baris"}},
+        },
+    }
+}
+
 
 ############################################################
 # READ
 ############################################################
 
 # Read: list dengan pagination, filter, dan sorting
-@router.get("", response_model=PaginatedSales)
+@router.get("", response_model=PaginatedSales, dependencies=[Depends(conditional_get(GAMES, SALES)), Depends(query_budget(4))])
 async def list_sales(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,       # search by nama game
     genre: Optional[str] = None,        # filter by genre
+    platform: Optional[str] = None,     # filter by platform (exact, mis. "PC")
     sort_by: str = Query("updated_at", enum=["our_price", "updated_at", "created_at", "game_name", "genre"]),
     sort_dir: str = Query("desc", enum=["asc", "desc"]),
-    db: AsyncSession = Depends(get_db),
+    pagination: str = Query("page", enum=PAGINATION_MODES),
+    cursor: Optional[str] = None,       # next_cursor dari response sebelumnya (pagination=cursor)
+    count_strategy: str = Query("exact", enum=COUNT_STRATEGIES),
+    search_mode: str = Query("contains", enum=SEARCH_MODES),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
 ):
-    total, sales = await get_all(db, page, page_size, search, genre, sort_by, sort_dir)
-    return PaginatedSales(total=total, page=page, page_size=page_size, data=sales)
+    selected = _parse_fields(fields)
+    mode = await resolve_search_mode(db, search, search_mode)
+
+    next_cursor = None
+    if pagination == "cursor":
+        try:
+            sales, next_cursor = await get_all_keyset(
+                db, cursor, page_size, search, genre, sort_by, sort_dir, mode, platform, selected
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        sales = await get_all(db, page, page_size, search, genre, sort_by, sort_dir, mode, platform, selected)
+
+    total, used_strategy = await count_all(db, search, genre, count_strategy, mode, platform)
+
+    # data sudah berupa dict dari select kolom (parsial jika ?fields=) → langsung di-encode
+    return out({
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "data": sales,
+        "next_cursor": next_cursor,
+        "count_strategy": used_strategy,
+    })
+
+
+# Read: export seluruh sales (opsional difilter) secara streaming — csv / ndjson / parquet
+@router.get("/export")
+async def export_sales(
+    request: Request,
+    format: str = Query("csv", enum=EXPORT_FORMATS),
+    search: Optional[str] = None,       # search by nama game
+    genre: Optional[str] = None,        # filter by genre
+    platform: Optional[str] = None,     # filter by platform
+):
+    return export_response(export_query(search, genre, platform), format, "sales", read_sessionmaker(request))
 
 
 # Read: detail sale by ID
-@router.get("/{sale_id}", response_model=SaleInDB)
-async def get_sale(sale_id: int, db: AsyncSession = Depends(get_db)):
-    sale = await get_by_id(db, sale_id)
+@router.get("/{sale_id}", response_model=SaleInDB, dependencies=[Depends(query_budget(1))])
+async def get_sale(
+    sale_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: AsyncSession = Depends(get_read_db),
+    out: Responder = Depends(responder),
+):
+    sale = await get_detail(db, sale_id, _parse_fields(fields))
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
-    return SaleInDB(
-        id=sale.id,
-        game_id=sale.game_id,
-        our_price=sale.our_price,
-        created_at=sale.created_at,
-        updated_at=sale.updated_at,
-        game_name=sale.game.name if sale.game else None,
-        game_genre=sale.game.genre if sale.game else None,
-        price_cheap=sale.game.price_cheap if sale.game else None,
-        price_external=sale.game.price_external if sale.game else None,
-    )
+    return out(sale)
 
 
 ############################################################
@@ -58,56 +129,73 @@ async def get_sale(sale_id: int, db: AsyncSession = Depends(get_db)):
 ############################################################
 
 # Create: buat sale baru
-@router.post("", response_model=SaleInDB, status_code=201)
+@router.post("", response_model=SaleInDB, status_code=201, dependencies=[Depends(query_budget(6))])
 async def create_sale(payload: SaleCreate, db: AsyncSession = Depends(get_db)):
-    # Validasi game_id — harus ada di tabel games
-    game = await get_game_by_id(db, payload.game_id)
+    # Validasi game_id lewat cache; entry basi (game baru dihapus) ditangkap FK → 404 di bawah
+    game = await get_cached_game(db, payload.game_id)
     if not game:
         raise HTTPException(status_code=404, detail=f"Game with id {payload.game_id} not found")
 
     sale = await create(db, payload)
+    if sale is None:
+        raise HTTPException(status_code=404, detail=f"Game with id {payload.game_id} not found")
     return SaleInDB(
         id=sale.id,
         game_id=sale.game_id,
         our_price=sale.our_price,
         created_at=sale.created_at,
         updated_at=sale.updated_at,
-        game_name=game.name,
-        game_genre=game.genre,
-        price_cheap=game.price_cheap,
-        price_external=game.price_external,
+        game_name=game["name"],
+        game_genre=game["genre"],
+        price_cheap=game["price_cheap"],
+        price_external=game["price_external"],
     )
 
 
+# Create: banyak sale sekaligus (JSON array / NDJSON) — insert, atau upsert by game_id
+@router.post("/bulk", response_model=SaleBulkResult, openapi_extra=BULK_BODY)
+async def bulk_create_sales(
+    request: Request,
+    mode: str = Query("upsert", enum=["insert", "upsert"]),   # insert: game yang sudah punya sale → error per item
+    db: AsyncSession = Depends(get_db),
+    out: Responder = Depends(responder),
+):
+    items = parse_items(await request.body(), request.headers.get("content-type", ""))
+    return out(await apply_bulk(db, items, mode))
+
+
 ############################################################
 # UPDATE
 ############################################################
 
+# Update: banyak sale sekaligus by game_id (repricing) — hanya game yang sudah punya sale
+@router.patch("/bulk", response_model=SaleBulkResult, openapi_extra=BULK_BODY)
+async def bulk_update_sales(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    out: Responder = Depends(responder),
+):
+    items = parse_items(await request.body(), request.headers.get("content-type", ""))
+    return out(await apply_bulk(db, items, "update"))
+
+
 # Update: update sale by ID
-@router.patch("/{sale_id}", response_model=SaleInDB)
+@router.patch("/{sale_id}", response_model=SaleInDB, dependencies=[Depends(query_budget(7))])
 async def update_sale(sale_id: int, payload: SaleUpdate, db: AsyncSession = Depends(get_db)):
     sale = await get_by_id(db, sale_id)
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
 
-    # Jika game_id diubah, validasi game baru
+    # Jika game_id diubah, validasi game baru (cache; FK tetap jadi penjaga terakhir)
     if payload.game_id is not None:
-        game = await get_game_by_id(db, payload.game_id)
+        game = await get_cached_game(db, payload.game_id)
         if not game:
             raise HTTPException(status_code=404, detail=f"Game with id {payload.game_id} not found")
 
-    sale = await update(db, sale, payload)
-    return SaleInDB(
-        id=sale.id,
-        game_id=sale.game_id,
-        our_price=sale.our_price,
-        created_at=sale.created_at,
-        updated_at=sale.updated_at,
-        game_name=sale.game.name if sale.game else None,
-        game_genre=sale.game.genre if sale.game else None,
-        price_cheap=sale.game.price_cheap if sale.game else None,
-        price_external=sale.game.price_external if sale.game else None,
-    )
+    updated = await update(db, sale, payload)
+    if updated is None:
+        raise HTTPException(status_code=404, detail=f"Game with id {payload.game_id} not found")
+    return updated
 
 
 ############################################################
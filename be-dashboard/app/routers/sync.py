@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from celery.result import AsyncResult
 from typing import Optional
+from datetime import date, datetime
 
-from app.db.database import get_db
-from app.celery_app import celery
-from app.models.sync_log import SyncLog
-from app.schemas.sync_log import SyncLogInDB
+from app.db.database import get_read_db
+from app.schemas.sync_log import SyncLogInDB, SyncHistory
+from app.services.rollup_service import GRANULARITIES, check_bucket_range
+from app.services import sync_history_service
 
 router = APIRouter()
 
@@ -41,6 +40,10 @@ async def get_task_status(task_id: str):
     - SUCCESS   : selesai
     - FAILURE   : gagal
     """
+    # Celery di-import saat dipakai saja — tidak ikut memperlambat startup API
+    from celery.result import AsyncResult
+    from app.celery_app import celery
+
     result = AsyncResult(task_id, app=celery)
 
     # Task belum diproses / tidak ditemukan
@@ -94,13 +97,42 @@ async def get_task_status(task_id: str):
 
 # Get last sync log dari DB
 @router.get("/last", response_model=Optional[SyncLogInDB])
-async def get_last_sync(db: AsyncSession = Depends(get_db)):
-    """Tampilkan log sync terakhir yang berhasil."""
-    stmt = (
-        select(SyncLog)
-        .where(SyncLog.source == "rawg+cheapshark")
-        .order_by(SyncLog.synced_at.desc())
-        .limit(1)
-    )
-    log = (await db.execute(stmt)).scalar_one_or_none()
-    return log
\ No newline at end of file
+async def get_last_sync(
+    source: str = Query(sync_history_service.SYNC_SOURCE),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Tampilkan log sync terakhir (berhasil atau gagal)."""
+    return await sync_history_service.get_last(db, source)
+
+
+# Daftar run terbaru (per baris, sebelum dipadatkan)
+@router.get("/logs", response_model=list[SyncLogInDB])
+async def get_sync_logs(
+    source: str = Query(sync_history_service.SYNC_SOURCE),
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[datetime] = Query(None, description="synced_at baris terakhir halaman sebelumnya"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await sync_history_service.get_recent(db, source, limit, before)
+
+
+# Riwayat sync per bucket: runs, success rate, games/menit, skip rate
+@router.get("/history", response_model=SyncHistory)
+async def get_sync_history(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    granularity: str = Query("day", enum=GRANULARITIES),
+    source: str = Query(sync_history_service.SYNC_SOURCE),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Gabungan sync_logs (run dalam masa retensi) dan sync_logs_daily (hasil compaction),
+    jadi tren tetap tersedia setelah baris lama dipadatkan.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+    try:
+        check_bucket_range(date_from, date_to, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await sync_history_service.get_history(db, source, date_from, date_to, granularity)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import engine, read_engine, get_db
+from app.db.pool_metrics import pool_stats, request_hold
+from app.services.game_cache import cache_stats
+from app.services.partition_service import sales_partitions
+
+router = APIRouter()
+
+
+# Statistik cache detail game (hit/miss per tier) untuk proses ini
+@router.get("/cache")
+async def get_cache_stats():
+    return {"game": cache_stats()}
+
+
+# Status pool koneksi DB + waktu tunggu checkout dan hold time koneksi
+@router.get("/pool")
+async def get_pool_stats():
+    return {
+        "primary": pool_stats(engine),
+        "read": pool_stats(read_engine) if read_engine is not None else None,
+        "request_hold": request_hold.snapshot(),
+    }
+
+
+# Partisi bulanan tabel sales + estimasi jumlah baris per partisi
+@router.get("/partitions")
+async def get_partitions(db: AsyncSession = Depends(get_db)):
+    return {"sales": await sales_partitions(db)}
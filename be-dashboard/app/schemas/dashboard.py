@@ -24,8 +24,8 @@ class PriceGapByGenre(BaseModel):
     gap_percent: Optional[float] = None
 
 class GamesByDate(BaseModel):
-    """COUNT game GROUP BY updated_at."""
-    date: str   # "YYYY-MM-DD"
+    """COUNT game GROUP BY updated_at (bucket day/week/month)."""
+    date: str   # "YYYY-MM-DD" — awal bucket
     count: int
 
 class AvgRatingByGenre(BaseModel):
@@ -35,11 +35,48 @@ class AvgRatingByGenre(BaseModel):
     game_count: int
 
 class SalesByDate(BaseModel):
-    """COUNT sales GROUP BY created_at."""
-    date: str   # "YYYY-MM-DD"
+    """COUNT sales GROUP BY created_at (bucket day/week/month)."""
+    date: str   # "YYYY-MM-DD" — awal bucket
     count: int
 
 class MaxPriceByDate(BaseModel):
-    """MAX our_price GROUP BY created_at."""
-    date: str   # "YYYY-MM-DD"
-    max_price: float
\ No newline at end of file
+    """MAX our_price GROUP BY created_at (bucket day/week/month)."""
+    date: str   # "YYYY-MM-DD" — awal bucket
+    max_price: Optional[float] = None   # None untuk bucket tanpa sales
+
+class PricePercentilesByGenre(BaseModel):
+    """percentile_cont price_cheap & our_price GROUP BY genre."""
+    genre: str
+    game_count: int
+    sales_count: int
+    price_cheap_p50: Optional[float] = None
+    price_cheap_p90: Optional[float] = None
+    price_cheap_p99: Optional[float] = None
+    our_price_p50: Optional[float] = None
+    our_price_p90: Optional[float] = None
+    our_price_p99: Optional[float] = None
+    sampled: bool = False   # True jika dihitung dari TABLESAMPLE (approximate)
+
+class HistogramBucket(BaseModel):
+    bucket: int             # 1..buckets (hasil width_bucket)
+    lower: float
+    upper: float
+    count: int
+
+class PriceHistogramByGenre(BaseModel):
+    """width_bucket harga GROUP BY genre, bucket."""
+    genre: str
+    field: str              # "price_cheap" | "our_price"
+    total: int
+    buckets: list[HistogramBucket]
+    sampled: bool = False
+
+class PlatformSummary(BaseModel):
+    """COUNT & harga game/sales GROUP BY platform (elemen games.platforms)."""
+    platform: str
+    game_count: int
+    sales_count: int
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    avg_price: Optional[float] = None       # rata-rata price_cheap
+    avg_our_price: Optional[float] = None
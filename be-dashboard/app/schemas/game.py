@@ -11,22 +11,24 @@ class GameBase(BaseModel):
     ratings_count: Optional[int] = None
     metacritic: Optional[int] = None
     background_image: Optional[str] = None
-    platforms: Optional[str] = None
+    platforms: Optional[list[str]] = None
     price_cheap: Optional[float] = None
     price_external: Optional[float] = None
 
 class GameCreate(GameBase):
     id: int
+    genres: Optional[list[str]] = None     # semua genre; default [genre]
 
 class GameUpdate(BaseModel):
     name: Optional[str] = None
     released: Optional[datetime] = None
     genre: Optional[str] = None
+    genres: Optional[list[str]] = None     # mengganti seluruh genre game
     rating: Optional[float] = None
     ratings_count: Optional[int] = None
     metacritic: Optional[int] = None
     background_image: Optional[str] = None
-    platforms: Optional[str] = None
+    platforms: Optional[list[str]] = None
 
 class GameInDB(GameBase):
     id: int
@@ -40,4 +42,6 @@ class PaginatedGame(BaseModel):
     total: int
     page: int
     page_size: int
-    data: list[GameInDB]
\ No newline at end of file
+    data: list[GameInDB]
+    next_cursor: Optional[str] = None   # hanya diisi pada pagination=cursor
+    count_strategy: str = "exact"       # exact | estimated | cached — cara total dihitung
\ No newline at end of file
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class PricePoint(BaseModel):
+    """Satu bucket hasil downsampling riwayat harga."""
+    recorded_at: datetime       # waktu perubahan harga pertama di bucket
+    avg_price: float
+    min_price: float
+    max_price: float
+    changes: int                # jumlah perubahan harga yang jatuh di bucket
+
+class PriceSeries(BaseModel):
+    game_id: Optional[int] = None
+    genre: Optional[str] = None
+    points: list[PricePoint]
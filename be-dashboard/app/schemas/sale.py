@@ -30,4 +30,20 @@ class PaginatedSales(BaseModel):
     total: int
     page: int
     page_size: int
-    data: list[SaleInDB]
\ No newline at end of file
+    data: list[SaleInDB]
+    next_cursor: Optional[str] = None   # hanya diisi pada pagination=cursor
+    count_strategy: str = "exact"       # exact | estimated | cached — cara total dihitung
+
+class SaleBulkItemResult(BaseModel):
+    index: int                          # posisi item di request (0-based)
+    status: str                         # created | updated | error
+    game_id: Optional[int] = None
+    id: Optional[int] = None
+    our_price: Optional[float] = None
+    detail: Optional[str] = None        # alasan jika status == error
+
+class SaleBulkResult(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: list[SaleBulkItemResult]
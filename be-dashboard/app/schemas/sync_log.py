@@ -8,6 +8,7 @@ class SyncLogBase(BaseModel):
     records_inserted: int = 0
     records_updated: int = 0
     records_skipped: int = 0
+    duration_seconds: Optional[float] = None
     status: str = "success"
     message: Optional[str] = None
 
@@ -27,4 +28,25 @@ class SyncLogInDB(SyncLogBase):
     synced_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SyncStats(BaseModel):
+    """Agregat run sync dalam satu bucket (atau seluruh rentang)."""
+    runs: int
+    success_runs: int
+    success_rate: Optional[float] = None        # success_runs / runs
+    records_fetched: int
+    records_inserted: int
+    records_updated: int
+    records_skipped: int
+    skip_rate: Optional[float] = None           # records_skipped / records_fetched
+    games_per_minute: Optional[float] = None    # hanya dari run yang durasinya tercatat
+
+class SyncHistoryBucket(SyncStats):
+    date: str   # "YYYY-MM-DD" — awal bucket
+
+class SyncHistory(BaseModel):
+    source: str
+    granularity: str
+    totals: SyncStats
+    series: list[SyncHistoryBucket]
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Optional
+
+import httpx
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import query_metrics
+from app.models.game import Game
+from app.models.genre import GameGenre
+from app.seeders.generate_data import DEFAULT_ID_BASE
+from app.services.data_version_service import bump_versions_sync, GAMES
+from app.services.genre_service import link_genres_sync
+
+# Backfill genre untuk game yang sudah ada sebelum tabel game_genres dibuat.
+#
+# Migrasi 70c4af874820 hanya menautkan games.genre (genre utama). Genre tambahan
+# terisi saat game tersebut di-sync ulang; game yang tidak muncul lagi di halaman
+# RAWG yang di-sync perlu command ini:
+#
+#     python -m app.seeders.backfill_genres --batch-size 40
+#
+# - Hanya game dengan <= 1 genre tertaut (hasil migrasi); game sintetis dilewati
+# - Detail RAWG diambil per game (GET /games/{id}), commit per batch → aman dihentikan
+# - Game yang genre RAWG-nya kosong / gagal di-fetch tidak diubah
+
+RAWG_REQUEST_DELAY = 0.25
+
+
+async def _fetch_genres(client: httpx.AsyncClient, game_id: int) -> Optional[list[str]]:
+    """Semua genre RAWG untuk satu game; None jika gagal di-fetch."""
+    try:
+        resp = await client.get(f"{settings.RAWG_BASE}/games/{game_id}", params={"key": settings.RAWG_API_KEY})
+        resp.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"[Backfill] Gagal fetch game {game_id}: {e}")
+        return None
+    return [g["name"] for g in resp.json().get("genres", []) if g.get("name")]
+
+
+async def _fetch_batch(game_ids: list[int]) -> dict[int, list[str]]:
+    game_genres = {}
+    async with httpx.AsyncClient(timeout=30) as client:
+        for game_id in game_ids:
+            genres = await _fetch_genres(client, game_id)
+            if genres:
+                game_genres[game_id] = genres
+            await asyncio.sleep(RAWG_REQUEST_DELAY)
+    return game_genres
+
+
+def backfill_genres(batch_size: int = 40, max_games: int = None) -> None:
+    """
+    Tautkan semua genre RAWG ke game yang baru punya genre utama.
+
+    Args:
+        batch_size: jumlah game per batch (satu commit per batch)
+        max_games: batas jumlah game yang diproses (None = semua)
+    """
+    sync_url = settings.DATABASE_URL.replace(
+        "postgresql+asyncpg://", "postgresql+psycopg2://"
+    )
+    engine = create_engine(sync_url)
+    query_metrics.instrument(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    with SessionLocal() as db:
+        linked = (
+            select(func.count())
+            .where(GameGenre.game_id == Game.id)
+            .correlate(Game)
+            .scalar_subquery()
+        )
+        stmt = select(Game.id).where(Game.id < DEFAULT_ID_BASE, linked <= 1).order_by(Game.id)
+        if max_games:
+            stmt = stmt.limit(max_games)
+        game_ids = list(db.execute(stmt).scalars().all())
+
+    if not game_ids:
+        print("✅ Tidak ada game yang perlu di-backfill.")
+        return
+
+    print(f"🎮 Ditemukan {len(game_ids)} game, mulai backfill genre...\n")
+
+    updated = 0
+    for start in range(0, len(game_ids), batch_size):
+        batch = game_ids[start:start + batch_size]
+        game_genres = asyncio.run(_fetch_batch(batch))
+        with SessionLocal() as db:
+            link_genres_sync(db, game_genres)
+            bump_versions_sync(db, GAMES)
+            db.commit()
+        updated += len(game_genres)
+        print(f"[Backfill] {start + len(batch)}/{len(game_ids)} game diproses")
+
+    print(f"{'─' * 50}")
+    print(f"✅ Backfill selesai!")
+    print(f"   Games updated : {updated}")
+    print(f"   Games skipped : {len(game_ids) - updated} (genre RAWG kosong / gagal fetch)")
+    print(f"{'─' * 50}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill genre game dari RAWG")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=40,
+        help="Jumlah game per batch / commit (default: 40)"
+    )
+    parser.add_argument(
+        "--max-games",
+        type=int,
+        default=None,
+        help="Batas jumlah game yang diproses (default: semua game)"
+    )
+    args = parser.parse_args()
+
+    backfill_genres(batch_size=args.batch_size, max_games=args.max_games)
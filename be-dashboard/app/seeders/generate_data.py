@@ -0,0 +1,236 @@
+import json
+import multiprocessing
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.seeders.seed_sales import (
+    FALLBACK_PRICE_RANGES_BY_GENRE, SALE_COLUMNS, _get_our_price, _generate_timestamps, _ts, _copy,
+)
+from app.services.rollup_service import refresh_games_days_sync, refresh_sales_days_sync
+from app.services.data_version_service import bump_versions_sync, GAMES, SALES
+from app.services.partition_service import ensure_sales_partitions_between_sync
+
+# Generator data sintetis offline (tanpa RAWG/CheapShark) untuk staging & benchmark.
+#
+# - Game sintetis memakai id mulai DEFAULT_ID_BASE → tidak bentrok dengan game hasil sync
+# - Ditulis per chunk lewat COPY (psycopg2 copy_expert), bukan INSERT per baris
+# - Random di-seed per chunk (seed, nomor chunk) → hasil sama berapapun jumlah worker;
+#   timestamp relatif terhadap satu `now` yang dipatok di awal run
+# - Harga & timestamp sales memakai distribusi seeder (_get_our_price, _generate_timestamps)
+#
+#     python -m app.seeders.generate_data --games 2000000 --workers 4 --seed 42 --reset
+
+
+# ── Konstanta ─────────────────────────────────────────────────────────────────
+
+DEFAULT_ID_BASE = 50_000_000
+FREE_GAME_EVERY = 10          # setiap game ke-10 tanpa sale → bisa dipakai untuk POST /sales
+CHUNK_SIZE = 20_000
+
+GENRES = [g for g in FALLBACK_PRICE_RANGES_BY_GENRE if g != "default"]
+PLATFORMS = ["PC", "PlayStation 5", "PlayStation 4", "Xbox Series S/X", "Xbox One", "Nintendo Switch", "macOS", "Linux"]
+ADJECTIVES = ["Dark", "Lost", "Eternal", "Crimson", "Silent", "Iron", "Hidden", "Broken", "Final", "Neon",
+              "Ancient", "Frozen", "Wild", "Shadow", "Golden", "Savage", "Cosmic", "Forgotten", "Burning", "Hollow"]
+NOUNS = ["Kingdom", "Legends", "Frontier", "Odyssey", "Protocol", "Dungeon", "Empire", "Horizon", "Chronicles",
+         "Rebellion", "Voyage", "Arena", "Citadel", "Outlaws", "Requiem", "Tactics", "Dynasty", "Echoes", "Drift", "Siege"]
+SUFFIXES = ["", "", "", " II", " III", " Remastered", " Online", " Origins", " Reloaded", " Deluxe"]
+
+# Kata kunci search dengan selektivitas berbeda (dipakai load test)
+SEARCH_TERMS = {"common": NOUNS[0], "rare": f"{ADJECTIVES[0]} {NOUNS[0]} II"}
+
+GAME_COLUMNS = ("id", "slug", "name", "released", "genre", "rating", "ratings_count", "metacritic",
+                "background_image", "platforms", "price_external", "price_cheap", "fetched_at", "updated_at")
+GENRE_LINK_COLUMNS = ("game_id", "genre_id")
+PRICE_HISTORY_COLUMNS = ("game_id", "recorded_at", "price")
+
+
+# ── Helper ────────────────────────────────────────────────────────────────────
+
+def _sync_engine() -> Engine:
+    sync_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql+psycopg2://")
+    return create_engine(sync_url)
+
+
+def _chunk_rows(start: int, stop: int, id_base: int, seed: int, now: datetime, genre_ids: dict[str, int]) -> dict[str, list]:
+    """Baris game, genre, price history & sales untuk game ke-start..stop-1."""
+    chunk_seed = seed * 1_000_003 + start
+    rng = random.Random(chunk_seed)
+    random.seed(chunk_seed)  # _get_our_price / _generate_timestamps memakai modul random global
+
+    rows = {"games": [], "game_genres": [], "price_history": [], "sales": []}
+    for n in range(start, stop):
+        game_id = id_base + n
+        genre = rng.choice(GENRES)
+        price_external = round(rng.uniform(4.99, 69.99), 2) if rng.random() < 0.85 else None
+        price_cheap = round(price_external * rng.uniform(0.3, 1.0), 2) if price_external and rng.random() < 0.8 else None
+        updated_at = now - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86400))
+
+        rows["games"].append((
+            game_id,
+            f"synthetic-{game_id}",
+            f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}{rng.choice(SUFFIXES)} {n}",
+            (now - timedelta(days=rng.randint(0, 365 * 20))).date().isoformat(),
+            genre,
+            round(rng.uniform(1, 5), 2) if rng.random() < 0.9 else None,
+            int(rng.paretovariate(1.2) * 10),
+            rng.randint(40, 99) if rng.random() < 0.4 else None,
+            f"https://media.example.com/games/{game_id}.jpg",
+            json.dumps(rng.sample(PLATFORMS, rng.randint(1, 4))),
+            price_external,
+            price_cheap,
+            _ts(updated_at),
+            _ts(updated_at),
+        ))
+
+        for linked in {genre, *rng.sample(GENRES, rng.randint(0, 2))}:
+            rows["game_genres"].append((game_id, genre_ids[linked]))
+
+        if price_cheap is not None:
+            for days_ago in sorted(rng.sample(range(1, 365), rng.randint(1, 5)), reverse=True):
+                rows["price_history"].append((game_id, _ts(now - timedelta(days=days_ago)), round(price_cheap * rng.uniform(0.8, 1.3), 2)))
+
+        if n % FREE_GAME_EVERY != 0:
+            game = SimpleNamespace(price_cheap=price_cheap, price_external=price_external, genre=genre)
+            created_at, sale_updated_at = _generate_timestamps(now)
+            rows["sales"].append((game_id, _get_our_price(game), _ts(created_at), _ts(sale_updated_at)))
+
+    return rows
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+_worker_engine: Optional[Engine] = None
+
+
+def _write_chunk(job: tuple) -> tuple[int, int]:
+    """Generate + COPY satu chunk dalam satu transaksi. Dijalankan di proses worker."""
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = _sync_engine()
+
+    start, stop, id_base, seed, now, genre_ids = job
+    rows = _chunk_rows(start, stop, id_base, seed, now, genre_ids)
+
+    conn = _worker_engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        # Data seed bisa di-generate ulang → tidak perlu menunggu flush WAL tiap commit
+        cursor.execute("SET LOCAL synchronous_commit TO off")
+        _copy(cursor, "games", GAME_COLUMNS, rows["games"])
+        _copy(cursor, "game_genres", GENRE_LINK_COLUMNS, rows["game_genres"])
+        _copy(cursor, "price_history", PRICE_HISTORY_COLUMNS, rows["price_history"])
+        _copy(cursor, "sales", SALE_COLUMNS, rows["sales"])
+        conn.commit()
+    finally:
+        conn.close()
+    return stop - start, len(rows["sales"])
+
+
+# ── Main Generator ────────────────────────────────────────────────────────────
+
+def generate(games: int, seed: int = 42, workers: int = 1, id_base: int = DEFAULT_ID_BASE, reset: bool = False) -> dict:
+    """
+    Generate `games` game sintetis beserta genre, price history dan sales.
+
+    Args:
+        games   : jumlah game yang dibuat (id id_base .. id_base + games - 1)
+        seed    : seed random — hasil identik untuk seed & `now` yang sama
+        workers : jumlah proses paralel (1 = tanpa multiprocessing)
+        reset   : hapus dulu semua data dengan game_id >= id_base
+    """
+    engine = _sync_engine()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        if reset:
+            for table in ("sales", "game_genres", "price_history", "games"):
+                column = "id" if table == "games" else "game_id"
+                conn.execute(text(f"DELETE FROM {table} WHERE {column} >= :base"), {"base": id_base})
+        else:
+            existing = conn.execute(
+                text("SELECT count(*) FROM games WHERE id >= :base AND id < :end"),
+                {"base": id_base, "end": id_base + games},
+            ).scalar()
+            if existing:
+                raise SystemExit(f"❌ Sudah ada {existing} game sintetis di rentang id ini — pakai --reset")
+
+        conn.execute(
+            text("INSERT INTO genres (name) SELECT unnest(CAST(:names AS text[])) ON CONFLICT (name) DO NOTHING"),
+            {"names": GENRES},
+        )
+        genre_ids = dict(conn.execute(text("SELECT name, id FROM genres")).all())
+
+    # Sales bertanggal mundur s/d 90 hari → partisi bulannya harus ada (bukan masuk sales_default)
+    with Session(engine) as db:
+        ensure_sales_partitions_between_sync(db, (now - timedelta(days=91)).date(), now.date())
+
+    jobs = [(start, min(start + CHUNK_SIZE, games), id_base, seed, now, genre_ids) for start in range(0, games, CHUNK_SIZE)]
+    print(f"🎮 Generate {games} game sintetis ({len(jobs)} chunk, {workers} worker, seed {seed})...\n")
+
+    done_games = done_sales = 0
+    if workers > 1:
+        # spawn: worker tidak mewarisi koneksi / pool milik proses induk
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            results = pool.imap_unordered(_write_chunk, jobs)
+            for chunk_games, chunk_sales in results:
+                done_games += chunk_games
+                done_sales += chunk_sales
+                print(f"  {done_games:>10} / {games} games")
+    else:
+        for job in jobs:
+            chunk_games, chunk_sales = _write_chunk(job)
+            done_games += chunk_games
+            done_sales += chunk_sales
+            print(f"  {done_games:>10} / {games} games")
+
+    # Rollup dibangun ulang penuh + versi data di-bump (ETag / cache dashboard invalid)
+    with engine.begin() as conn:
+        refresh_games_days_sync(conn)
+        refresh_sales_days_sync(conn)
+        bump_versions_sync(conn, GAMES, SALES)
+
+    # Statistik planner segar setelah bulk load (autovacuum belum tentu sempat jalan)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("games", "sales", "game_genres", "price_history"):
+            conn.execute(text(f"ANALYZE {table}"))
+    engine.dispose()
+
+    summary = {
+        "games": games,
+        "sales": done_sales,
+        "id_base": id_base,
+        "free_game_every": FREE_GAME_EVERY,
+        "seed": seed,
+        "now": _ts(now),
+        "search_terms": SEARCH_TERMS,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+    print(f"\n{'─' * 50}")
+    print(f"✅ Generate selesai dalam {summary['seconds']}s")
+    print(f"   Games : {games}")
+    print(f"   Sales : {done_sales}")
+    print(f"{'─' * 50}")
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate data game & sales sintetis (COPY)")
+    parser.add_argument("--games", type=int, default=100_000, help="Jumlah game sintetis (default: 100000)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed random (default: 42)")
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah proses paralel (default: 1)")
+    parser.add_argument("--id-base", type=int, default=DEFAULT_ID_BASE, help="Id game sintetis pertama")
+    parser.add_argument("--reset", action="store_true", help="Hapus data sintetis sebelumnya")
+    args = parser.parse_args()
+
+    generate(args.games, seed=args.seed, workers=args.workers, id_base=args.id_base, reset=args.reset)
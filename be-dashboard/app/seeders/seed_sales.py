@@ -1,11 +1,18 @@
+import csv
+import io
 import random
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine, select
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, select, func, exists
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db import query_metrics, query_debug
 from app.models.game import Game
 from app.models.sale import Sale
+from app.services.rollup_service import refresh_sales_days_sync
+from app.services.data_version_service import bump_versions_sync, SALES
+from app.services.partition_service import ensure_sales_partitions_between_sync
 
 
 # ── Konstanta ─────────────────────────────────────────────────────────────────
@@ -42,6 +49,8 @@ FALLBACK_PRICE_RANGES_BY_GENRE = {
 # Jumlah sale per game (min, max)
 SALES_PER_GAME = (1, 1)
 
+SALE_COLUMNS = ("game_id", "our_price", "created_at", "updated_at")
+
 
 # ── Helper ────────────────────────────────────────────────────────────────────
 
@@ -75,19 +84,21 @@ def _get_our_price(game: Game) -> float:
         )
         return _round_price(random.uniform(*price_range))
 
-def _random_datetime_within_days(days_back: int = 90) -> datetime:
+def _random_datetime_within_days(days_back: int = 90, now: Optional[datetime] = None) -> datetime:
     """Generate datetime random dalam X hari terakhir."""
-    now = datetime.utcnow()
+    now = now or datetime.now(timezone.utc)
     random_days = random.randint(0, days_back)
     random_seconds = random.randint(0, 86400)
     return now - timedelta(days=random_days, seconds=random_seconds)
 
 
-def _generate_timestamps() -> tuple[datetime, datetime]:
+def _generate_timestamps(now: Optional[datetime] = None) -> tuple[datetime, datetime]:
     """
     Generate kombinasi created_at dan updated_at yang realistis.
+    `now` (aware, UTC) bisa dipatok agar hasil generator paralel konsisten.
     """
-    created_at = _random_datetime_within_days(90)
+    now = now or datetime.now(timezone.utc)
+    created_at = _random_datetime_within_days(90, now)
 
     # 70% kemungkinan tidak pernah diupdate
     if random.random() < 0.7:
@@ -99,10 +110,25 @@ def _generate_timestamps() -> tuple[datetime, datetime]:
         updated_at = created_at + timedelta(days=delta_days, seconds=delta_seconds)
 
         # Jangan melebihi waktu sekarang
-        updated_at = min(updated_at, datetime.utcnow())
+        updated_at = min(updated_at, now)
 
     return created_at, updated_at
 
+# ── Bulk write (dipakai juga oleh generate_data) ──────────────────────────────
+
+def _ts(value: datetime) -> str:
+    """Datetime aware → literal timestamptz UTC (tidak bergantung TimeZone session)."""
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _copy(cursor, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """COPY ... FROM STDIN (CSV) — None menjadi field kosong tanpa quote = NULL."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
 # ── Main Seeder ───────────────────────────────────────────────────────────────
 
 def seed_sales(max_games: int = None) -> None:
@@ -116,61 +142,56 @@ def seed_sales(max_games: int = None) -> None:
         "postgresql+asyncpg://", "postgresql+psycopg2://"
     )
     engine = create_engine(sync_url)
+    query_metrics.instrument(engine)
+    query_debug.install()
+    queries = query_metrics.begin_request("seed_sales")
     SessionLocal = sessionmaker(bind=engine)
 
     with SessionLocal() as db:
-        # Ambil semua game yang ada
-        games = db.execute(select(Game)).scalars().all()
+        # N game pertama (urut id), hanya kolom yang dibutuhkan _get_our_price
+        games = select(Game.id, Game.genre, Game.price_cheap, Game.price_external).order_by(Game.id)
+        if max_games:
+            games = games.limit(max_games)
+        games = games.subquery()
 
-        if not games:
+        total_games = db.execute(select(func.count()).select_from(games)).scalar()
+        if not total_games:
             print("❌ Tidak ada game di database. Jalankan sync terlebih dahulu:")
             print("   POST /api/v1/sync/games")
             return
 
-        if max_games:
-            games = games[:max_games]
-
-        total_inserted = 0
-        total_skipped = 0
-
-        print(f"🎮 Ditemukan {len(games)} game, mulai seeding sales...\n")
-
-        for game in games:
-            # Cek apakah game sudah punya sale — idempotent
-            existing = db.execute(
-                select(Sale).where(Sale.game_id == game.id)
-            ).scalars().all()
+        print(f"🎮 Ditemukan {total_games} game, mulai seeding sales...\n")
 
-            if existing:
-                print(f"  ⏭️  Skip  — {game.name} (sudah ada {len(existing)} sale)")
-                total_skipped += 1
-                continue
+        # Game yang sudah punya sale di-skip lewat anti-join — idempotent tanpa SELECT per game
+        pending = db.execute(
+            select(games).where(~exists().where(Sale.game_id == games.c.id))
+        ).all()
 
-            # Buat 1-3 sale per game
-            
-            our_price = _get_our_price(game)
+        rows = []
+        for game in pending:
             created_at, updated_at = _generate_timestamps()
-            
-            db.add(Sale(
-                game_id=game.id,
-                our_price=our_price,
-                created_at=created_at,
-                updated_at=updated_at
-            ))
-
-            price_ref = game.price_cheap or game.price_external
-            ref_str = f"(ref: ${price_ref:.2f})" if price_ref else "(no ref, fallback)"
-            print(f"  ✅ Seed  — {game.name} {ref_str} → our_price: ${our_price:.2f}")
-            total_inserted += 1
-
+            rows.append((game.id, _get_our_price(game), _ts(created_at), _ts(updated_at)))
+
+        # Partisi bulan-bulan yang dicakup _generate_timestamps disiapkan dulu (commit sendiri),
+        # lalu satu COPY untuk semua baris di transaksi yang sama dengan refresh rollup
+        if rows:
+            now = datetime.now(timezone.utc)
+            ensure_sales_partitions_between_sync(db, (now - timedelta(days=91)).date(), now.date())
+            _copy(db.connection().connection.cursor(), "sales", SALE_COLUMNS, rows)
+
+        # Rollup harian sales dibangun ulang setelah seeding
+        refresh_sales_days_sync(db)
+        bump_versions_sync(db, SALES)
         db.commit()
 
-        print(f"\n{'─' * 50}")
+        print(f"{'─' * 50}")
         print(f"✅ Seeding selesai!")
-        print(f"   Sales inserted : {total_inserted}")
-        print(f"   Games skipped  : {total_skipped} (sudah ada datanya)")
+        print(f"   Sales inserted : {len(rows)}")
+        print(f"   Games skipped  : {total_games - len(rows)} (sudah ada datanya)")
         print(f"{'─' * 50}")
 
+    query_debug.finish(queries, "seed_sales")
+
 
 if __name__ == "__main__":
     import argparse
@@ -184,4 +205,4 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
-    seed_sales(max_games=args.max_games)
\ No newline at end of file
+    seed_sales(max_games=args.max_games)
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.data_version_service import get_versions
+
+COUNT_STRATEGIES = ["exact", "estimated", "cached"]
+COUNT_CACHE_SIZE = 1024      # jumlah kombinasi filter yang disimpan per proses
+
+# Key cache menyertakan versi data (data_versions), jadi setiap penulisan
+# otomatis membuat entry lama tidak terpakai — tidak perlu invalidasi manual.
+_count_cache: "OrderedDict[Hashable, int]" = OrderedDict()
+
+
+async def _exact(db: AsyncSession, stmt) -> int:
+    return (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+
+
+_ESTIMATE_QUERY = text("""
+    SELECT CASE WHEN c.relkind = 'p' THEN (
+               SELECT CASE WHEN max(ch.reltuples) < 0 THEN -1 ELSE sum(greatest(ch.reltuples, 0)) END
+               FROM pg_inherits i
+               JOIN pg_class ch ON ch.oid = i.inhrelid
+               WHERE i.inhparent = c.oid
+           )
+           ELSE c.reltuples END::bigint
+    FROM pg_class c
+    WHERE c.oid = CAST(:table AS regclass)
+""")
+
+
+async def _estimated(db: AsyncSession, table: str) -> Optional[int]:
+    """
+    Perkiraan jumlah baris dari statistik planner (pg_class.reltuples).
+    Tabel partisi (sales) dijumlahkan dari partisinya: autovacuum tidak pernah
+    meng-ANALYZE parent, jadi reltuples parent membeku di nilai saat migrasi.
+    """
+    reltuples = (await db.execute(_ESTIMATE_QUERY, {"table": table})).scalar_one_or_none()
+    # -1 / None → tabel belum pernah di-ANALYZE
+    if reltuples is None or reltuples < 0:
+        return None
+    return reltuples
+
+
+async def count_rows(
+    db: AsyncSession,
+    stmt,
+    strategy: str,
+    table: str,
+    filtered: bool,
+    cache_key: Hashable,
+    versions: tuple[str, ...],
+) -> tuple[int, str]:
+    """
+    Hitung total baris stmt dengan strategi yang diminta.
+    Return (total, strategi_yang_benar-benar_dipakai):
+    - estimated hanya berlaku untuk query tanpa filter, selain itu jatuh ke exact
+    - cached menyimpan hasil exact per kombinasi filter + versi data
+    """
+    if strategy == "estimated" and not filtered:
+        estimate = await _estimated(db, table)
+        if estimate is not None:
+            return estimate, "estimated"
+
+    if strategy == "cached":
+        current, _ = await get_versions(db, *versions)
+        key = (table, tuple(current[n] for n in versions), cache_key)
+        if key in _count_cache:
+            _count_cache.move_to_end(key)
+            return _count_cache[key], "cached"
+
+        total = await _exact(db, stmt)
+        _count_cache[key] = total
+        if len(_count_cache) > COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+        return total, "cached"
+
+    return await _exact(db, stmt), "exact"
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.data_version import DataVersion
+
+GAMES = "games"
+SALES = "sales"
+
+
+def _bump_stmt(names: tuple[str, ...]):
+    # Upsert supaya tetap benar walau baris belum ada (DB dibuat lewat create_all).
+    # clock_timestamp(), bukan now() (awal transaksi): transaksi panjang yang commit belakangan
+    # tidak boleh memundurkan Last-Modified; greatest() menjaga nilainya tidak pernah turun.
+    stmt = insert(DataVersion).values([
+        {"name": n, "version": 1, "updated_at": func.clock_timestamp()} for n in names
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[DataVersion.name],
+        set_={
+            "version": DataVersion.version + 1,
+            "updated_at": func.greatest(DataVersion.updated_at, func.clock_timestamp()),
+        },
+    )
+
+
+async def bump_versions(db: AsyncSession, *names: str) -> None:
+    """Naikkan versi dalam transaksi yang sama dengan penulisan datanya."""
+    await db.execute(_bump_stmt(names))
+
+
+def bump_versions_sync(db: Session, *names: str) -> None:
+    """Versi sync untuk Celery worker & seeder (psycopg2)."""
+    db.execute(_bump_stmt(names))
+
+
+async def get_versions(db: AsyncSession, *names: str) -> tuple[dict[str, int], Optional[datetime]]:
+    """Versi per nama (0 jika belum pernah ditulis) + waktu penulisan terakhir."""
+    rows = (await db.execute(
+        select(DataVersion.name, DataVersion.version, DataVersion.updated_at)
+        .where(DataVersion.name.in_(names))
+    )).all()
+    versions = {n: 0 for n in names}
+    last_modified = None
+    for r in rows:
+        versions[r.name] = r.version
+        if last_modified is None or r.updated_at > last_modified:
+            last_modified = r.updated_at
+    return versions, last_modified
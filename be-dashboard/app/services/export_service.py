@@ -0,0 +1,166 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Integer, Float, DateTime, Date
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Select
+
+from app.db.database import AsyncSessionLocal
+
+EXPORT_FORMATS = ["csv", "ndjson", "parquet"]
+EXPORT_BATCH_SIZE = 5000     # baris per fetch dari server-side cursor (= satu row group parquet)
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+# SUMBER DATA — server-side cursor, memori konstan per batch
+#
+# Session dibuka di dalam generator (bukan dari Depends(get_db)) karena
+# dependency dengan yield sudah ditutup sebelum body StreamingResponse dikirim.
+
+async def _stream_batches(stmt: Select, session_factory: async_sessionmaker) -> AsyncIterator[list]:
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield batch
+
+
+# ENCODER per format
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _encode_csv(columns: list[str], batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    yield buf.getvalue().encode()
+
+    async for batch in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(batch)
+        yield buf.getvalue().encode()
+
+
+async def _encode_ndjson(columns: list[str], batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        lines = [json.dumps(dict(zip(columns, row)), default=_json_default) for row in batch]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _ChunkSink:
+    """
+    File-like tujuan ParquetWriter: menampung byte yang ditulis sampai diambil
+    dengan drain(), tetapi tell() tetap mengembalikan total offset agar
+    metadata parquet benar.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._offset = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(stmt: Select):
+    import pyarrow as pa
+
+    fields = []
+    for col in stmt.selected_columns:
+        if isinstance(col.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(col.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(col.type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC" if col.type.timezone else None)
+        elif isinstance(col.type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(col.key, arrow_type))
+    return pa.schema(fields)
+
+
+async def _encode_parquet(stmt: Select, batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(stmt)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        async for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+# RESPONSE
+
+def export_response(
+    stmt: Select,
+    fmt: str,
+    filename: str,
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+) -> StreamingResponse:
+    """
+    StreamingResponse untuk export penuh tabel (hasil stmt) dalam format csv/ndjson/parquet.
+    session_factory menentukan engine sumber (primary / replica).
+    """
+    batches = _stream_batches(stmt, session_factory)
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow to be installed")
+        body = _encode_parquet(stmt, batches)
+    elif fmt == "ndjson":
+        body = _encode_ndjson([c.key for c in stmt.selected_columns], batches)
+    else:
+        body = _encode_csv([c.key for c in stmt.selected_columns], batches)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,172 @@
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+
+from app.core.cache import TTLCache, MISSING
+from app.core.config import settings
+
+# Read-through cache untuk lookup game yang paling sering (detail, validasi sale).
+#
+# Tier 1: LRU per proses (GAME_CACHE_LOCAL_TTL pendek).
+# Tier 2: Redis, dibagi semua proses API.
+# Invalidasi menghapus kedua tier di proses yang menulis + Redis; proses lain
+# paling lama melihat data lama selama GAME_CACHE_LOCAL_TTL.
+# Hasil "tidak ada" tidak di-cache, jadi cek duplikat sebelum create tetap akurat.
+#
+# Race baca-DB vs invalidasi: load yang mulai sebelum invalidasi bisa membawa baris
+# lama. Invalidasi menaikkan _epoch (proses ini) dan menulis tombstone di Redis
+# (semua proses, termasuk Celery); hasil load tidak disimpan jika _epoch berubah
+# selama load, dan SET ke Redis memakai NX sehingga gagal selama tombstone ada.
+# Validasi game_id sale memakai cache; entry basi ditangkap FK sales → 404.
+
+KEY_PREFIX = "gamestore:game"
+REDIS_TIMEOUT = 0.25         # detik — Redis lambat/mati diperlakukan sebagai miss
+TOMBSTONE = b"__invalidated__"
+TOMBSTONE_TTL = 10           # detik — jauh di atas durasi satu load dari DB
+
+_local = TTLCache(settings.GAME_CACHE_SIZE, settings.GAME_CACHE_LOCAL_TTL)
+_redis: Optional[aioredis.Redis] = None
+_epoch = 0                   # naik setiap invalidate() di proses ini
+
+_stats = {
+    "local_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+    "redis_errors": 0,
+}
+
+
+def id_key(game_id: int) -> str:
+    return f"{KEY_PREFIX}:id:{game_id}"
+
+
+def _get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=REDIS_TIMEOUT,
+            socket_connect_timeout=REDIS_TIMEOUT,
+        )
+    return _redis
+
+
+async def _redis_get(key: str) -> Any:
+    try:
+        raw = await _get_redis().get(key)
+    except (redis.RedisError, OSError):
+        _stats["redis_errors"] += 1
+        return MISSING
+    return MISSING if raw is None or raw == TOMBSTONE else orjson.loads(raw)
+
+
+async def _redis_set(key: str, value: Any) -> None:
+    # NX: tidak menimpa tombstone dari invalidasi yang terjadi selama load
+    try:
+        await _get_redis().set(key, orjson.dumps(value), ex=settings.GAME_CACHE_REDIS_TTL, nx=True)
+    except (redis.RedisError, OSError):
+        _stats["redis_errors"] += 1
+
+
+# READ-THROUGH
+
+async def get_or_load(key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    """Nilai dari LRU → Redis → loader (DB). Nilai None dari loader tidak disimpan."""
+    if not settings.GAME_CACHE_ENABLED:
+        return await loader()
+
+    value = _local.get(key)
+    if value is not MISSING:
+        _stats["local_hits"] += 1
+        return value
+
+    value = await _redis_get(key)
+    if value is not MISSING:
+        _stats["redis_hits"] += 1
+        _local.set(key, value)
+        return value
+
+    _stats["misses"] += 1
+    epoch = _epoch
+    value = await loader()
+    if value is not None and epoch == _epoch:
+        _local.set(key, value)
+        await _redis_set(key, value)
+    return value
+
+
+# WARMUP — dipanggil saat startup, sebelum readiness
+
+def prime(key: str, value: Any) -> None:
+    """Isi tier LRU lokal saja (Redis sudah terisi oleh proses lain / request sebelumnya)."""
+    if settings.GAME_CACHE_ENABLED and value is not None:
+        _local.set(key, value)
+
+
+async def ping_redis() -> bool:
+    """Buka koneksi Redis lebih awal; False jika Redis tidak bisa dihubungi."""
+    try:
+        return bool(await _get_redis().ping())
+    except (redis.RedisError, OSError):
+        _stats["redis_errors"] += 1
+        return False
+
+
+# INVALIDASI — dipanggil setelah commit
+
+def _keys(game_ids: Iterable[int]) -> list[str]:
+    return [id_key(g) for g in game_ids]
+
+
+def _write_tombstones(pipe, keys: list[str]) -> None:
+    for key in keys:
+        pipe.set(key, TOMBSTONE, ex=TOMBSTONE_TTL)
+
+
+async def invalidate(game_ids: Iterable[int]) -> None:
+    global _epoch
+    keys = _keys(game_ids)
+    if not keys:
+        return
+    _epoch += 1
+    for key in keys:
+        _local.pop(key)
+    _stats["invalidations"] += len(keys)
+    try:
+        async with _get_redis().pipeline(transaction=False) as pipe:
+            _write_tombstones(pipe, keys)
+            await pipe.execute()
+    except (redis.RedisError, OSError):
+        _stats["redis_errors"] += 1
+
+
+def invalidate_sync(game_ids: Iterable[int]) -> None:
+    """Versi sync untuk Celery worker — hanya tier Redis (LRU worker tidak dipakai)."""
+    keys = _keys(game_ids)
+    if not keys:
+        return
+    try:
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=REDIS_TIMEOUT)
+        with client.pipeline(transaction=False) as pipe:
+            _write_tombstones(pipe, keys)
+            pipe.execute()
+        client.close()
+    except (redis.RedisError, OSError) as e:
+        print(f"[GameCache] invalidate failed: {e}")
+
+
+# METRICS
+
+def cache_stats() -> dict:
+    lookups = _stats["local_hits"] + _stats["redis_hits"] + _stats["misses"]
+    hits = _stats["local_hits"] + _stats["redis_hits"]
+    return {
+        **_stats,
+        "enabled": settings.GAME_CACHE_ENABLED,
+        "local_size": len(_local),
+        "local_maxsize": _local.maxsize,
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+    }
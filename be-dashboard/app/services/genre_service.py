@@ -0,0 +1,91 @@
+from typing import Optional
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.genre import Genre, GameGenre
+
+
+# FILTER & AGREGASI
+
+def has_genre(game_id_col, genre: str):
+    """
+    Filter exact (case-insensitive) lewat junction table — semi-join ber-index,
+    menggantikan Game.genre ILIKE '%genre%' yang juga mencocokkan genre lain.
+    """
+    return game_id_col.in_(
+        select(GameGenre.game_id)
+        .join(Genre, Genre.id == GameGenre.genre_id)
+        .where(func.lower(Genre.name) == genre.lower())
+    )
+
+
+def join_genres(stmt, game_id_col):
+    """Join ke game_genres + genres untuk agregasi per genre (game multi-genre dihitung di setiap genre)."""
+    return (
+        stmt.join(GameGenre, GameGenre.game_id == game_id_col)
+        .join(Genre, Genre.id == GameGenre.genre_id)
+    )
+
+
+# PENULISAN — dipanggil saat sync dan create/update game
+
+def _genre_names(game_genres: dict[int, list[str]]) -> list[str]:
+    return sorted({name for names in game_genres.values() for name in names if name})
+
+
+def _upsert_genres_stmt(names: list[str]):
+    return pg_insert(Genre).values([{"name": n} for n in names]).on_conflict_do_nothing(
+        index_elements=[Genre.name]
+    )
+
+
+def _link_rows(game_genres: dict[int, list[str]], genre_ids: dict[str, int]) -> list[dict]:
+    rows = []
+    for game_id, names in game_genres.items():
+        for genre_id in dict.fromkeys(genre_ids[n] for n in names if n):
+            rows.append({"game_id": game_id, "genre_id": genre_id})
+    return rows
+
+
+async def link_genres(db: AsyncSession, game_genres: dict[int, list[str]]) -> None:
+    """Ganti seluruh genre milik game-game di game_genres (set-based, 3-4 statement total)."""
+    if not game_genres:
+        return
+    names = _genre_names(game_genres)
+    genre_ids: dict[str, int] = {}
+    if names:
+        await db.execute(_upsert_genres_stmt(names))
+        genre_ids = dict((await db.execute(
+            select(Genre.name, Genre.id).where(Genre.name.in_(names))
+        )).all())
+
+    await db.execute(delete(GameGenre).where(GameGenre.game_id.in_(list(game_genres))))
+    rows = _link_rows(game_genres, genre_ids)
+    if rows:
+        await db.execute(insert(GameGenre), rows)
+
+
+def link_genres_sync(db: Session, game_genres: dict[int, list[str]]) -> None:
+    """Versi sync untuk Celery worker (psycopg2)."""
+    if not game_genres:
+        return
+    names = _genre_names(game_genres)
+    genre_ids: dict[str, int] = {}
+    if names:
+        db.execute(_upsert_genres_stmt(names))
+        genre_ids = dict(db.execute(
+            select(Genre.name, Genre.id).where(Genre.name.in_(names))
+        ).all())
+
+    db.execute(delete(GameGenre).where(GameGenre.game_id.in_(list(game_genres))))
+    rows = _link_rows(game_genres, genre_ids)
+    if rows:
+        db.execute(insert(GameGenre), rows)
+
+
+def genres_for_payload(genres: Optional[list[str]], genre: Optional[str]) -> list[str]:
+    """Genre dari payload API: list genres jika ada, selain itu genre utama."""
+    if genres is not None:
+        return genres
+    return [genre] if genre else []
@@ -0,0 +1,58 @@
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+# Partisi bulanan sales (RANGE created_at, UTC). Fungsi SQL-nya dibuat migrasi
+# e4a1c93b7d52; di sini hanya pemanggil. Partisi bulan berjalan + N bulan ke depan
+# dibuat saat startup API dan oleh Celery beat harian, sehingga sales_default
+# (penampung baris di luar rentang) normalnya tetap kosong.
+
+_PARTITIONS_QUERY = text("""
+    SELECT c.relname AS name,
+           pg_get_expr(c.relpartbound, c.oid) AS bound,
+           greatest(c.reltuples, 0)::bigint AS estimated_rows
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'sales'::regclass
+    ORDER BY c.relname
+""")
+
+
+def _ensure_stmt():
+    return text("SELECT sales_ensure_partitions(:months_ahead)").bindparams(
+        months_ahead=settings.SALES_PARTITION_MONTHS_AHEAD
+    )
+
+
+async def ensure_sales_partitions(db: AsyncSession) -> int:
+    """Buat partisi yang belum ada; return jumlah partisi baru."""
+    created = (await db.execute(_ensure_stmt())).scalar()
+    await db.commit()
+    return created
+
+
+def ensure_sales_partitions_sync(db: Session) -> int:
+    """Versi sync untuk Celery worker."""
+    created = db.execute(_ensure_stmt()).scalar()
+    db.commit()
+    return created
+
+
+def ensure_sales_partitions_between_sync(db: Session, start: date, end: date) -> int:
+    """Partisi untuk setiap bulan start..end (mis. seeder yang menulis sales bertanggal mundur)."""
+    created = db.execute(
+        text("""
+            SELECT coalesce(sum(sales_create_partition(m::date)), 0)
+            FROM generate_series(date_trunc('month', CAST(:start AS timestamp)), CAST(:end AS timestamp), interval '1 month') AS m
+        """),
+        {"start": start, "end": end},
+    ).scalar()
+    db.commit()
+    return created
+
+
+async def sales_partitions(db: AsyncSession) -> list[dict]:
+    """Daftar partisi + estimasi jumlah baris (statistik planner, tanpa COUNT)."""
+    return [dict(r._mapping) for r in (await db.execute(_PARTITIONS_QUERY)).all()]
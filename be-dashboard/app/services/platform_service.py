@@ -0,0 +1,21 @@
+from sqlalchemy import func, case
+
+
+# FILTER & AGREGASI atas kolom JSONB games.platforms (list nama platform)
+
+def has_platform(platforms_col, platform: str):
+    """
+    platforms @> '["<platform>"]' — dilayani GIN index ix_games_platforms_gin.
+    Nama platform exact (case-sensitive) sesuai RAWG, mis. "PC", "PlayStation 5".
+    """
+    return platforms_col.contains([platform])
+
+
+def platform_values(platforms_col, name: str = "platform"):
+    """
+    jsonb_array_elements_text(platforms) sebagai LATERAL — satu baris per
+    (game, platform), untuk agregasi per platform langsung di database.
+    Nilai yang bukan array (JSON 'null' dari data lama) dilewati, tidak error.
+    """
+    arrays_only = case((func.jsonb_typeof(platforms_col) == "array", platforms_col))
+    return func.jsonb_array_elements_text(arrays_only).table_valued("value").lateral(name)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+
+def price_change_row(
+    game_id: int,
+    old_price: Optional[float],
+    new_price: Optional[float],
+    recorded_at: datetime,
+) -> Optional[dict]:
+    """
+    Baris price_history untuk satu game, atau None jika harga tidak berubah.
+    Dikumpulkan per sync lalu di-insert sekaligus (executemany), bukan per game.
+    """
+    if new_price is None or old_price == new_price:
+        return None
+    return {"game_id": game_id, "recorded_at": recorded_at, "price": new_price}
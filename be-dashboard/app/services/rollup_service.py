@@ -0,0 +1,227 @@
+from datetime import date, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import select, delete, func, cast, literal, and_, or_, text, Date
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.game import Game
+from app.models.sale import Sale
+from app.models.rollup import SalesDaily, GamesDaily
+
+GRANULARITIES = ["day", "week", "month"]
+MAX_BUCKETS = 3660   # ~10 tahun harian; fill_gaps membangun setiap bucket di Python
+
+
+# MAINTENANCE — hitung ulang rollup untuk hari-hari yang terdampak
+#
+# days=None artinya rebuild penuh (dipakai seeder), selain itu hanya hari yang
+# disebut yang dihitung ulang dari tabel sumber. Satu statement per refresh:
+# upsert (ON CONFLICT day) untuk hari yang masih punya data + hapus hari yang
+# kini kosong — dua transaksi yang menyentuh hari yang sama tidak saling
+# melanggar primary key. Sebelumnya advisory lock per hari diambil (urut)
+# supaya transaksi kedua menghitung ulang setelah yang pertama commit.
+
+ROLLUP_LOCK_SALES = 7301     # namespace pg_advisory_xact_lock(namespace, hari)
+ROLLUP_LOCK_GAMES = 7302
+
+_LOCK_DAYS = text(
+    "SELECT count(pg_advisory_xact_lock(:namespace, k)) FROM unnest(CAST(:keys AS integer[])) AS k"
+)
+
+def _day_ranges(col, days: set[date]):
+    """
+    Filter range per hari supaya index pada kolom timestamp tetap terpakai.
+    Batas dikirim sebagai DATE agar Postgres mengonversinya dengan timezone
+    session yang sama seperti cast(col, Date).
+    """
+    return or_(*[
+        and_(col >= literal(d, Date), col < literal(d + timedelta(days=1), Date))
+        for d in days
+    ])
+
+
+def day_between(col, date_from: Optional[date], date_to: Optional[date]) -> list:
+    """
+    Filter tanggal inklusif sebagai rentang pada kolom timestamp, bukan cast(col, Date):
+    index tetap terpakai dan partisi sales di luar rentang terpangkas planner.
+    """
+    conditions = []
+    if date_from:
+        conditions.append(col >= literal(date_from, Date))
+    if date_to:
+        conditions.append(col < literal(date_to + timedelta(days=1), Date))
+    return conditions
+
+
+def _lock_stmt(namespace: int, days: set[date]):
+    # urutan tetap (ordinal naik) → tidak ada deadlock antar transaksi
+    return _LOCK_DAYS.bindparams(namespace=namespace, keys=sorted(d.toordinal() for d in days))
+
+
+def _refresh_stmt(table, source, value_cols: list[str], days: Optional[set[date]]):
+    src = source.cte("src")
+    upsert = insert(table).from_select(["day", *value_cols], select(src))
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.day],
+        set_={c: getattr(upsert.excluded, c) for c in value_cols},
+    )
+    # DELETE tidak melihat baris hasil upsert, tapi yang dihapus hanya hari yang tidak ada di src
+    empty = delete(table).where(table.day.not_in(select(src.c.day)))
+    if days is not None:
+        empty = empty.where(table.day.in_(days))
+    return empty.add_cte(upsert.cte("upserted"))
+
+
+def _sales_refresh_stmts(days: Optional[set[date]]) -> list:
+    day_col = cast(Sale.created_at, Date)
+    source = (
+        select(day_col.label("day"), func.count(Sale.id).label("sales_count"), func.max(Sale.our_price).label("max_our_price"))
+        .where(Sale.created_at != None)
+        .group_by(day_col)
+    )
+    if days is None:
+        return [_refresh_stmt(SalesDaily, source, ["sales_count", "max_our_price"], None)]
+
+    source = source.where(_day_ranges(Sale.created_at, days))
+    return [
+        _lock_stmt(ROLLUP_LOCK_SALES, days),
+        _refresh_stmt(SalesDaily, source, ["sales_count", "max_our_price"], days),
+    ]
+
+
+def _games_refresh_stmts(days: Optional[set[date]]) -> list:
+    day_col = cast(Game.updated_at, Date)
+    source = (
+        select(day_col.label("day"), func.count(Game.id).label("games_count"))
+        .where(Game.updated_at != None)
+        .group_by(day_col)
+    )
+    if days is None:
+        return [_refresh_stmt(GamesDaily, source, ["games_count"], None)]
+
+    source = source.where(_day_ranges(Game.updated_at, days))
+    return [
+        _lock_stmt(ROLLUP_LOCK_GAMES, days),
+        _refresh_stmt(GamesDaily, source, ["games_count"], days),
+    ]
+
+
+def _normalize_days(days: Optional[Iterable[Optional[date]]]) -> Optional[set[date]]:
+    if days is None:
+        return None
+    return {d for d in days if d is not None}
+
+
+async def refresh_sales_days(db: AsyncSession, days: Optional[Iterable[date]] = None) -> None:
+    days = _normalize_days(days)
+    if days == set():
+        return
+    for stmt in _sales_refresh_stmts(days):
+        await db.execute(stmt)
+
+
+async def refresh_games_days(db: AsyncSession, days: Optional[Iterable[date]] = None) -> None:
+    days = _normalize_days(days)
+    if days == set():
+        return
+    for stmt in _games_refresh_stmts(days):
+        await db.execute(stmt)
+
+
+def refresh_sales_days_sync(db: Session, days: Optional[Iterable[date]] = None) -> None:
+    """Versi sync untuk Celery worker & seeder (psycopg2)."""
+    days = _normalize_days(days)
+    if days == set():
+        return
+    for stmt in _sales_refresh_stmts(days):
+        db.execute(stmt)
+
+
+def refresh_games_days_sync(db: Session, days: Optional[Iterable[date]] = None) -> None:
+    """Versi sync untuk Celery worker & seeder (psycopg2)."""
+    days = _normalize_days(days)
+    if days == set():
+        return
+    for stmt in _games_refresh_stmts(days):
+        db.execute(stmt)
+
+
+# READ — bucket day/week/month + gap filling
+
+def bucket_col(day_col, granularity: str):
+    """Kolom bucket di SQL: day apa adanya, week/month lewat date_trunc."""
+    if granularity == "day":
+        return day_col
+    return cast(func.date_trunc(granularity, day_col), Date)
+
+
+def _bucket_start(d: date, granularity: str) -> date:
+    if granularity == "week":
+        return d - timedelta(days=d.weekday())  # sama dengan date_trunc('week') → Senin
+    if granularity == "month":
+        return d.replace(day=1)
+    return d
+
+
+def _next_bucket(d: date, granularity: str) -> date:
+    if granularity == "week":
+        return d + timedelta(days=7)
+    if granularity == "month":
+        return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return d + timedelta(days=1)
+
+
+def bucket_count(start: date, end: date, granularity: str) -> int:
+    """Jumlah bucket dari start sampai end (inklusif) tanpa membangun deretnya."""
+    start, end = _bucket_start(start, granularity), _bucket_start(end, granularity)
+    if end < start:
+        return 0
+    if granularity == "week":
+        return (end - start).days // 7 + 1
+    if granularity == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def check_bucket_range(date_from: Optional[date], date_to: Optional[date], granularity: str) -> None:
+    """
+    ValueError jika rentang melebihi MAX_BUCKETS. Batas yang kosong dianggap hari ini
+    (date_to) — date_from kosong dibatasi oleh data yang ada.
+    """
+    if date_from is None:
+        return
+    count = bucket_count(date_from, date_to or date.today(), granularity)
+    if count > MAX_BUCKETS:
+        raise ValueError(
+            f"Date range spans {count} {granularity} buckets (max {MAX_BUCKETS}); "
+            f"narrow date_from/date_to or use a coarser granularity"
+        )
+
+
+def fill_gaps(
+    values: dict[date, object],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    granularity: str,
+    empty=None,
+) -> list[tuple[date, object]]:
+    """
+    Lengkapi bucket yang kosong dengan nilai `empty`.
+    Jika date_from/date_to tidak diisi, pakai bucket pertama/terakhir yang ada datanya.
+    Deret dipotong di MAX_BUCKETS (rentang dari request sudah ditolak lebih dulu
+    lewat check_bucket_range; ini hanya pengaman untuk data bertanggal ekstrem).
+    """
+    if date_from is None and date_to is None and not values:
+        return []
+
+    first = min(values) if values else (date_from or date_to)
+    last = max(values) if values else (date_to or date_from)
+    start = _bucket_start(date_from or first, granularity)
+    end = _bucket_start(date_to or last, granularity)
+
+    series = []
+    current = start
+    while current <= end and len(series) < MAX_BUCKETS:
+        series.append((current, values.get(current, empty)))
+        current = _next_bucket(current, granularity)
+    return series
@@ -0,0 +1,117 @@
+import json
+from typing import Any, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.sale import SaleCreate, SaleBulkItemResult, SaleBulkResult
+from app.crud.games import existing_ids
+from app.crud.sales import bulk_write
+
+BULK_MAX_ITEMS = 10000       # per request; job repricing besar dikirim beberapa batch
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class _Unparsable:
+    """Penanda baris NDJSON yang gagal di-parse — dilaporkan per item, bukan 400."""
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+# PARSING — JSON array atau NDJSON (satu sale per baris)
+
+def parse_items(body: bytes, content_type: str) -> list[Any]:
+    if content_type.split(";")[0].strip() in NDJSON_TYPES:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(_Unparsable(f"invalid JSON: {e}"))
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of sales")
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No sales in request body")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many sales in one request (max {BULK_MAX_ITEMS})")
+    return items
+
+
+def _validation_detail(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in e.errors()
+    )
+
+
+# APPLY — validasi per item, satu query cek game_id, tulis set-based
+
+async def apply_bulk(db: AsyncSession, raw_items: list[Any], mode: str) -> SaleBulkResult:
+    results: list[Optional[SaleBulkItemResult]] = [None] * len(raw_items)
+
+    def fail(index: int, detail: str, game_id: Optional[int] = None):
+        results[index] = SaleBulkItemResult(index=index, status="error", game_id=game_id, detail=detail)
+
+    # 1) Validasi schema per item
+    valid: dict[int, SaleCreate] = {}
+    for i, raw in enumerate(raw_items):
+        if isinstance(raw, _Unparsable):
+            fail(i, raw.error)
+            continue
+        try:
+            valid[i] = SaleCreate.model_validate(raw)
+        except ValidationError as e:
+            fail(i, _validation_detail(e))
+
+    # 2) Satu sale per game — game_id ganda dalam satu request: item terakhir yang dipakai
+    by_game: dict[int, int] = {}
+    for i, item in valid.items():
+        if item.game_id in by_game:
+            prev = by_game[item.game_id]
+            fail(prev, f"Duplicate game_id in request, superseded by item {i}", item.game_id)
+        by_game[item.game_id] = i
+
+    # 3) Validasi semua game_id dalam satu query
+    found = await existing_ids(db, list(by_game))
+    for game_id in [g for g in by_game if g not in found]:
+        fail(by_game.pop(game_id), f"Game with id {game_id} not found", game_id)
+
+    # 4) Tulis
+    indexes = sorted(by_game.values())
+    written, missing = await bulk_write(db, [valid[i] for i in indexes], mode) if indexes else ({}, set())
+
+    for i in indexes:
+        game_id = valid[i].game_id
+        row = written.get(game_id)
+        if game_id in missing:
+            fail(i, f"Game with id {game_id} not found", game_id)
+            continue
+        if row is None:
+            if mode == "insert":
+                fail(i, f"Sale for game {game_id} already exists", game_id)
+            else:
+                fail(i, f"Sale for game {game_id} not found", game_id)
+            continue
+        results[i] = SaleBulkItemResult(
+            index=i,
+            status="created" if row.inserted else "updated",
+            game_id=game_id,
+            id=row.id,
+            our_price=row.our_price,
+        )
+
+    return SaleBulkResult(
+        created=sum(r.status == "created" for r in results),
+        updated=sum(r.status == "updated" for r in results),
+        failed=sum(r.status == "error" for r in results),
+        results=results,
+    )
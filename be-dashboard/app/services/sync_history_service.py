@@ -0,0 +1,157 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import select, delete, func, cast, literal, union_all, Date
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.sync_log import SyncLog, SyncLogDaily
+from app.services.rollup_service import bucket_col, day_between, fill_gaps
+
+SYNC_SOURCE = "rawg+cheapshark"
+
+# Riwayat sync = baris sync_logs (masih dalam masa retensi) + sync_logs_daily (sudah
+# dipadatkan). Compaction memindahkan baris dalam satu statement (DELETE ... RETURNING
+# → INSERT ... ON CONFLICT menjumlahkan), jadi satu run tidak pernah terhitung dua kali.
+# Run terbaru per source tidak pernah dipadatkan agar /sync/last selalu punya jawaban.
+
+SUMMED = (
+    "runs", "success_runs", "records_fetched", "records_inserted", "records_updated",
+    "records_skipped", "timed_records_fetched", "duration_seconds",
+)
+
+
+def _summary_columns(t):
+    """Agregat per hari dari baris per run (tabel sync_logs atau CTE hasil DELETE)."""
+    timed = t.duration_seconds != None
+    return [
+        func.count().label("runs"),
+        func.count().filter(t.status == "success").label("success_runs"),
+        func.coalesce(func.sum(t.records_fetched), 0).label("records_fetched"),
+        func.coalesce(func.sum(t.records_inserted), 0).label("records_inserted"),
+        func.coalesce(func.sum(t.records_updated), 0).label("records_updated"),
+        func.coalesce(func.sum(t.records_skipped), 0).label("records_skipped"),
+        func.coalesce(func.sum(t.records_fetched).filter(timed), 0).label("timed_records_fetched"),
+        func.coalesce(func.sum(t.duration_seconds), 0).label("duration_seconds"),
+    ]
+
+
+def _with_rates(row: dict) -> dict:
+    runs, fetched, duration = row["runs"], row["records_fetched"], row["duration_seconds"]
+    return {
+        "runs": runs,
+        "success_runs": row["success_runs"],
+        "success_rate": round(row["success_runs"] / runs, 4) if runs else None,
+        "records_fetched": fetched,
+        "records_inserted": row["records_inserted"],
+        "records_updated": row["records_updated"],
+        "records_skipped": row["records_skipped"],
+        "skip_rate": round(row["records_skipped"] / fetched, 4) if fetched else None,
+        "games_per_minute": round(row["timed_records_fetched"] / (duration / 60), 2) if duration else None,
+    }
+
+
+# READ
+
+async def get_last(db: AsyncSession, source: str = SYNC_SOURCE) -> Optional[SyncLog]:
+    """Run terakhir (berhasil atau gagal) — index (source, synced_at)."""
+    stmt = (
+        select(SyncLog)
+        .where(SyncLog.source == source)
+        .order_by(SyncLog.synced_at.desc())
+        .limit(1)
+    )
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+async def get_recent(
+    db: AsyncSession,
+    source: str = SYNC_SOURCE,
+    limit: int = 20,
+    before: Optional[datetime] = None,
+) -> list[SyncLog]:
+    """Run per baris, terbaru dulu; halaman berikutnya lewat `before` = synced_at terakhir."""
+    stmt = select(SyncLog).where(SyncLog.source == source)
+    if before is not None:
+        stmt = stmt.where(SyncLog.synced_at < before)
+    stmt = stmt.order_by(SyncLog.synced_at.desc()).limit(limit)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def get_history(
+    db: AsyncSession,
+    source: str = SYNC_SOURCE,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    granularity: str = "day",
+) -> dict:
+    """Agregat per bucket (day/week/month) + total untuk rentang: runs, success rate, games/menit, skip rate."""
+    raw_day = cast(SyncLog.synced_at, Date)
+    raw = (
+        select(raw_day.label("day"), *_summary_columns(SyncLog))
+        .where(SyncLog.source == source, *day_between(SyncLog.synced_at, date_from, date_to))
+        .group_by(raw_day)
+    )
+    compacted = select(SyncLogDaily.day, *[getattr(SyncLogDaily, c) for c in SUMMED]).where(SyncLogDaily.source == source)
+    if date_from:
+        compacted = compacted.where(SyncLogDaily.day >= date_from)
+    if date_to:
+        compacted = compacted.where(SyncLogDaily.day <= date_to)
+
+    combined = union_all(raw, compacted).subquery()
+    bucket = bucket_col(combined.c.day, granularity).label("bucket")
+    stmt = (
+        select(bucket, *[func.sum(combined.c[c]).label(c) for c in SUMMED])
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    rows = {r.bucket: {c: r._mapping[c] or 0 for c in SUMMED} for r in (await db.execute(stmt)).all()}
+
+    empty = dict.fromkeys(SUMMED, 0)
+    totals = {c: sum(r[c] for r in rows.values()) for c in SUMMED}
+    return {
+        "source": source,
+        "granularity": granularity,
+        "totals": _with_rates(totals),
+        "series": [
+            {"date": str(d), **_with_rates(values)}
+            for d, values in fill_gaps(rows, date_from, date_to, granularity, empty=empty)
+        ],
+    }
+
+
+# RETENTION — baris lebih tua dari retention_days dipadatkan ke sync_logs_daily
+
+def _compact_stmt(cutoff: date):
+    latest = (
+        select(SyncLog.id)
+        .distinct(SyncLog.source)
+        .order_by(SyncLog.source, SyncLog.synced_at.desc())
+    )
+    moved = (
+        delete(SyncLog)
+        .where(SyncLog.synced_at < literal(cutoff, Date), SyncLog.id.not_in(latest))
+        .returning(
+            SyncLog.source, SyncLog.synced_at, SyncLog.status, SyncLog.records_fetched,
+            SyncLog.records_inserted, SyncLog.records_updated, SyncLog.records_skipped,
+            SyncLog.duration_seconds,
+        )
+        .cte("moved")
+    )
+    day = cast(moved.c.synced_at, Date)
+    summary = select(moved.c.source, day, *_summary_columns(moved.c)).group_by(moved.c.source, day)
+
+    upsert = insert(SyncLogDaily).from_select(["source", "day", *SUMMED], summary)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[SyncLogDaily.source, SyncLogDaily.day],
+        set_={c: getattr(SyncLogDaily, c) + getattr(upsert.excluded, c) for c in SUMMED},
+    )
+    # CTE yang memodifikasi data selalu dieksekusi; yang dibaca hanya jumlah baris dipindah
+    return select(func.count()).select_from(moved).add_cte(upsert.cte("compacted"))
+
+
+def compact_sync_logs_sync(db: Session, retention_days: int) -> int:
+    """Padatkan run yang lebih tua dari retention_days (hari utuh); return jumlah baris dipindah."""
+    cutoff = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+    moved = db.execute(_compact_stmt(cutoff)).scalar()
+    db.commit()
+    return moved
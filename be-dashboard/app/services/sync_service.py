@@ -1,12 +1,19 @@
 import httpx
 import asyncio
-import json
-from datetime import datetime, timezone
+import time
+from datetime import date, datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert
 from app.models.game import Game
+from app.models.price_history import PriceHistory
 from app.models.sync_log import SyncLog
 from app.core.config import settings
+from app.services.rollup_service import refresh_games_days
+from app.services.data_version_service import bump_versions, GAMES
+from app.services.price_history_service import price_change_row
+from app.services import game_cache
+from app.services.genre_service import link_genres
+from app.services.sync_history_service import SYNC_SOURCE
 
 CHEAPSHARK_REQUEST_DELAY = 1.0   # detik antar request ke CheapShark
 CHEAPSHARK_MAX_RETRIES = 3       # maksimal retry saat 429
@@ -44,12 +51,13 @@ def _slice_rawg(raw: dict) -> dict:
         "slug": raw["slug"],
         "name": raw["name"],
         "released": released_dt,
-        "genre": genres[0]["name"] if genres else None,
+        "genre": genres[0]["name"] if genres else None,      # genre utama (tampilan & sort)
+        "genres": [g["name"] for g in genres if g.get("name")],  # semua genre → game_genres
         "rating": raw.get("rating"),
         "ratings_count": raw.get("ratings_count"),
         "metacritic": raw.get("metacritic"),
         "background_image": raw.get("background_image"),
-        "platforms": json.dumps([p["platform"]["name"] for p in platforms if p.get("platform")]),
+        "platforms": [p["platform"]["name"] for p in platforms if p.get("platform")],
     }
 
 
@@ -163,41 +171,77 @@ def _merge_row(rawg_data: dict, cs_data: dict) -> dict:
 
 
 # STEP 4 — Upsert semua row ke DB
-async def _upsert_games(db: AsyncSession, rows: list[dict]) -> tuple[int, int]:
+async def _upsert_games(db: AsyncSession, rows: list[dict]) -> tuple[int, int, set[int]]:
+    """Return (inserted, updated, id yang harus dibuang dari cache game setelah commit)."""
     inserted = updated = 0
+    now = datetime.now(timezone.utc)
+    history: list[dict] = []
+    game_genres: dict[int, list[str]] = {}
+    stale_ids: set[int] = set()
+    touched_days: set[date] = {now.date()}   # rollup games_daily: hari lama & baru
 
     for data in rows:
+        game_genres[data["id"]] = data.pop("genres", [])
         existing = await db.get(Game, data["id"])
+        stale_ids.add(data["id"])
+        if existing and existing.updated_at:
+            touched_days.add(existing.updated_at.date())
+        change = price_change_row(
+            data["id"], existing.price_cheap if existing else None, data.get("price_cheap"), now
+        )
+        if change:
+            history.append(change)
+
         if existing:
             for k, v in data.items():
                 setattr(existing, k, v)
-            existing.updated_at = datetime.now(timezone.utc)
+            existing.updated_at = now
             updated += 1
         else:
-            db.add(Game(**data))
+            db.add(Game(**data, updated_at=now))
             inserted += 1
 
+    await db.flush()
+
+    # Riwayat harga: satu executemany untuk semua game yang harganya berubah
+    if history:
+        await db.execute(insert(PriceHistory), history)
+
+    # Genre: semua genre RAWG ke game_genres (set-based)
+    await link_genres(db, game_genres)
+
     # Hapus duplikat slug
     result = await db.execute(select(Game))
     all_games = result.scalars().all()
+    by_id = {g.id: g for g in all_games}
     seen: dict[str, int] = {}
     to_delete: list[int] = []
     for g in all_games:
         if g.slug in seen:
             older = min(seen[g.slug], g.id)
             to_delete.append(older)
+            older_game = g if g.id == older else by_id[older]
+            if older_game.updated_at:
+                touched_days.add(older_game.updated_at.date())
             seen[g.slug] = max(seen[g.slug], g.id)
         else:
             seen[g.slug] = g.id
     if to_delete:
         await db.execute(delete(Game).where(Game.id.in_(to_delete)))
+        stale_ids.update(to_delete)
+
+    # Rollup harian games: hanya hari updated_at lama/baru dari game yang disentuh & dihapus
+    await db.flush()
+    await refresh_games_days(db, touched_days)
+    await bump_versions(db, GAMES)
 
-    return inserted, updated
+    return inserted, updated, stale_ids
 
 
 # MAIN SYNC FUNCTION
 async def sync_games(db: AsyncSession, limit: int = 40) -> SyncLog:
     fetched = skipped = inserted = updated = 0
+    started = time.monotonic()
     message = None
 
     try:
@@ -226,8 +270,9 @@ async def sync_games(db: AsyncSession, limit: int = 40) -> SyncLog:
                 merged_rows.append(_merge_row(rawg_data, cs_data))
 
         # Step 4: Upsert ke DB
-        inserted, updated = await _upsert_games(db, merged_rows)
+        inserted, updated, stale_ids = await _upsert_games(db, merged_rows)
         await db.commit()
+        await game_cache.invalidate(stale_ids)
         status = "success"
 
     except Exception as e:
@@ -237,12 +282,13 @@ async def sync_games(db: AsyncSession, limit: int = 40) -> SyncLog:
         fetched = skipped = inserted = updated = 0
 
     log = SyncLog(
-        source="rawg+cheapshark",
+        source=SYNC_SOURCE,
         synced_at=datetime.now(timezone.utc),
         records_fetched=fetched,
         records_inserted=inserted,
         records_updated=updated,
         records_skipped=skipped,
+        duration_seconds=round(time.monotonic() - started, 3),
         status=status,
         message=message,
     )
@@ -0,0 +1,112 @@
+import time
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+from app.core.config import settings
+
+# Metrics task Celery (durasi & waktu antre). Worker adalah proses terpisah,
+# jadi hasilnya diakumulasi di satu hash Redis lalu dibaca API saat /metrics
+# di-scrape. Modul ini tidak meng-import Celery — signal dipasang di app.celery_app.
+#
+# Field hash:  <task>|<metric>|count, <task>|<metric>|sum, <task>|<metric>|le=<bucket>
+#              <task>|state|<STATE>
+
+METRICS_KEY = "gamestore:metrics:celery"
+PUBLISHED_HEADER = "gamestore_published_at"    # epoch detik saat task di-publish
+REDIS_TIMEOUT = 0.5
+
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800)
+QUEUE_WAIT_BUCKETS = (0.1, 0.5, 1, 5, 15, 60, 300, 900)
+HISTOGRAMS = {
+    "duration": ("gamestore_celery_task_duration_seconds", "Durasi eksekusi task", DURATION_BUCKETS),
+    "queue_wait": ("gamestore_celery_task_queue_wait_seconds", "Waktu task menunggu di antrean", QUEUE_WAIT_BUCKETS),
+}
+
+_started: dict[str, float] = {}
+_client: Optional[redis.Redis] = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=REDIS_TIMEOUT)
+    return _client
+
+
+def _observe(pipe, task: str, metric: str, value: float) -> None:
+    pipe.hincrby(METRICS_KEY, f"{task}|{metric}|count", 1)
+    pipe.hincrbyfloat(METRICS_KEY, f"{task}|{metric}|sum", value)
+    for bound in HISTOGRAMS[metric][2]:
+        if value <= bound:
+            pipe.hincrby(METRICS_KEY, f"{task}|{metric}|le={bound}", 1)
+
+
+# SIGNAL HANDLER (dipasang di app.celery_app)
+
+def on_publish(headers: dict) -> None:
+    headers[PUBLISHED_HEADER] = time.time()
+
+
+def on_start(task_id: str, task_name: str, published_at: Optional[float]) -> None:
+    now = time.time()
+    _started[task_id] = now
+    if published_at is None:
+        return
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        _observe(pipe, task_name, "queue_wait", max(now - float(published_at), 0.0))
+        pipe.execute()
+    except (redis.RedisError, OSError) as e:
+        print(f"[TaskMetrics] record failed: {e}")
+
+
+def on_finish(task_id: str, task_name: str, state: Optional[str]) -> None:
+    started = _started.pop(task_id, None)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hincrby(METRICS_KEY, f"{task_name}|state|{state or 'UNKNOWN'}", 1)
+        if started is not None:
+            _observe(pipe, task_name, "duration", time.time() - started)
+        pipe.execute()
+    except (redis.RedisError, OSError) as e:
+        print(f"[TaskMetrics] record failed: {e}")
+
+
+# READ — dipakai GET /metrics di API
+
+async def read_families() -> list:
+    client = aioredis.Redis.from_url(settings.REDIS_URL, socket_timeout=REDIS_TIMEOUT, socket_connect_timeout=REDIS_TIMEOUT)
+    try:
+        raw = await client.hgetall(METRICS_KEY)
+    except (redis.RedisError, OSError):
+        return []
+    finally:
+        await client.aclose()
+
+    values: dict[tuple[str, str, str], float] = {}
+    for field, value in raw.items():
+        task, metric, part = field.decode().split("|", 2)
+        values[(task, metric, part)] = float(value)
+
+    tasks = sorted({task for task, _, _ in values})
+    families = []
+    for metric, (name, doc, bounds) in HISTOGRAMS.items():
+        family = HistogramMetricFamily(name, doc, labels=["task"])
+        for task in tasks:
+            count = values.get((task, metric, "count"))
+            if count is None:
+                continue
+            buckets = [(str(float(b)), values.get((task, metric, f"le={b}"), 0.0)) for b in bounds]
+            buckets.append(("+Inf", count))
+            family.add_metric([task], buckets, values.get((task, metric, "sum"), 0.0))
+        families.append(family)
+
+    states = CounterMetricFamily("gamestore_celery_tasks", "Task selesai per state", labels=["task", "state"])
+    for (task, metric, part), value in sorted(values.items()):
+        if metric == "state":
+            states.add_metric([task, part], value)
+    families.append(states)
+    return families
@@ -1,5 +1,10 @@
 from app.models.game import Game
-from app.models.sale import Sale
-from app.models.sync_log import SyncLog
+from app.models.sale import Sale, SaleGameKey
+from app.models.sync_log import SyncLog, SyncLogDaily
+from app.models.rollup import SalesDaily, GamesDaily
+from app.models.price_history import PriceHistory
+from app.models.data_version import DataVersion
+from app.models.genre import Genre, GameGenre
 
-from app.tasks.sync_tasks import sync_games_task
\ No newline at end of file
+from app.tasks.sync_tasks import sync_games_task
+from app.tasks.maintenance_tasks import ensure_sales_partitions_task, compact_sync_logs_task
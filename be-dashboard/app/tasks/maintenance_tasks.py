@@ -0,0 +1,26 @@
+from app.celery_app import celery
+from app.core.config import settings
+from app.services.partition_service import ensure_sales_partitions_sync
+from app.services.sync_history_service import compact_sync_logs_sync
+from app.tasks.sync_tasks import _get_sync_session
+
+
+# CELERY TASK — maintenance terjadwal (Celery beat)
+@celery.task(name="app.tasks.maintenance_tasks.ensure_sales_partitions_task")
+def ensure_sales_partitions_task() -> dict:
+    """Buat partisi sales bulan berjalan + SALES_PARTITION_MONTHS_AHEAD bulan ke depan."""
+    SessionLocal = _get_sync_session()
+    with SessionLocal() as db:
+        created = ensure_sales_partitions_sync(db)
+    print(f"[Partitions] sales: {created} partisi baru")
+    return {"created": created}
+
+
+@celery.task(name="app.tasks.maintenance_tasks.compact_sync_logs_task")
+def compact_sync_logs_task() -> dict:
+    """Padatkan sync_logs lebih tua dari SYNC_LOG_RETENTION_DAYS ke ringkasan harian."""
+    SessionLocal = _get_sync_session()
+    with SessionLocal() as db:
+        moved = compact_sync_logs_sync(db, settings.SYNC_LOG_RETENTION_DAYS)
+    print(f"[SyncLogs] {moved} run dipadatkan ke sync_logs_daily")
+    return {"compacted": moved}
@@ -1,12 +1,20 @@
 import asyncio
+import time
 import httpx
-from datetime import datetime
+from datetime import date, datetime, timezone
 from celery import Task
-from sqlalchemy import create_engine, select, delete as sa_delete
+from sqlalchemy import create_engine, select, insert, delete as sa_delete
 from sqlalchemy.orm import sessionmaker
 
 from app.celery_app import celery
 from app.core.config import settings
+from app.services.rollup_service import refresh_games_days_sync
+from app.services.data_version_service import bump_versions_sync, GAMES
+from app.services.price_history_service import price_change_row
+from app.services.genre_service import link_genres_sync
+from app.services.game_cache import invalidate_sync as invalidate_game_cache
+from app.services.sync_history_service import SYNC_SOURCE
+from app.db import query_metrics
 from app.services.sync_service import (
     _fetch_rawg_games,
     _fetch_cheapshark_price,
@@ -23,6 +31,7 @@ def _get_sync_session():
         "postgresql+asyncpg://", "postgresql+psycopg2://"
     )
     engine = create_engine(sync_url)
+    query_metrics.instrument(engine)
     return sessionmaker(bind=engine)
 
 
@@ -41,6 +50,9 @@ def sync_games_task(self: Task, limit: int = 40, page: int = 1) -> dict:
     from app.models.game import Game
     from app.models.sale import Sale
     from app.models.sync_log import SyncLog
+    from app.models.price_history import PriceHistory
+
+    started = time.monotonic()   # durasi run → games/menit di /sync/history
 
     async def _fetch_all(limit: int, page: int) -> tuple[int, int, int, list[dict]]:
         fetched = skipped = already_exists = 0
@@ -67,10 +79,10 @@ def sync_games_task(self: Task, limit: int = 40, page: int = 1) -> dict:
                     meta={"current": i, "total": fetched, "skipped": skipped, "message": f"Processing: {rawg_data['name']}"},
                 )
 
+                # Game yang sudah ada tetap dicek ke CheapShark: harga (→ price_history),
+                # genre & metadata di-refresh oleh _upsert; hanya dihitung untuk laporan
                 if rawg_data["id"] in existing_ids:
                     already_exists += 1
-                    skipped += 1
-                    continue
 
                 await asyncio.sleep(CHEAPSHARK_REQUEST_DELAY)
                 cs_data = await _fetch_cheapshark_price(client, rawg_data["name"])
@@ -88,42 +100,81 @@ def sync_games_task(self: Task, limit: int = 40, page: int = 1) -> dict:
         SessionLocal = _get_sync_session()
 
         with SessionLocal() as db:
+            now = datetime.now(timezone.utc)
+            history: list[dict] = []
+            game_genres: dict[int, list[str]] = {}
+            stale_ids: set[int] = set()
+            touched_days: set[date] = {now.date()}   # rollup games_daily: hari lama & baru
+
             for data in merged_rows:
+                game_genres[data["id"]] = data.pop("genres", [])
                 existing = db.get(Game, data["id"])
+                stale_ids.add(data["id"])
+                if existing and existing.updated_at:
+                    touched_days.add(existing.updated_at.date())
+                change = price_change_row(
+                    data["id"], existing.price_cheap if existing else None, data.get("price_cheap"), now
+                )
+                if change:
+                    history.append(change)
+
                 if existing:
                     for k, v in data.items():
                         setattr(existing, k, v)
-                    existing.updated_at = datetime.now()
+                    existing.updated_at = now
                     updated += 1
                 else:
-                    db.add(Game(**data))
+                    db.add(Game(**data, updated_at=now))
                     inserted += 1
 
+            db.flush()
+
+            # Riwayat harga: satu executemany untuk semua game yang harganya berubah
+            if history:
+                db.execute(insert(PriceHistory), history)
+
+            # Genre: semua genre RAWG ke game_genres (set-based)
+            link_genres_sync(db, game_genres)
+
             all_games = db.execute(select(Game)).scalars().all()
+            by_id = {g.id: g for g in all_games}
             seen: dict[str, int] = {}
             to_delete: list[int] = []
             for g in all_games:
                 if g.slug in seen:
                     older = min(seen[g.slug], g.id)
                     to_delete.append(older)
+                    older_game = g if g.id == older else by_id[older]
+                    if older_game.updated_at:
+                        touched_days.add(older_game.updated_at.date())
                     seen[g.slug] = max(seen[g.slug], g.id)
                 else:
                     seen[g.slug] = g.id
             if to_delete:
                 db.execute(sa_delete(Game).where(Game.id.in_(to_delete)))
+                stale_ids.update(to_delete)
+
+            # Rollup harian games: hanya hari updated_at lama/baru dari game yang disentuh & dihapus
+            db.flush()
+            refresh_games_days_sync(db, touched_days)
+            bump_versions_sync(db, GAMES)
 
             # Catat SyncLog
             db.add(SyncLog(
-                source="rawg+cheapshark",
-                synced_at=datetime.now(),
+                source=SYNC_SOURCE,
+                synced_at=datetime.now(timezone.utc),
                 records_fetched=fetched,
                 records_inserted=inserted,
                 records_updated=updated,
                 records_skipped=skipped,
+                duration_seconds=round(time.monotonic() - started, 3),
                 status="success",
             ))
             db.commit()
 
+        # Cache detail game di-invalidate setelah commit (Redis; LRU API kedaluwarsa sendiri)
+        invalidate_game_cache(stale_ids)
+
         return inserted, updated
 
     try:
@@ -149,12 +200,13 @@ def sync_games_task(self: Task, limit: int = 40, page: int = 1) -> dict:
             SessionLocal = _get_sync_session()
             with SessionLocal() as db:
                 db.add(SyncLog(
-                    source="rawg+cheapshark",
-                    synced_at=datetime.now(),
+                    source=SYNC_SOURCE,
+                    synced_at=datetime.now(timezone.utc),
                     records_fetched=0,
                     records_inserted=0,
                     records_updated=0,
                     records_skipped=0,
+                    duration_seconds=round(time.monotonic() - started, 3),
                     status="error",
                     message=str(exc),
                 ))
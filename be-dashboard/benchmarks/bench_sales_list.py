@@ -0,0 +1,85 @@
+"""
+Benchmark list sales: ORM (joinedload Sale.game → SaleInDB) vs select kolom.
+
+Jalankan dari folder be-dashboard, terhadap database yang sudah berisi data:
+
+    python -m benchmarks.bench_sales_list --page-size 100 --iterations 50
+"""
+import asyncio
+import time
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.db.database import AsyncSessionLocal, engine
+from app.models.sale import Sale
+from app.models.game import Game  # noqa: F401 — registrasi mapper relationship
+from app.schemas.sale import SaleInDB
+from app.crud.pagination import keyset_order
+from app.crud import sales as crud_sales
+
+
+# ── Implementasi lama (sebelum select kolom), disimpan untuk pembanding ──────
+
+async def _orm_page(db, page: int, page_size: int) -> list[SaleInDB]:
+    stmt = (
+        select(Sale)
+        .join(Sale.game)
+        .order_by(*keyset_order(Sale.updated_at, Sale.id, "desc"))
+        .options(joinedload(Sale.game))
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    sales = (await db.execute(stmt)).scalars().all()
+    return [
+        SaleInDB(
+            id=s.id,
+            game_id=s.game_id,
+            our_price=s.our_price,
+            created_at=s.created_at,
+            updated_at=s.updated_at,
+            game_name=s.game.name if s.game else None,
+            game_genre=s.game.genre if s.game else None,
+            price_cheap=s.game.price_cheap if s.game else None,
+            price_external=s.game.price_external if s.game else None,
+        )
+        for s in sales
+    ]
+
+
+async def _projected_page(db, page: int, page_size: int) -> list[SaleInDB]:
+    return await crud_sales.get_all(db, page, page_size, None, None, "updated_at", "desc")
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+async def _measure(name: str, fn, page_size: int, iterations: int, pages: int) -> None:
+    rows = 0
+    async with AsyncSessionLocal() as db:
+        await fn(db, 1, page_size)                      # warmup (koneksi + statement cache)
+        start = time.perf_counter()
+        for i in range(iterations):
+            db.expunge_all()                            # identity map kosong, seperti request baru
+            rows += len(await fn(db, i % pages + 1, page_size))
+        elapsed = time.perf_counter() - start
+
+    print(f"  {name:<10} {rows:>8} rows  {elapsed:8.3f} s  {rows / elapsed:>10.0f} rows/s  "
+          f"{elapsed / iterations * 1000:7.2f} ms/page")
+
+
+async def main(page_size: int, iterations: int, pages: int) -> None:
+    print(f"📊 /sales list — page_size={page_size}, iterations={iterations}, pages={pages}\n")
+    await _measure("orm", _orm_page, page_size, iterations, pages)
+    await _measure("projected", _projected_page, page_size, iterations, pages)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark list sales: ORM vs select kolom")
+    parser.add_argument("--page-size", type=int, default=100, help="Baris per halaman (default: 100)")
+    parser.add_argument("--iterations", type=int, default=50, help="Jumlah halaman yang dibaca (default: 50)")
+    parser.add_argument("--pages", type=int, default=10, help="Halaman berbeda yang digilir (default: 10)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.page_size, args.iterations, args.pages))
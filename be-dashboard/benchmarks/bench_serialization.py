@@ -0,0 +1,123 @@
+"""
+Benchmark serialisasi response besar — tanpa database, data sintetis.
+
+Membandingkan jalur default FastAPI (validasi response_model + jsonable_encoder
++ json.dumps) dengan jalur cepat Responder (dict dari row → orjson / msgpack).
+
+    python -m benchmarks.bench_serialization --rows 5000 --iterations 20
+"""
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse, MsgpackResponse
+from app.schemas.game import PaginatedGame
+from app.schemas.dashboard import PriceRatioItem
+
+GENRES = ["Action", "RPG", "Shooter", "Adventure", "Strategy", "Indie"]
+PLATFORMS = ["PC", "PlayStation 5", "Xbox Series S/X", "Nintendo Switch", "macOS"]
+
+
+# ── Data sintetis (bentuk sama dengan dict hasil select kolom) ────────────────
+
+def _games_page(rows: int) -> dict:
+    now = datetime.now(timezone.utc)
+    data = [
+        {
+            "id": i,
+            "name": f"Game {i}",
+            "slug": f"game-{i}",
+            "released": now - timedelta(days=random.randint(0, 5000)),
+            "genre": random.choice(GENRES),
+            "rating": round(random.uniform(1, 5), 2),
+            "ratings_count": random.randint(0, 10000),
+            "metacritic": random.randint(40, 99),
+            "background_image": f"https://media.rawg.io/media/games/{i:06d}/background.jpg",
+            "platforms": random.sample(PLATFORMS, 3),
+            "price_cheap": round(random.uniform(1, 60), 2),
+            "price_external": round(random.uniform(5, 70), 2),
+            "fetched_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+    return {"total": rows, "page": 1, "page_size": rows, "data": data, "next_cursor": None, "count_strategy": "exact"}
+
+
+def _price_ratio(rows: int) -> list[dict]:
+    return [
+        {
+            "game_id": i,
+            "game_name": f"Game {i}",
+            "genre": random.choice(GENRES),
+            "our_price": round(random.uniform(1, 60), 2),
+            "price_cheap": round(random.uniform(1, 60), 2),
+            "ratio": round(random.uniform(0.8, 1.5), 4),
+        }
+        for i in range(rows)
+    ]
+
+
+# ── Jalur serialisasi ─────────────────────────────────────────────────────────
+
+def _default_path(adapter: TypeAdapter) -> Callable[[object], bytes]:
+    """Kira-kira yang dilakukan FastAPI untuk return value biasa + JSONResponse."""
+    def run(content) -> bytes:
+        validated = adapter.validate_python(content)
+        encoded = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+        return json.dumps(encoded, ensure_ascii=False, separators=(",", ":")).encode()
+    return run
+
+
+def _orjson_path(content) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def _msgpack_path(content) -> bytes:
+    return MsgpackResponse(content).body
+
+
+def _measure(name: str, fn, content, iterations: int, rows: int) -> None:
+    body = fn(content)                                   # warmup
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(content)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / iterations
+    print(f"  {name:<10} {per_call * 1000:8.2f} ms/response  {rows / per_call:>10.0f} rows/s  {len(body) / 1024:9.1f} KiB")
+
+
+def main(rows: int, iterations: int) -> None:
+    try:
+        import msgpack  # noqa: F401
+        paths = [("orjson", _orjson_path), ("msgpack", _msgpack_path)]
+    except ImportError:
+        print("ℹ️  msgpack tidak terinstall — jalur msgpack dilewati\n")
+        paths = [("orjson", _orjson_path)]
+
+    cases = [
+        ("GET /games (PaginatedGame)", _games_page(rows), TypeAdapter(PaginatedGame)),
+        ("GET /dashboard/price-ratio", _price_ratio(rows), TypeAdapter(list[PriceRatioItem])),
+    ]
+    for title, content, adapter in cases:
+        print(f"📊 {title} — rows={rows}, iterations={iterations}")
+        _measure("default", _default_path(adapter), content, iterations, rows)
+        for name, fn in paths:
+            _measure(name, fn, content, iterations, rows)
+        print()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark serialisasi response: default FastAPI vs orjson/msgpack")
+    parser.add_argument("--rows", type=int, default=5000, help="Baris per response (default: 5000)")
+    parser.add_argument("--iterations", type=int, default=20, help="Jumlah response per jalur (default: 20)")
+    args = parser.parse_args()
+
+    main(args.rows, args.iterations)
@@ -0,0 +1,91 @@
+"""
+Budget waktu import app — diukur di subprocess baru agar tidak ada modul yang
+sudah ter-cache di sys.modules.
+
+Mengukur:
+- waktu `import app.main` (median dari beberapa run, tanpa DB)
+- modul dengan waktu import kumulatif terbesar (python -X importtime)
+- modul berat yang tidak boleh ikut ter-import saat startup (LAZY_MODULES)
+
+Exit code 1 jika median melebihi budget atau ada modul LAZY_MODULES yang ter-import,
+sehingga bisa dipasang di CI.
+
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 2000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+IMPORT_BUDGET_MS = 2000
+
+# Hanya dipakai endpoint / worker tertentu — harus di-import lazy
+LAZY_MODULES = ["httpx", "celery", "alembic", "pyarrow", "msgpack", "app.services.sync_service"]
+
+_MEASURE = """
+import sys, time
+t = time.perf_counter()
+import app.main
+print((time.perf_counter() - t) * 1000)
+print(",".join(m for m in {lazy!r} if m in sys.modules))
+"""
+
+
+def _run_once() -> tuple[float, list[str]]:
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE.format(lazy=LAZY_MODULES)],
+        capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    return float(out[0]), [m for m in out[1].split(",") if m]
+
+
+def _top_imports(limit: int) -> list[tuple[int, str]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # hanya modul tingkat atas / paket app supaya daftar tidak didominasi submodul
+        name = name.strip()
+        if "." not in name or name.startswith("app."):
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    _run_once()  # run pertama: compile .pyc, tidak dihitung
+    samples, leaked = [], set()
+    for _ in range(args.runs):
+        ms, lazy_loaded = _run_once()
+        samples.append(ms)
+        leaked.update(lazy_loaded)
+    median = statistics.median(samples)
+
+    print(f"import app.main  median {median:.0f} ms  (min {min(samples):.0f}, max {max(samples):.0f}, {args.runs} runs)")
+    print(f"budget           {args.budget_ms:.0f} ms\n")
+    print("Top import kumulatif:")
+    for us, name in _top_imports(args.top):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if median > args.budget_ms:
+        print(f"\nFAIL: import melebihi budget ({median:.0f} ms > {args.budget_ms:.0f} ms)")
+        failed = True
+    if leaked:
+        print(f"\nFAIL: modul yang harus lazy ikut ter-import: {', '.join(sorted(leaked))}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
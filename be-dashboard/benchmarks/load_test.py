@@ -0,0 +1,365 @@
+"""
+Load test API — latency p50/p95/p99 dan throughput per skenario, per level concurrency.
+
+Setiap skenario dijalankan terpisah di setiap level concurrency: N worker
+mengirim request berturut-turut (closed loop) selama --duration detik setelah
+--warmup detik yang tidak dihitung. Hasil bisa disimpan sebagai baseline dan
+dibandingkan di run berikutnya; exit code 1 jika ada regresi di atas --tolerance.
+
+Persiapan (Postgres + Redis via docker compose, API jalan tanpa --reload):
+
+    python -m benchmarks.seed_dataset --games 200000 --reset
+    python -m benchmarks.load_test --concurrency 1,8,32 --duration 15 --save baseline
+    python -m benchmarks.load_test --concurrency 1,8,32 --duration 15 --compare baseline
+
+Skenario bisa dipilih per nama atau grup: --scenarios games,dashboard,sales_update
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+MANIFEST = RESULTS_DIR / "dataset.json"
+API_PREFIX = "/api/v1"
+PAGE_SIZE = 20
+BULK_SIZE = 100
+DEEP_PAGE_RATIO = 0.9          # halaman "dalam" = 90% dari total halaman
+
+
+# KONTEKS — id & total yang dibutuhkan skenario, diambil sekali sebelum run
+
+async def _prepare(client: httpx.AsyncClient, manifest: dict) -> dict:
+    games = (await client.get("/games", params={"page_size": 1})).raise_for_status().json()
+    sales = (await client.get("/sales", params={"page_size": 1})).raise_for_status().json()
+    genres = (await client.get("/dashboard/avg-rating-by-genre")).raise_for_status().json()
+
+    # Id sale & game yang sudah punya sale: beberapa halaman acak, cukup untuk PATCH / bulk
+    sale_rows = []
+    sale_pages = max(math.ceil(sales["total"] / 100), 1)
+    for page in random.sample(range(1, sale_pages + 1), min(sale_pages, 20)):
+        resp = await client.get("/sales", params={"page": page, "page_size": 100, "fields": "id,game_id", "count_strategy": "estimated"})
+        sale_rows.extend(resp.raise_for_status().json()["data"])
+
+    # Game tanpa sale dari dataset sintetis (setiap game ke-free_game_every) → POST /sales
+    free_games = []
+    if manifest:
+        step = manifest["free_game_every"]
+        free_games = [manifest["id_base"] + i for i in range(0, manifest["games"], step)]
+        random.shuffle(free_games)
+
+    if manifest:
+        game_ids = range(manifest["id_base"], manifest["id_base"] + manifest["games"])
+    else:
+        game_ids = [row["game_id"] for row in sale_rows]
+
+    return {
+        "games_total": games["total"],
+        "sales_total": sales["total"],
+        "genres": [row["genre"] for row in genres] or ["Action"],
+        "search": (manifest or {}).get("search_terms", {"common": "the", "rare": "zelda"}),
+        "game_ids": game_ids,
+        "sale_ids": [row["id"] for row in sale_rows],
+        "sale_game_ids": [row["game_id"] for row in sale_rows],
+        "free_games": deque(free_games),
+    }
+
+
+def _deep_page(total: int) -> int:
+    return max(int(math.ceil(total / PAGE_SIZE) * DEEP_PAGE_RATIO), 1)
+
+
+# SKENARIO — async (client, ctx, state) -> httpx.Response request yang diukur;
+# state adalah dict per worker (mis. cursor yang sedang ditelusuri)
+
+async def _games_default(client, ctx, state):
+    return await client.get("/games", params={"page": random.randint(1, 5), "page_size": PAGE_SIZE})
+
+
+async def _games_search(client, ctx, state):
+    term = ctx["search"]["common" if random.random() < 0.7 else "rare"]
+    return await client.get("/games", params={"search": term, "page_size": PAGE_SIZE})
+
+
+async def _games_sort(client, ctx, state):
+    sort_by = random.choice(["name", "released", "rating"])
+    return await client.get("/games", params={
+        "sort_by": sort_by, "sort_dir": random.choice(["asc", "desc"]),
+        "genre": random.choice(ctx["genres"]), "page_size": PAGE_SIZE,
+    })
+
+
+async def _games_deep_offset(client, ctx, state):
+    page = _deep_page(ctx["games_total"]) + random.randint(0, 10)
+    return await client.get("/games", params={"page": page, "page_size": PAGE_SIZE, "count_strategy": "estimated"})
+
+
+async def _games_deep_cursor(client, ctx, state):
+    # Tiap worker menelusuri halaman berikutnya; mulai lagi dari awal saat habis
+    params = {"pagination": "cursor", "page_size": PAGE_SIZE, "count_strategy": "estimated"}
+    if state.get("cursor"):
+        params["cursor"] = state["cursor"]
+    resp = await client.get("/games", params=params)
+    if resp.status_code == 200:
+        state["cursor"] = resp.json().get("next_cursor")
+    return resp
+
+
+async def _games_detail(client, ctx, state):
+    return await client.get(f"/games/{random.choice(ctx['game_ids'])}")
+
+
+async def _sales_list(client, ctx, state):
+    return await client.get("/sales", params={
+        "page": random.randint(1, 5), "page_size": PAGE_SIZE,
+        "sort_by": random.choice(["our_price", "updated_at", "game_name"]),
+    })
+
+
+async def _sales_search(client, ctx, state):
+    return await client.get("/sales", params={"search": ctx["search"]["common"], "genre": random.choice(ctx["genres"])})
+
+
+async def _sales_deep(client, ctx, state):
+    page = _deep_page(ctx["sales_total"]) + random.randint(0, 10)
+    return await client.get("/sales", params={"page": page, "page_size": PAGE_SIZE, "count_strategy": "estimated"})
+
+
+async def _sales_update(client, ctx, state):
+    sale_id = random.choice(ctx["sale_ids"])
+    return await client.patch(f"/sales/{sale_id}", json={"our_price": round(random.uniform(1, 60), 2)})
+
+
+async def _sales_create(client, ctx, state):
+    # Game bebas dipinjam dari antrean bersama agar worker tidak bentrok di unique game_id;
+    # DELETE pembersih tidak ikut diukur (dihitung oleh _run_worker dari response POST saja)
+    game_id = ctx["free_games"].popleft()
+    try:
+        resp = await client.post("/sales", json={"game_id": game_id, "our_price": round(random.uniform(1, 60), 2)})
+        if resp.status_code == 201:
+            state["cleanup"] = f"/sales/{resp.json()['id']}"
+        return resp
+    finally:
+        ctx["free_games"].append(game_id)
+
+
+async def _sales_bulk_upsert(client, ctx, state):
+    # Urut game_id → urutan lock baris konsisten antar worker (hindari deadlock buatan)
+    game_ids = sorted(random.sample(ctx["sale_game_ids"], min(BULK_SIZE, len(ctx["sale_game_ids"]))))
+    items = [{"game_id": game_id, "our_price": round(random.uniform(1, 60), 2)} for game_id in game_ids]
+    return await client.post("/sales/bulk", params={"mode": "upsert"}, json=items)
+
+
+def _dashboard(name: str):
+    async def scenario(client, ctx, state):
+        params = {"genre": random.choice(ctx["genres"])} if name in GENRE_REQUIRED else {}
+        return await client.get(f"/dashboard/{name}", params=params)
+    return scenario
+
+
+DASHBOARD_ENDPOINTS = [
+    "summary", "price-range-by-genre", "avg-rating-by-genre", "games-by-date", "price-ratio",
+    "price-gap-by-genre", "sales-by-date", "max-price-by-date", "platform-summary",
+    "price-percentiles-by-genre", "price-histogram-by-genre", "price-history-by-genre",
+]
+GENRE_REQUIRED = {"price-history-by-genre"}
+
+SCENARIOS = {
+    "games_default": _games_default,
+    "games_search": _games_search,
+    "games_sort": _games_sort,
+    "games_deep_offset": _games_deep_offset,
+    "games_deep_cursor": _games_deep_cursor,
+    "games_detail": _games_detail,
+    "sales_list": _sales_list,
+    "sales_search": _sales_search,
+    "sales_deep": _sales_deep,
+    **{f"dashboard_{name.replace('-', '_')}": _dashboard(name) for name in DASHBOARD_ENDPOINTS},
+    "sales_update": _sales_update,
+    "sales_create": _sales_create,
+    "sales_bulk_upsert": _sales_bulk_upsert,
+}
+
+GROUPS = {
+    "games": [name for name in SCENARIOS if name.startswith("games_")],
+    "sales": ["sales_list", "sales_search", "sales_deep"],
+    "dashboard": [name for name in SCENARIOS if name.startswith("dashboard_")],
+    "writes": ["sales_update", "sales_create", "sales_bulk_upsert"],
+}
+
+
+def _select(spec: str) -> list[str]:
+    names = []
+    for token in (t.strip() for t in spec.split(",") if t.strip()):
+        if token == "all":
+            names.extend(SCENARIOS)
+        elif token in GROUPS:
+            names.extend(GROUPS[token])
+        elif token in SCENARIOS:
+            names.append(token)
+        else:
+            raise SystemExit(f"Skenario tidak dikenal: {token} (grup: {', '.join(GROUPS)}, all)")
+    return list(dict.fromkeys(names))
+
+
+# RUNNER
+
+async def _run_worker(client, ctx, scenario, measure_from: float, stop_at: float, latencies: list, errors: list) -> None:
+    state: dict = {}
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        try:
+            resp = await scenario(client, ctx, state)
+            ok = resp.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - start
+
+        if start >= measure_from:
+            (latencies if ok else errors).append(elapsed)
+        if "cleanup" in state:
+            await client.delete(state.pop("cleanup"))
+
+
+def _summarize(latencies: list[float], errors: list[float], duration: float) -> dict:
+    ms = sorted(x * 1000 for x in latencies)
+    # quantiles butuh >= 2 sampel; 1 sampel → semua persentil = nilai itu
+    q = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) >= 2 else ms * 99
+    return {
+        "requests": len(ms),
+        "errors": len(errors),
+        "throughput": round(len(ms) / duration, 1),
+        "p50": round(q[49], 2) if q else None,
+        "p95": round(q[94], 2) if q else None,
+        "p99": round(q[98], 2) if q else None,
+        "max": round(ms[-1], 2) if ms else None,
+    }
+
+
+async def _run_scenario(base_url: str, ctx: dict, name: str, concurrency: int, duration: float, warmup: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url + API_PREFIX, limits=limits, timeout=30) as client:
+        latencies, errors = [], []
+        measure_from = time.perf_counter() + warmup
+        stop_at = measure_from + duration
+        await asyncio.gather(*(
+            _run_worker(client, ctx, SCENARIOS[name], measure_from, stop_at, latencies, errors)
+            for _ in range(concurrency)
+        ))
+    return _summarize(latencies, errors, duration)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _fmt(value) -> str:
+    return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+
+def _change(current: float, base: float) -> str:
+    return f"{(current / base - 1) * 100:+6.1f}%" if base else "     -"
+
+
+def _print_row(key: str, r: dict, baseline: Optional[dict] = None) -> None:
+    line = f"{key:<44} {r['throughput']:9.1f} {_fmt(r['p50'])} {_fmt(r['p95'])} {_fmt(r['p99'])} {r['errors']:7d}"
+    if baseline and r["p95"]:
+        line += f"   p95 {_change(r['p95'], baseline.get('p95'))}  rps {_change(r['throughput'], baseline['throughput'])}"
+    print(line)
+
+
+def _regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if not base or not base.get("p95") or not r["p95"]:
+            continue
+        if r["p95"] > base["p95"] * (1 + tolerance):
+            found.append(f"{key}: p95 {base['p95']} → {r['p95']} ms")
+        if base["throughput"] and r["throughput"] < base["throughput"] * (1 - tolerance):
+            found.append(f"{key}: throughput {base['throughput']} → {r['throughput']} req/s")
+        if r["errors"] > base["errors"]:
+            found.append(f"{key}: errors {base['errors']} → {r['errors']}")
+    return found
+
+
+def _result_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == ".json" else RESULTS_DIR / f"{name}.json"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test API gamestore")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenarios", default="all", help=f"nama skenario / grup ({', '.join(GROUPS)}, all)")
+    parser.add_argument("--concurrency", default="1,8,32", help="level concurrency, dipisah koma")
+    parser.add_argument("--duration", type=float, default=10.0, help="detik pengukuran per skenario per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="detik pemanasan yang tidak dihitung")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="simpan hasil sebagai baseline (nama atau path .json)")
+    parser.add_argument("--compare", help="baseline pembanding (nama atau path .json)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="regresi yang ditoleransi (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    names = _select(args.scenarios)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    manifest = json.loads(MANIFEST.read_text()) if MANIFEST.exists() else {}
+    if not manifest and "sales_create" in names:
+        print("[LoadTest] dataset.json tidak ada → sales_create dilewati (jalankan benchmarks.seed_dataset)")
+        names.remove("sales_create")
+
+    async with httpx.AsyncClient(base_url=args.base_url + API_PREFIX, timeout=30) as client:
+        ctx = await _prepare(client, manifest)
+    print(f"[LoadTest] {ctx['games_total']} games, {ctx['sales_total']} sales, {len(names)} skenario × {levels}\n")
+
+    baseline = json.loads(_result_path(args.compare).read_text())["results"] if args.compare else {}
+    print(f"{'scenario@concurrency':<44} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    results = {}
+    for name in names:
+        for concurrency in levels:
+            key = f"{name}@{concurrency}"
+            results[key] = await _run_scenario(args.base_url, ctx, name, concurrency, args.duration, args.warmup)
+            _print_row(key, results[key], baseline.get(key))
+
+    if args.save:
+        path = _result_path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "meta": {
+                "revision": _git_revision(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "base_url": args.base_url,
+                "duration": args.duration,
+                "dataset": manifest,
+            },
+            "results": results,
+        }, indent=2))
+        print(f"\n[LoadTest] hasil disimpan → {path}")
+
+    if args.compare:
+        found = _regressions(results, baseline, args.tolerance)
+        if found:
+            print(f"\nFAIL: regresi di atas {args.tolerance:.0%}:")
+            for line in found:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nOK: tidak ada regresi di atas {args.tolerance:.0%} dibanding {args.compare}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,33 @@
+"""
+Seed dataset sintetis berukuran besar untuk load test — tanpa RAWG/CheapShark.
+
+Memakai generator COPY app.seeders.generate_data (id game mulai DEFAULT_ID_BASE,
+tidak bentrok dengan game hasil sync; --reset hanya menghapus baris sintetis).
+Hasilnya deterministik untuk --seed yang sama, dan manifest (ukuran, id, kata
+kunci search) ditulis ke benchmarks/results/dataset.json untuk dibaca load_test.
+
+    python -m benchmarks.seed_dataset --games 200000 --workers 4 --reset
+"""
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.seeders.generate_data import generate
+
+MANIFEST = Path(__file__).resolve().parent / "results" / "dataset.json"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed dataset sintetis untuk load test")
+    parser.add_argument("--games", type=int, default=100_000, help="Jumlah game sintetis (default: 100000)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed random (default: 42)")
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah proses paralel (default: 1)")
+    parser.add_argument("--reset", action="store_true", help="Hapus dataset sintetis sebelumnya")
+    args = parser.parse_args()
+
+    manifest = generate(args.games, seed=args.seed, workers=args.workers, reset=args.reset)
+    manifest["seeded_at"] = datetime.now(timezone.utc).isoformat()
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST.write_text(json.dumps(manifest, indent=2))
+    print(f"Manifest → {MANIFEST}")
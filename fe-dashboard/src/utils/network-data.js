@@ -7,6 +7,8 @@ const SYNC_PAGE_KEY = "sync_next_page"
 async function apiFetch(path, options = {}) {
   const res = await fetch(`${API}${path}`, {
     headers: { "Content-Type": "application/json" },
+    // kirim cookie read-your-writes backend (db_rw_until) antar origin
+    credentials: "include",
     ...options,
   });
 